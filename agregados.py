@@ -0,0 +1,176 @@
+from criatura import Criatura
+from predador import Predador
+from canibal import Canibal
+
+# Atributos acumulados de cada entidade (os que uma espécie não tem contam como 0)
+ATRIBUTOS = ('velocidade', 'stamina', 'tamanho', 'velocidade_nado', 'longevidade', 'comunicacao')
+POSICAO = {nome: i for i, nome in enumerate(ATRIBUTOS)}
+
+
+class AgregadosEspecie:
+    """Contagem, somas e somas dos quadrados dos atributos e do tick de nascimento de uma espécie"""
+    __slots__ = ('n', 'somas', 'quadrados', 'nao_nulos', 'soma_nascimento', 'quadrado_nascimento',
+                 'entradas', 'remocoes')
+
+    def __init__(self):
+        self.n = 0
+        self.somas = [0.0] * len(ATRIBUTOS)
+        self.quadrados = [0.0] * len(ATRIBUTOS)
+        # Quantas entidades têm cada atributo diferente de 0 (exato, ao contrário das somas)
+        self.nao_nulos = [0] * len(ATRIBUTOS)
+        self.soma_nascimento = 0
+        self.quadrado_nascimento = 0
+
+        # Valores somados de cada entidade viva: id -> (nascimento, valores)
+        self.entradas = {}
+
+        # Remoções desde que as somas foram refeitas (ver AgregadosPopulacao.remover)
+        self.remocoes = 0
+
+    def ressomar(self):
+        """Refaz as somas dos atributos a partir das entradas, descartando o resíduo das subtrações"""
+        somas = [0.0] * len(ATRIBUTOS)
+        quadrados = [0.0] * len(ATRIBUTOS)
+        for _, valores in self.entradas.values():
+            for i, valor in enumerate(valores):
+                somas[i] += valor
+                quadrados[i] += valor * valor
+        self.somas = somas
+        self.quadrados = quadrados
+        self.remocoes = 0
+
+
+class AgregadosPopulacao:
+    """Estatísticas da população mantidas a cada nascimento, morte e edição, em vez de percorrer
+    as listas a cada quadro. A idade é derivada do tick de nascimento: idade = tempo - nascimento."""
+    def __init__(self):
+        self.especies = {Criatura: AgregadosEspecie(), Predador: AgregadosEspecie(), Canibal: AgregadosEspecie()}
+
+        # Espécie de cada entidade viva (id -> AgregadosEspecie); remover subtrai exatamente
+        # o que foi somado, guardado em AgregadosEspecie.entradas
+        self._entradas = {}
+
+    def _especie(self, entidade):
+        classe = type(entidade)
+        especie = self.especies.get(classe)
+        if especie is None:
+            especie = self.especies[classe] = AgregadosEspecie()
+        return especie
+
+    def adicionar(self, entidade, tempo, nascimento=None):
+        """Soma uma entidade que entrou nas listas (nascimento: tempo - idade, se não informado)"""
+        if entidade.id in self._entradas:
+            self.remover(entidade)
+        if nascimento is None:
+            nascimento = tempo - entidade.idade
+        valores = tuple(getattr(entidade, nome, 0) or 0 for nome in ATRIBUTOS)
+
+        especie = self._especie(entidade)
+        especie.n += 1
+        somas = especie.somas
+        quadrados = especie.quadrados
+        nao_nulos = especie.nao_nulos
+        for i, valor in enumerate(valores):
+            if valor:
+                somas[i] += valor
+                quadrados[i] += valor * valor
+                nao_nulos[i] += 1
+        especie.soma_nascimento += nascimento
+        especie.quadrado_nascimento += nascimento * nascimento
+        especie.entradas[entidade.id] = (nascimento, valores)
+        self._entradas[entidade.id] = especie
+
+    def remover(self, entidade):
+        """Subtrai uma entidade que saiu das listas"""
+        especie = self._entradas.pop(entidade.id, None)
+        if especie is None:
+            return
+        nascimento, valores = especie.entradas.pop(entidade.id)
+
+        especie.n -= 1
+        somas = especie.somas
+        quadrados = especie.quadrados
+        nao_nulos = especie.nao_nulos
+        for i, valor in enumerate(valores):
+            if valor:
+                somas[i] -= valor
+                quadrados[i] -= valor * valor
+                nao_nulos[i] -= 1
+        especie.soma_nascimento -= nascimento
+        especie.quadrado_nascimento -= nascimento * nascimento
+
+        # Cada subtração deixa um resíduo de arredondamento nas somas; depois de tantas remoções
+        # quanto a espécie tem de entidades, elas são refeitas (custo amortizado constante)
+        especie.remocoes += 1
+        if especie.remocoes >= especie.n:
+            especie.ressomar()
+
+    def atualizar(self, entidade):
+        """Relê os atributos de uma entidade alterada (editor), mantendo o nascimento"""
+        especie = self._entradas.get(entidade.id)
+        if especie is not None:
+            nascimento = especie.entradas[entidade.id][0]
+            self.remover(entidade)
+            self.adicionar(entidade, 0, nascimento)
+
+    def aplicar(self, intencoes, tempo):
+        """Mortes e nascimentos do tick (antes de Intencoes.aplicar); os filhos nascem em `tempo`"""
+        entradas = self._entradas
+        for objeto in intencoes.removidos.values():
+            if getattr(objeto, 'id', None) in entradas:
+                self.remover(objeto)
+        for objeto, _ in intencoes.nascimentos:
+            self.adicionar(objeto, tempo, tempo)
+
+    def recalcular(self, tempo, *listas):
+        """Refaz os agregados a partir das listas completas (inicialização, snapshot, editor)"""
+        for classe in list(self.especies):
+            self.especies[classe] = AgregadosEspecie()
+        self._entradas.clear()
+        for lista in listas:
+            for entidade in lista:
+                self.adicionar(entidade, tempo)
+
+    def sincronizado(self, *listas):
+        """Verifica se os agregados têm o mesmo número de entidades das listas"""
+        return len(self._entradas) == sum(len(lista) for lista in listas)
+
+    def contagem(self, *classes):
+        """Número de entidades vivas das classes"""
+        return sum(self.especies[classe].n for classe in classes if classe in self.especies)
+
+    def _momentos(self, classes, nome, tempo):
+        """Contagem, soma e soma dos quadrados do atributo (ou da idade) nas classes"""
+        n = soma = quadrados = nao_nulos = 0
+        for classe in classes:
+            especie = self.especies.get(classe)
+            if especie is None or not especie.n:
+                continue
+            n += especie.n
+            if nome == 'idade':
+                # Soma de (tempo - nascimento) e de seus quadrados
+                soma += especie.n * tempo - especie.soma_nascimento
+                quadrados += (especie.n * tempo * tempo - 2 * tempo * especie.soma_nascimento
+                              + especie.quadrado_nascimento)
+            else:
+                i = POSICAO[nome]
+                soma += especie.somas[i]
+                quadrados += especie.quadrados[i]
+                nao_nulos += especie.nao_nulos[i]
+        if nome != 'idade' and not nao_nulos:
+            # Todos os valores são 0: as somas podem ter ficado com resíduo das remoções
+            soma = quadrados = 0.0
+        return n, soma, quadrados
+
+    def media(self, classes, nome, tempo=0):
+        """Média do atributo nas classes (0 sem entidades); `nome` pode ser 'idade'"""
+        n, soma, _ = self._momentos(classes, nome, tempo)
+        return soma / n if n else 0.0
+
+    def variancia(self, classes, nome, tempo=0):
+        """Variância populacional do atributo nas classes (0 sem entidades)"""
+        n, soma, quadrados = self._momentos(classes, nome, tempo)
+        if n <= 1:
+            return 0.0
+        media = soma / n
+        return max(0.0, quadrados / n - media * media)
@@ -2,10 +2,11 @@ import pygame
 import random
 
 class Alimento:
-    def __init__(self, x=None, y=None, valor_nutricional=None, WIDTH=800, HEIGHT=600):
-        self.x = x if x is not None else random.randint(20, WIDTH - 20)
-        self.y = y if y is not None else random.randint(20, HEIGHT - 20)
-        self.valor_nutricional = valor_nutricional if valor_nutricional is not None else random.randint(10, 200)
+    def __init__(self, x=None, y=None, valor_nutricional=None, WIDTH=800, HEIGHT=600, rng=None):
+        rng = rng if rng is not None else random
+        self.x = x if x is not None else rng.randint(20, WIDTH - 20)
+        self.y = y if y is not None else rng.randint(20, HEIGHT - 20)
+        self.valor_nutricional = valor_nutricional if valor_nutricional is not None else rng.randint(10, 200)
         self.tamanho = max(2, int(self.valor_nutricional / 50))
         self.cor = (
             min(255, 100 + self.valor_nutricional * 5),
@@ -0,0 +1,245 @@
+"""
+Suíte de benchmarks por cenário: cada mapa predefinido cruzado com escalas de
+população, com semente fixa. Mede separadamente a vazão de Simulacao.atualizar
+(ticks/s) e o custo de Simulacao.desenhar (ms/quadro, numa Surface fora da tela).
+
+Uso:
+    python benchmark_cenarios.py executar --saida base.json
+    python benchmark_cenarios.py executar --mapas planicie labirinto --escalas padrao grande
+    python benchmark_cenarios.py comparar base.json novo.json --tolerancia 0.1
+
+O comando comparar termina com código 1 se algum cenário piorou além da tolerância.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# Permite rodar sem janela (servidores sem display)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from simulacao import Simulacao
+
+WIDTH, HEIGHT = 1024, 768
+
+MAPAS = ['aleatorio', 'planicie', 'ilha', 'labirinto', 'montanhoso', 'diversificado']
+
+# Escalas de população: (presas, predadores, canibais)
+ESCALAS = {
+    'padrao': (20, 3, 1),
+    'media': (200, 10, 3),
+    'grande': (1000, 50, 10),
+    'enorme': (5000, 250, 50),
+}
+
+
+def criar_simulacao(mapa, escala, seed, vetorizado=False):
+    """Cria a simulação de um cenário (com interface, para que desenhar seja medido por inteiro)"""
+    n_presas, n_predadores, n_canibais = ESCALAS[escala]
+    simulacao = Simulacao(WIDTH, HEIGHT)
+    simulacao.inicializar({
+        'mapa': mapa,
+        'n_presas': n_presas,
+        'n_predadores': n_predadores,
+        'n_canibais': n_canibais,
+        'n_alimentos': max(40, n_presas // 2),
+        'taxa_alimento': 0.05,
+        'modo_atributos': 'aleatorio',
+        'terrenos': {},
+        'seed': seed
+    })
+    simulacao.usar_motor_vetorizado(vetorizado)
+    return simulacao
+
+
+def medir_cenario(mapa, escala, ticks, quadros, seed, vetorizado=False):
+    """Mede ticks/s de atualizar e ms/quadro de desenhar para um cenário"""
+    superficie = pygame.Surface((WIDTH, HEIGHT))
+
+    # Ticks: só a atualização, do estado inicial em diante
+    simulacao = criar_simulacao(mapa, escala, seed, vetorizado)
+    ticks_medidos = 0
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        simulacao.atualizar()
+        ticks_medidos += 1
+        # O fim de jogo congela a simulação; não há mais o que medir
+        if simulacao.jogo_finalizado:
+            break
+    tempo_ticks = time.perf_counter() - inicio
+
+    # Quadros: uma nova simulação, desenhando após cada tick (a atualização não entra na conta);
+    # o primeiro quadro monta os caches do mapa e é medido à parte
+    simulacao = criar_simulacao(mapa, escala, seed, vetorizado)
+    inicio = time.perf_counter()
+    simulacao.desenhar(superficie)
+    primeiro_quadro = time.perf_counter() - inicio
+
+    tempo_quadros = 0.0
+    quadros_medidos = 0
+    for _ in range(quadros):
+        simulacao.atualizar()
+        if simulacao.jogo_finalizado:
+            break
+        inicio = time.perf_counter()
+        simulacao.desenhar(superficie)
+        tempo_quadros += time.perf_counter() - inicio
+        quadros_medidos += 1
+
+    n_presas, n_predadores, n_canibais = ESCALAS[escala]
+    return {
+        'mapa': mapa,
+        'escala': escala,
+        'presas': n_presas,
+        'predadores': n_predadores,
+        'canibais': n_canibais,
+        'ticks': ticks_medidos,
+        'ticks_por_segundo': ticks_medidos / tempo_ticks if tempo_ticks > 0 else None,
+        'quadros': quadros_medidos,
+        'ms_por_quadro': 1000.0 * tempo_quadros / quadros_medidos if quadros_medidos else None,
+        'ms_primeiro_quadro': 1000.0 * primeiro_quadro,
+    }
+
+
+def melhor_medicao(medicoes):
+    """Combina as repetições de um cenário ficando com o melhor tempo de cada métrica (menos ruído)"""
+    resultado = dict(medicoes[0])
+    tps = [m['ticks_por_segundo'] for m in medicoes if m['ticks_por_segundo'] is not None]
+    mpq = [m['ms_por_quadro'] for m in medicoes if m['ms_por_quadro'] is not None]
+    resultado['ticks_por_segundo'] = max(tps) if tps else None
+    resultado['ms_por_quadro'] = min(mpq) if mpq else None
+    resultado['ms_primeiro_quadro'] = min(m['ms_primeiro_quadro'] for m in medicoes)
+    return resultado
+
+
+def executar(args):
+    """Roda todos os cenários pedidos e grava os resultados em JSON"""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    cenarios = {}
+    print(f"{'cenário':<26} {'ticks/s':>10} {'ms/quadro':>10}", file=sys.stderr)
+    for escala in args.escalas:
+        for mapa in args.mapas:
+            medicoes = [medir_cenario(mapa, escala, args.ticks, args.quadros, args.seed, args.vetorizado)
+                        for _ in range(args.repeticoes)]
+            resultado = melhor_medicao(medicoes)
+            nome = f"{mapa}/{escala}"
+            cenarios[nome] = resultado
+            print(f"{nome:<26} {_formatar(resultado['ticks_por_segundo']):>10} "
+                  f"{_formatar(resultado['ms_por_quadro']):>10}", file=sys.stderr)
+
+    pygame.quit()
+
+    relatorio = {
+        'parametros': {
+            'ticks': args.ticks,
+            'quadros': args.quadros,
+            'repeticoes': args.repeticoes,
+            'seed': args.seed,
+            'vetorizado': args.vetorizado,
+            'largura': WIDTH,
+            'altura': HEIGHT,
+        },
+        'ambiente': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'plataforma': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+        },
+        'cenarios': cenarios,
+    }
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+            arquivo.write("\n")
+    else:
+        json.dump(relatorio, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+def comparar_relatorios(base, novo, tolerancia):
+    """Compara dois relatórios; retorna as linhas (cenário, métrica, base, novo, variação, regrediu)"""
+    linhas = []
+    for nome, atual in novo['cenarios'].items():
+        anterior = base['cenarios'].get(nome)
+        if anterior is None:
+            continue
+
+        # ticks/s: maior é melhor; ms/quadro: menor é melhor
+        for metrica, maior_melhor in (('ticks_por_segundo', True), ('ms_por_quadro', False)):
+            valor_base = anterior.get(metrica)
+            valor_novo = atual.get(metrica)
+            if not valor_base or valor_novo is None:
+                continue
+            variacao = valor_novo / valor_base - 1.0
+            piora = -variacao if maior_melhor else variacao
+            linhas.append((nome, metrica, valor_base, valor_novo, variacao, piora > tolerancia))
+    return linhas
+
+
+def comparar(args):
+    """Compara um resultado com a linha de base e aponta as regressões"""
+    with open(args.base, encoding='utf-8') as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo, encoding='utf-8') as arquivo:
+        novo = json.load(arquivo)
+
+    if base.get('parametros') != novo.get('parametros'):
+        print("aviso: os parâmetros dos dois relatórios são diferentes", file=sys.stderr)
+
+    linhas = comparar_relatorios(base, novo, args.tolerancia)
+    print(f"{'cenário':<26} {'métrica':<18} {'base':>10} {'novo':>10} {'variação':>9}")
+    regressoes = 0
+    for nome, metrica, valor_base, valor_novo, variacao, regrediu in linhas:
+        marca = "  REGRESSÃO" if regrediu else ""
+        print(f"{nome:<26} {metrica:<18} {valor_base:>10.2f} {valor_novo:>10.2f} {variacao:>+8.1%}{marca}")
+        regressoes += regrediu
+
+    faltando = sorted(set(base['cenarios']) - set(novo['cenarios']))
+    if faltando:
+        print(f"cenários ausentes no novo relatório: {', '.join(faltando)}")
+
+    print(f"{regressoes} regressão(ões) acima de {args.tolerancia:.0%}")
+    return 1 if regressoes else 0
+
+
+def _formatar(valor):
+    return '-' if valor is None else f"{valor:.2f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks por cenário (mapa x população)")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    parser_executar = subparsers.add_parser('executar', help="mede os cenários e grava o JSON")
+    parser_executar.add_argument('--mapas', nargs='+', default=MAPAS, choices=MAPAS)
+    parser_executar.add_argument('--escalas', nargs='+', default=['padrao', 'media', 'grande'],
+                                 choices=list(ESCALAS))
+    parser_executar.add_argument('--ticks', type=int, default=100, help="ticks medidos por cenário")
+    parser_executar.add_argument('--quadros', type=int, default=30, help="quadros medidos por cenário")
+    parser_executar.add_argument('--repeticoes', type=int, default=3, help="fica com a melhor de N medições")
+    parser_executar.add_argument('--seed', type=int, default=1)
+    parser_executar.add_argument('--vetorizado', action='store_true', help="usa o motor vetorizado (NumPy)")
+    parser_executar.add_argument('--saida', help="arquivo JSON de saída (padrão: saída padrão)")
+    parser_executar.set_defaults(funcao=executar)
+
+    parser_comparar = subparsers.add_parser('comparar', help="compara um resultado com a linha de base")
+    parser_comparar.add_argument('base', help="JSON da linha de base")
+    parser_comparar.add_argument('novo', help="JSON a comparar")
+    parser_comparar.add_argument('--tolerancia', type=float, default=0.10,
+                                 help="piora relativa tolerada antes de acusar regressão (0.10 = 10%%)")
+    parser_comparar.set_defaults(funcao=comparar)
+
+    args = parser.parse_args(argv)
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
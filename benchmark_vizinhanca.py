@@ -0,0 +1,77 @@
+"""
+Benchmark das consultas de vizinhança: mede ticks/s de Simulacao.atualizar
+com e sem o índice espacial, variando o número de presas.
+
+Uso:
+    python benchmark_vizinhanca.py
+    python benchmark_vizinhanca.py --presas 100 1000 10000 --ticks 20
+"""
+import argparse
+import os
+import time
+
+# Permite rodar sem janela (servidores sem display)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from simulacao import Simulacao
+
+WIDTH, HEIGHT = 1024, 768
+
+
+def medir_ticks_por_segundo(n_presas, ticks, indice_espacial, mapa, seed):
+    """Cria uma simulação com n_presas e mede quantos ticks por segundo ela executa"""
+    simulacao = Simulacao(WIDTH, HEIGHT)
+    simulacao.indice_espacial = indice_espacial
+    simulacao.inicializar({
+        'mapa': mapa,
+        'n_presas': n_presas,
+        'n_predadores': max(3, n_presas // 20),
+        'n_canibais': max(1, n_presas // 100),
+        'n_alimentos': 40,
+        'taxa_alimento': 0.05,
+        'modo_atributos': 'aleatorio',
+        'terrenos': {},
+        'seed': seed
+    })
+
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        simulacao.atualizar()
+        # O fim de jogo congela a simulação; não há mais o que medir
+        if simulacao.jogo_finalizado:
+            break
+    decorrido = time.perf_counter() - inicio
+
+    return simulacao.tempo / decorrido if decorrido > 0 else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das consultas de vizinhança")
+    parser.add_argument('--presas', type=int, nargs='+', default=[100, 500, 1000, 2000, 5000, 10000])
+    parser.add_argument('--ticks', type=int, default=20, help="ticks medidos por cenário")
+    parser.add_argument('--mapa', default='planicie')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--limite-sem-indice', type=int, default=2000,
+                        help="maior população medida com varredura linear (é quadrática)")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    print(f"{'presas':>8} {'com índice (t/s)':>18} {'sem índice (t/s)':>18} {'ganho':>8}")
+    for n_presas in args.presas:
+        com_indice = medir_ticks_por_segundo(n_presas, args.ticks, True, args.mapa, args.seed)
+
+        if n_presas <= args.limite_sem_indice:
+            sem_indice = medir_ticks_por_segundo(n_presas, args.ticks, False, args.mapa, args.seed)
+            print(f"{n_presas:>8} {com_indice:>18.2f} {sem_indice:>18.2f} {com_indice / sem_indice:>7.1f}x")
+        else:
+            print(f"{n_presas:>8} {com_indice:>18.2f} {'-':>18} {'-':>8}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
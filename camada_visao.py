@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class CamadaVisao:
+    """Campos de visão das entidades, desenhados com círculos translúcidos pré-renderizados
+    (um por faixa de raio e cor) e enviados à tela num único `blits` por quadro"""
+    def __init__(self, limite_populacao=400, max_circulos=96):
+        # Acima desse número de entidades os campos viram só ruído na tela: não são desenhados
+        self.limite_populacao = limite_populacao
+
+        # (raio, cor) -> Surface, descartando o menos usado quando passa do limite
+        self.max_circulos = max_circulos
+        self._circulos = OrderedDict()
+
+    @staticmethod
+    def _faixa(raio):
+        """Arredonda o raio para a faixa do cache: 2 px nos pequenos, ~5% nos grandes"""
+        passo = max(2, int(raio) // 20)
+        return max(1, int(round(raio / passo)) * passo)
+
+    def _circulo(self, raio, cor):
+        chave = (raio, cor)
+        circulo = self._circulos.get(chave)
+        if circulo is not None:
+            self._circulos.move_to_end(chave)
+            return circulo
+
+        circulo = pygame.Surface((raio * 2, raio * 2), pygame.SRCALPHA)
+        pygame.draw.circle(circulo, cor, (raio, raio), raio)
+        self._circulos[chave] = circulo
+        if len(self._circulos) > self.max_circulos:
+            self._circulos.popitem(last=False)
+        return circulo
+
+    def ativa(self, *listas):
+        """Verifica se a população está abaixo do limite"""
+        return sum(len(lista) for lista in listas) <= self.limite_populacao
+
+    def desenhar(self, superficie, *listas):
+        """Desenha o campo de visão de cada entidade que tem um (cor de `cor_campo_visao`)"""
+        if not self.ativa(*listas):
+            return
+
+        faixa = self._faixa
+        circulo = self._circulo
+        blits = []
+        for lista in listas:
+            for entidade in lista:
+                cor = entidade.cor_campo_visao()
+                if cor is None:
+                    continue
+                raio = faixa(entidade.campo_visao)
+                blits.append((circulo(raio, cor), (int(entidade.x) - raio, int(entidade.y) - raio)))
+        superficie.blits(blits, False)
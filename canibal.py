@@ -1,5 +1,4 @@
 import pygame
-import random
 import math
 from criatura_base import CriaturaBase
 from predador import Predador
@@ -7,9 +6,9 @@ from predador import Predador
 class Canibal(CriaturaBase):
     """Classe para predadores evoluídos que podem caçar outros predadores"""
     
-    def __init__(self, x=None, y=None, velocidade=None, stamina=None, tamanho=None, campo=None, velocidade_nado=None, pai=None, WIDTH=800, HEIGHT=600):
+    def __init__(self, x=None, y=None, velocidade=None, stamina=None, tamanho=None, campo=None, velocidade_nado=None, pai=None, WIDTH=800, HEIGHT=600, rng=None):
         # Inicializar a classe base primeiro
-        super().__init__(x, y, velocidade, stamina, None, tamanho, velocidade_nado, pai, WIDTH, HEIGHT)
+        super().__init__(x, y, velocidade, stamina, None, tamanho, velocidade_nado, pai, WIDTH, HEIGHT, rng)
         
         # Atributos específicos para canibais
         if pai and isinstance(pai, Canibal):
@@ -18,22 +17,22 @@ class Canibal(CriaturaBase):
             pass  # As mutações já foram aplicadas na classe base
         else:
             # Atributos para canibais novos
-            self.velocidade = velocidade if velocidade is not None else random.uniform(3, 5)
-            self.stamina = stamina if stamina is not None else random.uniform(120 *self.tamanho, 210* self.tamanho)
-            self.tamanho = tamanho if tamanho is not None else random.uniform(9, 14)
-            self.campo_visao = campo if campo is not None else random.uniform(self.tamanho *10, self.tamanho*15)   # Campo de visão maior que presas
+            self.velocidade = velocidade if velocidade is not None else self.rng.uniform(3, 5)
+            self.stamina = stamina if stamina is not None else self.rng.uniform(120 *self.tamanho, 210* self.tamanho)
+            self.tamanho = tamanho if tamanho is not None else self.rng.uniform(9, 14)
+            self.campo_visao = campo if campo is not None else self.rng.uniform(self.tamanho *10, self.tamanho*15)   # Campo de visão maior que presas
 
             self.energia = self.stamina
 
             # Canibais vivem mais
-            self.longevidade = random.uniform(300, 600) 
+            self.longevidade = self.rng.uniform(300, 600) 
             
             # Canibais são mais adaptáveis à água
             if velocidade_nado is None:
                 # Canibais são mais adaptáveis, maior chance de habilidade de nado
                 self.velocidade_nado = 0
-                if random.random() < 0.25:  # 25% de chance
-                    self.velocidade_nado = random.uniform(0.5, 1.2)
+                if self.rng.random() < 0.25:  # 25% de chance
+                    self.velocidade_nado = self.rng.uniform(0.5, 1.2)
         
         # Status dinâmicos específicos de canibais
         self.tempo_cacar = 0
@@ -69,11 +68,19 @@ class Canibal(CriaturaBase):
         
         self.cor = (r, g, b)
     
-    def atualizar(self, criaturas, predadores, mapa=None):
+    def atualizar(self, criaturas, predadores, registro, intencoes, mapa=None, grade_presas=None, grade_predadores=None):
         # Chamar o método base primeiro para verificações de vida e energia
         if not super().atualizar(mapa=mapa):
             return False  # Morreu de velhice ou fome
         
+        self._decidir(None, criaturas, predadores, registro, mapa, grade_presas, grade_predadores)
+        self._mover(mapa)
+        self._interagir(None, criaturas, predadores, intencoes, grade_presas, grade_predadores)
+        
+        return True  # Continua vivo
+    
+    def _decidir(self, alimentos, criaturas, predadores, registro, mapa=None, grade_presas=None, grade_predadores=None, motor=None):
+        """Escolhe a direção: perseguir o alvo atual ou escolher entre caçar presas e predadores"""
         # Se não estiver com direção bloqueada pelo terreno
         if not self.direção_bloqueada:
             # Verificar se está perto de uma parede e evitar se necessário
@@ -91,19 +98,16 @@ class Canibal(CriaturaBase):
                 # O alvo pode ser uma criatura ou outro predador
                 if hasattr(self.alvo, 'id'):  # Se o alvo tem um ID
                     # Verificar se é uma criatura
-                    for criatura in criaturas:
-                        if criatura.id == self.alvo.id:
-                            self.alvo = criatura  # Atualizar referência
-                            alvo_existe = True
-                            break
+                    alvo = registro.obter(self.alvo.id, criaturas)
                     
-                    # Se não encontrou nas criaturas, procurar nos predadores
-                    if not alvo_existe and predadores and self.energia < 0.5 * self.stamina:
-                        for predador in predadores:
-                            if predador.id == self.alvo.id and predador.id != self.id:  # Não perseguir a si mesmo
-                                self.alvo = predador  # Atualizar referência
-                                alvo_existe = True
-                                break
+                    # Se não está entre as criaturas, procurar nos predadores
+                    if alvo is None and predadores and self.energia < 0.5 * self.stamina \
+                            and self.alvo.id != self.id:  # Não perseguir a si mesmo
+                        alvo = registro.obter(self.alvo.id, predadores)
+                    
+                    if alvo is not None:
+                        self.alvo = alvo  # Atualizar referência
+                        alvo_existe = True
                 
                 if not alvo_existe or self.tempo_cacar <= 0:
                     # Alvo não existe mais ou cansou de caçar, encontrar novo alvo
@@ -115,20 +119,20 @@ class Canibal(CriaturaBase):
                     if not self._perseguir_alvo(mapa):
                         # Se não conseguiu perseguir (água ou parede no caminho), procura outro alvo
                         # Tentar escolher outro alvo seguindo a lógica normal
-                        if predadores and random.random() < 0.6 and self.energia < 0.3*self.stamina:
-                            presa = self._encontrar_predador_alvo(predadores, mapa)
+                        if predadores and self.rng.random() < 0.6 and self.energia < 0.3*self.stamina:
+                            presa = self._encontrar_predador_alvo(predadores, mapa, grade_predadores, motor)
                             if presa:
                                 self.alvo = presa
                                 self.tempo_cacar = 200
                             else:
-                                presa = self._encontrar_presa(criaturas, mapa)
+                                presa = self._encontrar_presa(criaturas, mapa, grade_presas, motor)
                                 if presa:
                                     self.alvo = presa
                                     self.tempo_cacar = 200
                                 else:
                                     self._movimento_aleatorio()
                         else:
-                            presa = self._encontrar_presa(criaturas, mapa)
+                            presa = self._encontrar_presa(criaturas, mapa, grade_presas, motor)
                             if presa:
                                 self.alvo = presa
                                 self.tempo_cacar = 200
@@ -138,14 +142,14 @@ class Canibal(CriaturaBase):
                         self.tempo_cacar -= 1
             else:
                 # Decidir se vai caçar predadores ou criaturas (60% de chance de escolher predadores)
-                if predadores and random.random() < 0.6 and self.energia < 0.3*self.stamina:
-                    presa = self._encontrar_predador_alvo(predadores, mapa)
+                if predadores and self.rng.random() < 0.6 and self.energia < 0.3*self.stamina:
+                    presa = self._encontrar_predador_alvo(predadores, mapa, grade_predadores, motor)
                     if presa:
                         self.alvo = presa
                         self.tempo_cacar = 200
                     else:
                         # Se não encontrou predador, procurar criatura
-                        presa = self._encontrar_presa(criaturas, mapa)
+                        presa = self._encontrar_presa(criaturas, mapa, grade_presas, motor)
                         if presa:
                             self.alvo = presa
                             self.tempo_cacar = 200
@@ -153,14 +157,14 @@ class Canibal(CriaturaBase):
                             self._movimento_aleatorio()
                 else:
                     # Procurar criatura primeiro
-                    presa = self._encontrar_presa(criaturas, mapa)
+                    presa = self._encontrar_presa(criaturas, mapa, grade_presas, motor)
                     if presa:
                         self.alvo = presa
                         self.tempo_cacar = 200  # Caçar por 200 frames (≈3.3 segundos a 60 FPS)
                     else:
                         # Se não encontrou criatura e houver predadores, tentar caçar predador
                         if predadores and self.energia < self.stamina*0.3:
-                            presa = self._encontrar_predador_alvo(predadores, mapa)
+                            presa = self._encontrar_predador_alvo(predadores, mapa, grade_predadores, motor)
                             if presa:
                                 self.alvo = presa
                                 self.tempo_cacar = 200
@@ -169,158 +173,78 @@ class Canibal(CriaturaBase):
                         else:
                             self._movimento_aleatorio()
         
-        # Aplicar efeitos do terreno se houver mapa
-        if mapa:
-            mapa.aplicar_efeitos_terreno(self)
-        else:
-            # Sem mapa, usa velocidade padrão
-            self.velocidade_atual = self.velocidade
-        
-        # Mover usando a velocidade afetada pelo terreno
-        self.x += math.cos(self.direcao) * self.velocidade_atual
-        self.y += math.sin(self.direcao) * self.velocidade_atual
-        
-        # Verificar colisão com paredes se houver mapa
-        if mapa:
-            mapa.verificar_colisao_paredes(self)
-        else:
-            # Manter dentro dos limites da tela (comportamento padrão se não houver mapa)
-            self.x = max(0, min(self.WIDTH, self.x))
-            self.y = max(0, min(self.HEIGHT, self.y))
-        
-        # Resetar o efeito de bloqueio de direção
-        self.direção_bloqueada = False
-        
+        return True
+    
+    def _interagir(self, alimentos, criaturas, predadores, intencoes, grade_presas=None, grade_predadores=None):
+        """Tenta comer uma presa ou predador alcançado e, se conseguir, reproduzir"""
         # Tentar comer alguma criatura ou predador
-        if self._cacar(criaturas, predadores):
+        if self._cacar(criaturas, predadores, intencoes, grade_presas, grade_predadores):
             # Se conseguiu caçar, tenta reproduzir
-            self._reproduzir(predadores)
-        
-        return True  # Continua vivo
+            self._reproduzir(predadores, intencoes)
     
-    def _buscar_saida_agua(self, mapa):
-        """Tenta encontrar e se mover em direção à terra mais próxima"""
-        # Verificar em várias direções para encontrar terra
-        direcoes_teste = 12  # Número de direções a verificar
-        melhor_direcao = None
-        menor_distancia = float('inf')
-        
-        for i in range(direcoes_teste):
-            angulo = (2 * math.pi / direcoes_teste) * i
-            distancia_teste = 5  # Começa próximo
-            max_distancia = 200  # Limite de busca
-            
-            # Continua verificando na direção até encontrar terra ou atingir o limite
-            while distancia_teste < max_distancia:
-                pos_x = self.x + math.cos(angulo) * distancia_teste
-                pos_y = self.y + math.sin(angulo) * distancia_teste
-                
-                # Verificar se está dentro dos limites e se é terra
-                if (0 <= pos_x < self.WIDTH and 0 <= pos_y < self.HEIGHT):
-                    terreno = mapa.obter_terreno(pos_x, pos_y)
-                    if terreno.nome != "Água":
-                        # Encontrou terra, verificar se é a mais próxima
-                        if distancia_teste < menor_distancia:
-                            menor_distancia = distancia_teste
-                            melhor_direcao = angulo
-                        break
-                
-                distancia_teste += 20  # Incrementa a distância de busca
-        
-        # Se encontrou terra, move-se nessa direção
-        if melhor_direcao is not None:
-            self.direcao = melhor_direcao
-        else:
-            # Se não encontrou terra, move-se em uma direção aleatória
-            self.direcao = random.uniform(0, 2 * math.pi)
-    
-    def _encontrar_presa(self, criaturas, mapa=None):
+    def _encontrar_presa(self, criaturas, mapa=None, grade_presas=None, motor=None):
         """Encontra uma presa potencial dentro do campo de visão"""
         if not criaturas:
             return None
         
         # Filtrar criaturas que estão dentro do campo de visão
-        presas_proximas = [c for c in criaturas if self._calcular_distancia(c) < self.campo_visao]
+        presas_proximas = self._vizinhos(criaturas, self.campo_visao, grade_presas)
         
         if not presas_proximas:
             return None
             
         # Se tiver mapa e o canibal não sabe nadar, filtrar presas que não têm água ou paredes no caminho
         if mapa:
-            presas_seguras = []
-            for presa in presas_proximas:
-                seguro = True
-                
-                # Verificar água no caminho
-                if self.velocidade_nado <= 0 and self._ha_agua_no_caminho(presa.x, presa.y, mapa):
-                    seguro = False
-                
-                # Verificar parede no caminho ou se a presa está perto demais de uma parede
-                if seguro and self._ha_parede_no_caminho(presa.x, presa.y, mapa):
-                    seguro = False
-                    
-                if seguro:
-                    presas_seguras.append(presa)
+            # Sem água (se não sabe nadar) nem parede no caminho, e sem parede perto do alvo
+            presas_seguras = self._caminhos_livres(presas_proximas, mapa, motor)
             
             # Se houver presas seguras, escolhe uma delas
             if presas_seguras:
-                return random.choice(presas_seguras)
+                return self.rng.choice(presas_seguras)
                 
             # Se não houver presas seguras mas o canibal estiver com muita fome, pode arriscar
             elif self.energia < self.stamina * 0.15:  # Canibais são mais desesperados quando com fome
                 # 60% de chance de arriscar quando está com muita fome
-                if random.random() < 0.6:
-                    return random.choice(presas_proximas)
+                if self.rng.random() < 0.6:
+                    return self.rng.choice(presas_proximas)
                 return None
             else:
                 return None
         
         # Se não tiver mapa, escolher uma presa aleatória entre as próximas
-        return random.choice(presas_proximas)
+        return self.rng.choice(presas_proximas)
     
-    def _encontrar_predador_alvo(self, predadores, mapa=None):
+    def _encontrar_predador_alvo(self, predadores, mapa=None, grade_predadores=None, motor=None):
         """Encontra um predador para caçar dentro do campo de visão"""
         if not predadores:
             return None
         
         # Filtrar predadores que estão dentro do campo de visão e não incluir a si mesmo
-        predadores_proximos = [p for p in predadores if p.id != self.id and self._calcular_distancia(p) < self.campo_visao]
+        predadores_proximos = [p for p in self._vizinhos(predadores, self.campo_visao, grade_predadores) if p.id != self.id]
         
         if not predadores_proximos:
             return None
             
         # Se tiver mapa e o canibal não sabe nadar, filtrar predadores que não têm água ou paredes no caminho
         if mapa:
-            predadores_seguros = []
-            for predador in predadores_proximos:
-                seguro = True
-                
-                # Verificar água no caminho
-                if self.velocidade_nado <= 0 and self._ha_agua_no_caminho(predador.x, predador.y, mapa):
-                    seguro = False
-                
-                # Verificar parede no caminho
-                if seguro and self._ha_parede_no_caminho(predador.x, predador.y, mapa):
-                    seguro = False
-                    
-                if seguro:
-                    predadores_seguros.append(predador)
+            # Sem água (se não sabe nadar) nem parede no caminho, e sem parede perto do alvo
+            predadores_seguros = self._caminhos_livres(predadores_proximos, mapa, motor)
             
             # Se houver predadores seguros, escolhe um deles
             if predadores_seguros:
-                return random.choice(predadores_seguros)
+                return self.rng.choice(predadores_seguros)
                 
             # Se não houver predadores seguros mas o canibal estiver com muita fome, pode arriscar
             elif self.energia < self.stamina * 0.1:  # Para canibais, caçar outros predadores é uma medida desesperada
                 # 40% de chance de arriscar quando está com muita fome
-                if random.random() < 0.4:
-                    return random.choice(predadores_proximos)
+                if self.rng.random() < 0.4:
+                    return self.rng.choice(predadores_proximos)
                 return None
             else:
                 return None
         
         # Se não tiver mapa, escolher um predador aleatório para caçar
-        return random.choice(predadores_proximos)
+        return self.rng.choice(predadores_proximos)
 
     def _perseguir_alvo(self, mapa=None):
         """Direciona o canibal em direção ao alvo"""
@@ -341,21 +265,28 @@ class Canibal(CriaturaBase):
     
     def _movimento_aleatorio(self):
         """Faz o canibal se mover aleatoriamente"""
-        if random.random() < 0.03:  # 3% de chance de mudar de direção
-            self.direcao = random.uniform(0, 2 * math.pi)
+        if self.rng.random() < 0.03:  # 3% de chance de mudar de direção
+            self.direcao = self.rng.uniform(0, 2 * math.pi)
     
-    def _cacar(self, criaturas, predadores):
+    def _cacar(self, criaturas, predadores, intencoes, grade_presas=None, grade_predadores=None):
         """Tenta capturar e comer uma presa ou outro predador"""
+        # Candidatas: com índice espacial, só as presas ao alcance de contato
+        if grade_presas is not None:
+            candidatas = grade_presas.consultar_raio(self.x, self.y, self.tamanho + grade_presas.maior_tamanho)
+        else:
+            candidatas = criaturas
+        
         # Tentar comer criaturas
-        for i, criatura in enumerate(criaturas):
-            if self._calcular_distancia(criatura) < self.tamanho + criatura.tamanho:
+        for criatura in candidatas:
+            if self._calcular_distancia(criatura) < self.tamanho + criatura.tamanho and intencoes.remover(criatura, self):
                 # Ganhar energia proporcional ao tamanho da criatura
                 ganho_energia = criatura.tamanho * 5 + criatura.energia * 0.5
                 self.energia += ganho_energia
                 self.energia = min(self.energia, self.stamina)  # Limitar à stamina máxima
                 
-                # Remover a criatura comida
-                criaturas.pop(i)
+                # A criatura comida sai da lista no final do tick; da grade, imediatamente
+                if grade_presas is not None:
+                    grade_presas.remover(criatura)
                 
                 # Resetar alvo
                 self.alvo = None
@@ -364,15 +295,22 @@ class Canibal(CriaturaBase):
         
         # Tentar comer outros predadores
         if predadores and self.energia < self.stamina*0.3:
-            for i, predador in enumerate(predadores):
-                if predador.id != self.id and self._calcular_distancia(predador) < self.tamanho + predador.tamanho:
+            if grade_predadores is not None:
+                candidatos = grade_predadores.consultar_raio(self.x, self.y, self.tamanho + grade_predadores.maior_tamanho)
+            else:
+                candidatos = predadores
+            
+            for predador in candidatos:
+                if predador.id != self.id and self._calcular_distancia(predador) < self.tamanho + predador.tamanho \
+                        and intencoes.remover(predador, self):
                     # Ganhar energia proporcional ao tamanho do predador (bônus por ser predador)
                     ganho_energia = predador.tamanho * 8 + predador.energia * 0.7
                     self.energia += ganho_energia
                     self.energia = min(self.energia, self.stamina)  # Limitar à stamina máxima
                     
-                    # Remover o predador comido
-                    predadores.pop(i)
+                    # O predador comido sai da lista no final do tick; da grade, imediatamente
+                    if grade_predadores is not None:
+                        grade_predadores.remover(predador)
                     
                     # Resetar alvo
                     self.alvo = None
@@ -381,20 +319,20 @@ class Canibal(CriaturaBase):
         
         return False
         
-    def _reproduzir(self, predadores):
+    def _reproduzir(self, predadores, intencoes):
         """Tenta reproduzir se tiver energia suficiente"""
         # Só reproduz se tiver energia suficiente
         custo_reproducao = self.stamina * 0.15  
         
         if self.energia > custo_reproducao and self.idade > 50:
-            if random.random() < 0.01 * self.tamanho:  # 0.4% de chance de reproduzir a cada frame (mais raro)
+            if self.rng.random() < 0.01 * self.tamanho:  # 0.4% de chance de reproduzir a cada frame (mais raro)
                 # Gastar energia para reproduzir
                 self.energia -= custo_reproducao
                 self.filhos += 1
                 
                 # Criar filho próximo ao pai
-                offset_x = random.uniform(-20, 20)
-                offset_y = random.uniform(-20, 20)
+                offset_x = self.rng.uniform(-20, 20)
+                offset_y = self.rng.uniform(-20, 20)
                 
                 filho = Canibal(
                     x=self.x + offset_x,
@@ -404,50 +342,49 @@ class Canibal(CriaturaBase):
                     HEIGHT=self.HEIGHT
                 )
                 
-                predadores.append(filho)
+                intencoes.adicionar(filho, predadores, self)
                 return True
         
         return False
     
-    def _desenhar_corpo(self, superficie, pos_x, pos_y, cor_ajustada):
+    def _desenhar_forma(self, superficie, pos_x, pos_y, cor_ajustada, tamanho=None):
         """Desenha o corpo do canibal com características distintas"""
+        if tamanho is None:
+            tamanho = self.tamanho
+        
         # Desenhar corpo do canibal
-        pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(self.tamanho))
+        pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(tamanho))
         
         # Desenhar contorno (vermelho mais intenso para canibais)
         cor_contorno = (255, 0, 0)
-        pygame.draw.circle(superficie, cor_contorno, (pos_x, pos_y), int(self.tamanho), 1)
-        
+        pygame.draw.circle(superficie, cor_contorno, (pos_x, pos_y), int(tamanho), 1)
+    
+    def _desenhar_detalhes(self, superficie, pos_x, pos_y):
+        """Olhos na direção do movimento"""
         # Desenhar "olhos" na direção do movimento (canibais têm olhos mais brilhantes)
         olho_x = pos_x + math.cos(self.direcao) * (self.tamanho * 0.6)
         olho_y = pos_y + math.sin(self.direcao) * (self.tamanho * 0.6)
         cor_olho = (255, 255, 0)  # Olhos amarelos brilhantes
         pygame.draw.circle(superficie, cor_olho, (int(olho_x), int(olho_y)), max(2, int(self.tamanho / 2.5)))
     
-    def desenhar(self, superficie):
-        """Sobrescreve o método de desenho para incluir o campo de visão específico do canibal"""
-        # Desenhar campo de visão como um círculo transparente
-        s = pygame.Surface((self.campo_visao*2, self.campo_visao*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 0, 0, 15), (self.campo_visao, self.campo_visao), self.campo_visao)
-        superficie.blit(s, (int(self.x - self.campo_visao), int(self.y - self.campo_visao)))
-        
-        # Ajustar cor baseada na idade (fica mais clara conforme envelhece)
+    def cor_campo_visao(self):
+        return (255, 0, 0, 15)
+    
+    def _cor_ajustada(self):
+        """Cor do corpo: só o verde e o azul clareiam com a idade"""
         idade_rel = min(1.0, self.idade / self.longevidade)
-        cor_ajustada = (
+        return (
             min(255, self.cor[0]),
             min(255, self.cor[1] + int(40 * idade_rel)),
             min(255, self.cor[2] + int(40 * idade_rel))
         )
-        
-        # Desenhar corpo do canibal
-        self._desenhar_corpo(superficie, int(self.x), int(self.y), cor_ajustada)
-        
-        # Desenhar barra de energia
-        max_barra = 20
-        comprimento_barra = max(1, int((self.energia / self.stamina) * max_barra))
-        pygame.draw.rect(superficie, (255, 255, 255), (int(self.x) - max_barra//2, int(self.y) - int(self.tamanho) - 5, max_barra, 3))
-        cor_barra = (255, 0, 0)  # Barra de energia vermelha mais intensa
-        pygame.draw.rect(superficie, cor_barra, (int(self.x) - max_barra//2, int(self.y) - int(self.tamanho) - 5, comprimento_barra, 3))
+    
+    def _posicao_desenho(self, superficie):
+        """Canibais são desenhados na posição exata, sem efeitos de natação"""
+        return int(self.x), int(self.y)
+    
+    def estado_detalhes(self):
+        return ()
     
     def _obter_cor_barra_energia(self):
         """Retorna a cor da barra de energia"""
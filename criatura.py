@@ -1,4 +1,3 @@
-import random
 import math
 import pygame
 from criatura_base import CriaturaBase
@@ -8,9 +7,9 @@ class Criatura(CriaturaBase):
     
     def __init__(self, x=None, y=None, velocidade=None, stamina=None, longevidade=None, 
                 tamanho=None, velocidade_nado=None, comunicacao=None, 
-                tipo_comunicacao=None, forma=None, pai=None, WIDTH=800, HEIGHT=600):
+                tipo_comunicacao=None, forma=None, pai=None, WIDTH=800, HEIGHT=600, rng=None):
         # Inicializar a classe base primeiro
-        super().__init__(x, y, velocidade, stamina, longevidade, tamanho, velocidade_nado, pai, WIDTH, HEIGHT)
+        super().__init__(x, y, velocidade, stamina, longevidade, tamanho, velocidade_nado, pai, WIDTH, HEIGHT, rng)
         
         # Atributos específicos das presas
         if pai and isinstance(pai, Criatura):
@@ -18,15 +17,15 @@ class Criatura(CriaturaBase):
             mutacao = 0.2
             
             # Herda comunicação com mutação
-            self.comunicacao = max(1, pai.comunicacao * random.uniform(1 - mutacao, 1 + mutacao))
+            self.comunicacao = max(1, pai.comunicacao * self.rng.uniform(1 - mutacao, 1 + mutacao))
 
             self.tipo_comunicacao = pai.tipo_comunicacao
             self.forma = pai.forma
             
             # 10% de chance de mutar o tipo de comunicação na reprodução
-            if random.random() < 0.1:
+            if self.rng.random() < 0.1:
                 if self.comunicacao > 3:  # Se tiver comunicação alta
-                    self.tipo_comunicacao = random.choice(["egoista", "altruista"])
+                    self.tipo_comunicacao = self.rng.choice(["egoista", "altruista"])
                     # Forma baseada no tipo de comunicação
                     self.forma = "quadrado" if self.tipo_comunicacao == "egoista" else "triangulo"
                 else:
@@ -34,13 +33,13 @@ class Criatura(CriaturaBase):
                     self.forma = "circulo"
         else:
             # Atributos iniciais para criaturas novas
-            self.comunicacao = comunicacao if comunicacao is not None else random.uniform(1.0, 5.0)
+            self.comunicacao = comunicacao if comunicacao is not None else self.rng.uniform(1.0, 5.0)
             
             # Tipo de comunicação e forma
             if tipo_comunicacao is not None:
                 self.tipo_comunicacao = tipo_comunicacao
             elif self.comunicacao > 3:  # Se tiver comunicação alta
-                self.tipo_comunicacao = random.choice(["egoista", "altruista"])
+                self.tipo_comunicacao = self.rng.choice(["egoista", "altruista"])
             else:
                 self.tipo_comunicacao = "nenhuma"
             
@@ -86,17 +85,31 @@ class Criatura(CriaturaBase):
         
         self.cor = (r, g, b)
     
-    def atualizar(self, alimentos, criaturas, predadores, mapa=None):
+    def atualizar(self, alimentos, criaturas, predadores, registro, intencoes, mapa=None, grade_presas=None, grade_predadores=None,
+                  grade_alimentos=None):
         # Chamar o método base primeiro para verificações de vida e energia
         if not super().atualizar(mapa=mapa):
             return False  # Morreu de velhice ou fome
-            
+        
+        # Descansando: não se move nem interage neste tick
+        if not self._decidir(alimentos, criaturas, predadores, registro, mapa, grade_presas, grade_predadores,
+                             grade_alimentos):
+            return True
+        
+        self._mover(mapa)
+        self._interagir(alimentos, criaturas, predadores, intencoes, grade_presas, grade_predadores, grade_alimentos)
+    
+        return True  # Continua vivo
+    
+    def _decidir(self, alimentos, criaturas, predadores, registro, mapa=None, grade_presas=None, grade_predadores=None,
+                 grade_alimentos=None):
+        """Escolhe a direção (fugir, seguir o alerta, buscar comida); retorna False se estiver descansando"""
         # Se estiver descansando, diminuir o tempo de descanso
         if self.tempo_descanso > 0:
             self.tempo_descanso -= 1
             self.energia += self.stamina * 0.01  # Recupera energia ao descansar
             self.energia = min(self.energia, self.stamina)  # Limitar à stamina máxima
-            return True
+            return False
         
         # Diminuir tempo de alerta
         if self.tempo_alerta > 0:
@@ -106,14 +119,11 @@ class Criatura(CriaturaBase):
                 self.direcao_fuga = None
         
         # Detectar predadores no campo de visão
-        self.predadores_detectados = []
-        for predador in predadores:
-            if self._calcular_distancia(predador) < self.campo_visao:
-                self.predadores_detectados.append(predador)
+        self.predadores_detectados = self._vizinhos(predadores, self.campo_visao, grade_predadores)
                 
         # Comunicar alerta a outras presas se tiver capacidade de comunicação
         if self.comunicacao > 3 and len(self.predadores_detectados) > 0:
-            self._alertar_outras_presas(criaturas)
+            self._alertar_outras_presas(criaturas, grade_presas)
             
         # Decidir próxima ação (se não estiver com direção bloqueada pelo terreno)
         if not self.direção_bloqueada:
@@ -137,108 +147,47 @@ class Criatura(CriaturaBase):
                 self.tempo_alerta = 60  # 1 segundo de alerta (60 frames)
             else:
                 # Se não há predadores, procurar comida
-                alimento_proximo = self._alimento_mais_proximo(alimentos, mapa)
+                alimento_proximo = self._alimento_mais_proximo(alimentos, mapa, grade_alimentos)
                 if alimento_proximo:
                     self._buscar_alimento(alimento_proximo)
                 else:
                     # Movimento aleatório se não houver alimento
-                    if random.random() < 0.05:  # 5% de chance de mudar de direção
-                        self.direcao = random.uniform(0, 2 * math.pi)
-        
-        # Aplicar efeitos do terreno se houver mapa
-        if mapa:
-            mapa.aplicar_efeitos_terreno(self)
-        
-        # Mover usando a velocidade afetada pelo terreno
-        self.x += math.cos(self.direcao) * self.velocidade_atual
-        self.y += math.sin(self.direcao) * self.velocidade_atual
-        
-        # Verificar colisão com paredes se houver mapa
-        if mapa:
-            mapa.verificar_colisao_paredes(self)
-        else:
-            # Manter dentro dos limites da tela (comportamento padrão se não houver mapa)
-            self.x = max(0, min(self.WIDTH, self.x))
-            self.y = max(0, min(self.HEIGHT, self.y))
-        
-        # Resetar o efeito de bloqueio de direção
-        self.direção_bloqueada = False
+                    if self.rng.random() < 0.05:  # 5% de chance de mudar de direção
+                        self.direcao = self.rng.uniform(0, 2 * math.pi)
         
+        return True
+    
+    def _interagir(self, alimentos, criaturas, predadores, intencoes, grade_presas=None, grade_predadores=None,
+                   grade_alimentos=None):
+        """Come o alimento alcançado e tenta reproduzir"""
         # Verificar se pode comer algum alimento
-        self._comer(alimentos)
+        self._comer(alimentos, intencoes, grade_alimentos)
         
         # Tentar reproduzir
-        self._reproduzir(criaturas)
-    
-        return True  # Continua vivo
+        self._reproduzir(criaturas, intencoes)
     
-    def _buscar_saida_agua(self, mapa):
-        """Tenta encontrar e se mover em direção à terra mais próxima"""
-        # Verificar em várias direções para encontrar terra
-        direcoes_teste = 12  # Número de direções a verificar
-        melhor_direcao = None
-        menor_distancia = float('inf')
-        
-        for i in range(direcoes_teste):
-            angulo = (2 * math.pi / direcoes_teste) * i
-            distancia_teste = 5  # Começa próximo
-            max_distancia = 200  # Limite de busca
-            
-            # Continua verificando na direção até encontrar terra ou atingir o limite
-            while distancia_teste < max_distancia:
-                pos_x = self.x + math.cos(angulo) * distancia_teste
-                pos_y = self.y + math.sin(angulo) * distancia_teste
-                
-                # Verificar se está dentro dos limites e se é terra
-                if (0 <= pos_x < self.WIDTH and 0 <= pos_y < self.HEIGHT):
-                    terreno = mapa.obter_terreno(pos_x, pos_y)
-                    if terreno.nome != "Água":
-                        # Encontrou terra, verificar se é a mais próxima
-                        if distancia_teste < menor_distancia:
-                            menor_distancia = distancia_teste
-                            melhor_direcao = angulo
-                        break
-                
-                distancia_teste += 20  # Incrementa a distância de busca
-        
-        # Se encontrou terra, move-se nessa direção
-        if melhor_direcao is not None:
-            self.direcao = melhor_direcao
-        else:
-            # Se não encontrou terra, move-se em uma direção aleatória
-            self.direcao = random.uniform(0, 2 * math.pi)
-
-    def _alimento_mais_proximo(self, alimentos, mapa=None):
+    def _alimento_mais_proximo(self, alimentos, mapa=None, grade_alimentos=None):
         if not alimentos:
             return None
         
-        # Filtrar alimentos para considerar apenas os que não têm água no caminho
-        # e estão longe de paredes
-        alimentos_seguros = []
-        for alimento in alimentos:
-            distancia = self._calcular_distancia(alimento)
-            # Só considera comida num raio de 250px
-            if distancia < 250:
-                seguro = True
-                
-                # Verificar se há água no caminho se a criatura não sabe nadar
-                if mapa and self.velocidade_nado <= 0:
-                    if self._ha_agua_no_caminho(alimento.x, alimento.y, mapa):
-                        seguro = False
-                
-                # Verificar se o alimento está perto demais de uma parede
-                if mapa and seguro:
-                    if self._ha_parede_no_caminho(alimento.x, alimento.y, mapa):
-                        seguro = False
-                
-                if seguro:
-                    alimentos_seguros.append(alimento)
+        # Só considera comida num raio de 250px, da mais próxima para a mais distante
+        if grade_alimentos is not None:
+            candidatos = grade_alimentos.mais_proximos(self.x, self.y, 250)
+        else:
+            candidatos = sorted((a for a in alimentos if self._calcular_distancia(a) < 250),
+                                key=self._calcular_distancia)
+        
+        # A primeira sem água no caminho (se a criatura não sabe nadar) e longe de paredes é a
+        # mais próxima dentre as seguras; as demais nem precisam ser verificadas
+        for alimento in candidatos:
+            if mapa:
+                if self.velocidade_nado <= 0 and self._ha_agua_no_caminho(alimento.x, alimento.y, mapa):
+                    continue
+                if self._ha_parede_no_caminho(alimento.x, alimento.y, mapa):
+                    continue
+            return alimento
         
-        if not alimentos_seguros:
-            return None
-            
-        # Retorna o alimento mais próximo dentre os seguros
-        return min(alimentos_seguros, key=lambda a: self._calcular_distancia(a))
+        return None
     
     def _buscar_alimento(self, alimento):
         # Calcular ângulo de direção para o alimento
@@ -258,14 +207,14 @@ class Criatura(CriaturaBase):
         # Gastar mais energia ao fugir (adrenalina)
         self.energia -= self.consumo_energia * 1.25
         
-    def _alertar_outras_presas(self, criaturas):
+    def _alertar_outras_presas(self, criaturas, grade_presas=None):
         # Se não tiver direção de fuga, não pode alertar
         if self.direcao_fuga is None:
             return
             
         # Comunicar alerta a outras presas no campo de visão
-        for criatura in criaturas:
-            if criatura.id != self.id and self._calcular_distancia(criatura) < self.campo_visao:
+        for criatura in self._vizinhos(criaturas, self.campo_visao, grade_presas):
+            if criatura.id != self.id:
                 # Se for egoísta, só alerta criaturas da mesma forma
                 if self.tipo_comunicacao == "egoista" and criatura.forma != self.forma:
                     continue
@@ -275,34 +224,41 @@ class Criatura(CriaturaBase):
                 criatura.tempo_alerta = 60  # 1 segundo de alerta
                 criatura.direcao_fuga = self.direcao_fuga
     
-    def _comer(self, alimentos):
-        for i, alimento in enumerate(alimentos):
-            if self._calcular_distancia(alimento) < self.tamanho + alimento.tamanho:
+    def _comer(self, alimentos, intencoes, grade_alimentos=None):
+        # Candidatos: com índice espacial, só os alimentos ao alcance de contato, na ordem da lista
+        # (com dois ao alcance, come o mesmo que a varredura da lista inteira comeria)
+        if grade_alimentos is not None:
+            candidatos = grade_alimentos.consultar_raio(self.x, self.y, self.tamanho + grade_alimentos.maior_tamanho)
+            if len(candidatos) > 1:
+                candidatos.sort(key=alimentos.index)
+        else:
+            candidatos = alimentos
+        
+        for alimento in candidatos:
+            # O alimento só sai da lista no final do tick; quem chegar primeiro fica com ele
+            if self._calcular_distancia(alimento) < self.tamanho + alimento.tamanho and intencoes.remover(alimento, self):
                 # Ganhar energia proporcional ao valor nutricional
                 self.energia += alimento.valor_nutricional
                 self.energia = min(self.energia, self.stamina)  # Limitar à stamina máxima
                 self.ultimo_alimento = 0
-                
-                # Remover o alimento consumido
-                alimentos.pop(i)
                 return True
         
         self.ultimo_alimento += 1
         return False
     
-    def _reproduzir(self, criaturas):
+    def _reproduzir(self, criaturas, intencoes):
         # Só reproduz se tiver energia suficiente e for "adulto"
         if self.energia > self.custo_reproducao and self.idade > 100 and self.ultimo_alimento < 60:
-            if random.random() < 0.01 * self.tamanho: 
+            if self.rng.random() < 0.01 * self.tamanho: 
                 # Gastar energia para reproduzir
                 self.energia -= self.custo_reproducao
                 self.filhos += 1
                 
                 # Criar filho próximo ao pai
-                offset_x = random.uniform(-20, 20)
-                offset_y = random.uniform(-20, 20)
+                offset_x = self.rng.uniform(-20, 20)
+                offset_y = self.rng.uniform(-20, 20)
                 
-                if random.random() < 0.99:
+                if self.rng.random() < 0.99:
                     filho = Criatura(
                         x=self.x + offset_x,
                         y=self.y + offset_y,
@@ -311,13 +267,14 @@ class Criatura(CriaturaBase):
                         HEIGHT=self.HEIGHT
                     )
                 
-                    criaturas.append(filho)
+                    # O filho entra na lista no final do tick (não age no tick em que nasce)
+                    intencoes.adicionar(filho, criaturas, self)
                 else:
                     from predador import Predador
                     novo_predador = Predador(x=self.x, y=self.y, velocidade=self.velocidade, 
                             stamina=self.stamina, tamanho=self.tamanho, 
                             velocidade_nado=self.velocidade_nado,  # Herda a velocidade de nado
-                            WIDTH=self.WIDTH, HEIGHT=self.HEIGHT)
+                            WIDTH=self.WIDTH, HEIGHT=self.HEIGHT, rng=self.rng)
                     return False  # A criatura se transforma e "morre" como presa
 
                 # Descansar após reproduzir
@@ -326,8 +283,11 @@ class Criatura(CriaturaBase):
         
         return False
     
-    def _desenhar_corpo(self, superficie, pos_x, pos_y, cor_ajustada):
-        """Desenha o corpo da criatura baseado no seu tipo de comunicação"""
+    def _desenhar_forma(self, superficie, pos_x, pos_y, cor_ajustada, tamanho=None):
+        """Desenha a forma da criatura baseada no seu tipo de comunicação"""
+        if tamanho is None:
+            tamanho = self.tamanho
+        
         # Determinar a cor do contorno
         if self.alertada:
             cor_contorno = (255, 255, 0)  # Amarelo para alertada
@@ -337,7 +297,7 @@ class Criatura(CriaturaBase):
         # Desenhar forma baseada no tipo de comunicação
         if self.forma == "quadrado":
             # Quadrado para comunicação egoísta
-            tamanho_rect = self.tamanho * 1.8
+            tamanho_rect = tamanho * 1.8
             rect = pygame.Rect(
                 pos_x - tamanho_rect/2,
                 pos_y - tamanho_rect/2,
@@ -348,7 +308,7 @@ class Criatura(CriaturaBase):
             pygame.draw.rect(superficie, cor_contorno, rect, 1)
         elif self.forma == "triangulo":
             # Triângulo para comunicação altruísta
-            tamanho_tri = self.tamanho * 2
+            tamanho_tri = tamanho * 2
             pontos = [
                 (pos_x, pos_y - tamanho_tri),
                 (pos_x - tamanho_tri * 0.866, pos_y + tamanho_tri * 0.5),
@@ -358,9 +318,11 @@ class Criatura(CriaturaBase):
             pygame.draw.polygon(superficie, cor_contorno, pontos, 1)
         else:
             # Círculo para sem comunicação
-            pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(self.tamanho))
-            pygame.draw.circle(superficie, cor_contorno, (pos_x, pos_y), int(self.tamanho), 1)
-        
+            pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(tamanho))
+            pygame.draw.circle(superficie, cor_contorno, (pos_x, pos_y), int(tamanho), 1)
+    
+    def _desenhar_detalhes(self, superficie, pos_x, pos_y):
+        """Olhos e barbatanas, que seguem a direção do movimento"""
         # Desenhar "olhos" na direção do movimento
         olho_x = pos_x + math.cos(self.direcao) * (self.tamanho * 0.6)
         olho_y = pos_y + math.sin(self.direcao) * (self.tamanho * 0.6)
@@ -396,35 +358,18 @@ class Criatura(CriaturaBase):
             pygame.draw.line(superficie, (0, 150, 220), (barbatana_x1, barbatana_y1), (ponta_x1, ponta_y1), max(1, int(self.tamanho/4)))
             pygame.draw.line(superficie, (0, 150, 220), (barbatana_x2, barbatana_y2), (ponta_x2, ponta_y2), max(1, int(self.tamanho/4)))
     
-    def desenhar(self, superficie):
-        """Sobrescreve o método da classe base para campo de visão específico"""
-        # Desenhar campo de visão como um círculo transparente
-        if self.comunicacao > 1:
-            s = pygame.Surface((self.campo_visao*2, self.campo_visao*2), pygame.SRCALPHA)
-            
-            # Cor do campo de visão baseada no tipo de comunicação
-            if self.tipo_comunicacao == "egoista":
-                cor_campo = (180, 180, 0, 10)  # Amarelo para egoísta
-            elif self.tipo_comunicacao == "altruista":
-                cor_campo = (0, 200, 200, 10)  # Ciano para altruísta
-            else:
-                cor_campo = (100, 100, 100, 5)  # Cinza para sem comunicação
-                
-            pygame.draw.circle(s, cor_campo, (self.campo_visao, self.campo_visao), self.campo_visao)
-            superficie.blit(s, (int(self.x - self.campo_visao), int(self.y - self.campo_visao)))
-        
-        # Chamar o método de desenho base para os elementos comuns
-        super()._desenhar_corpo(superficie, int(self.x), int(self.y), self.cor)
-        
-        # Ajustar cor baseada na idade (fica mais clara conforme envelhece)
-        idade_rel = min(1.0, self.idade / self.longevidade)
-        cor_ajustada = (
-            min(255, self.cor[0] + int(40 * idade_rel)),
-            min(255, self.cor[1] + int(40 * idade_rel)),
-            min(255, self.cor[2] + int(40 * idade_rel))
-        )
-        
-        # Posição ajustada para efeito de natação
+    def cor_campo_visao(self):
+        """Campo de visão só para quem se comunica, com a cor do tipo de comunicação"""
+        if self.comunicacao <= 1:
+            return None
+        if self.tipo_comunicacao == "egoista":
+            return (180, 180, 0, 10)  # Amarelo para egoísta
+        elif self.tipo_comunicacao == "altruista":
+            return (0, 200, 200, 10)  # Ciano para altruísta
+        return (100, 100, 100, 5)  # Cinza para sem comunicação
+    
+    def _posicao_desenho(self, superficie):
+        """Posição do corpo na tela, com a ondulação de quem está nadando (presas não deixam bolhas)"""
         pos_x = int(self.x)
         pos_y = int(self.y)
         
@@ -434,14 +379,13 @@ class Criatura(CriaturaBase):
             ondulacao = math.sin(self.contador_nado) * self.amplitude_nado
             pos_y += int(ondulacao)
         
-        # Desenhar corpo específico para criaturas
-        self._desenhar_corpo(superficie, pos_x, pos_y, cor_ajustada)
-        
-        # Desenhar barra de energia
-        max_barra = 20
-        comprimento_barra = max(1, int((self.energia / self.stamina) * max_barra))
-        pygame.draw.rect(superficie, (255, 255, 255), (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5, max_barra, 3))
-        pygame.draw.rect(superficie, (0, 255, 0), (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5, comprimento_barra, 3))
+        return pos_x, pos_y
+    
+    def estado_forma(self):
+        return (self.forma, self.alertada)
+    
+    def estado_detalhes(self):
+        return (self.esta_nadando, round(self.velocidade_nado, 1))
     
     def _obter_cor_barra_energia(self):
         """Retorna a cor da barra de energia"""
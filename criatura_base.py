@@ -1,13 +1,19 @@
 import pygame
 import random
 import math
+from terreno import AGUA
 
 class CriaturaBase:
     """Classe base para todos os tipos de criaturas (presas, predadores e canibais)"""
     contador_id = 0
     
     def __init__(self, x=None, y=None, velocidade=None, stamina=None, longevidade=None, 
-                tamanho=None, velocidade_nado=None, pai=None, WIDTH=800, HEIGHT=600):
+                tamanho=None, velocidade_nado=None, pai=None, WIDTH=800, HEIGHT=600, rng=None):
+        # Gerador aleatório da simulação (o filho usa o do pai; sem nenhum, o módulo random global)
+        if rng is None:
+            rng = pai.rng if pai else random
+        self.rng = rng
+        
         # Atribuir ID único
         CriaturaBase.contador_id += 1
         self.id = CriaturaBase.contador_id
@@ -15,8 +21,8 @@ class CriaturaBase:
         self.HEIGHT = HEIGHT
         
         # Posição
-        self.x = x if x is not None else random.randint(50, WIDTH - 50)
-        self.y = y if y is not None else random.randint(50, HEIGHT - 50)
+        self.x = x if x is not None else self.rng.randint(50, WIDTH - 50)
+        self.y = y if y is not None else self.rng.randint(50, HEIGHT - 50)
         
         # Aplicar verificação de limites logo na inicialização
         self._aplicar_limites_absolutos()
@@ -27,42 +33,42 @@ class CriaturaBase:
             mutacao = 0.2
             
             # Herda com mutação
-            self.velocidade = max(1, pai.velocidade * random.uniform(1 - mutacao, 1 + mutacao))
-            self.stamina = max(100, pai.stamina * random.uniform(1 - mutacao, 1 + mutacao))
-            self.longevidade = max(500, pai.longevidade * random.uniform(1 - mutacao, 1 + mutacao))
-            self.tamanho = max(3, pai.tamanho * random.uniform(1 - mutacao, 1 + mutacao))
+            self.velocidade = max(1, pai.velocidade * self.rng.uniform(1 - mutacao, 1 + mutacao))
+            self.stamina = max(100, pai.stamina * self.rng.uniform(1 - mutacao, 1 + mutacao))
+            self.longevidade = max(500, pai.longevidade * self.rng.uniform(1 - mutacao, 1 + mutacao))
+            self.tamanho = max(3, pai.tamanho * self.rng.uniform(1 - mutacao, 1 + mutacao))
             
             # Herda velocidade de nado com mutação
             if hasattr(pai, 'velocidade_nado'):
-                self.velocidade_nado = max(0, pai.velocidade_nado * random.uniform(1 - mutacao, 1 + mutacao))
+                self.velocidade_nado = max(0, pai.velocidade_nado * self.rng.uniform(1 - mutacao, 1 + mutacao))
                 # 5% de chance de mutação que altera significativamente a velocidade de nado
-                if random.random() < 0.05:
+                if self.rng.random() < 0.05:
                     if self.velocidade_nado > 0:
                         # Possibilidade de perder a habilidade
-                        if random.random() < 0.2:
+                        if self.rng.random() < 0.2:
                             self.velocidade_nado = 0
                     else:
                         # Possibilidade de ganhar a habilidade
-                        if random.random() < 0.2:
-                            self.velocidade_nado = random.uniform(0.3, 0.7)
+                        if self.rng.random() < 0.2:
+                            self.velocidade_nado = self.rng.uniform(0.3, 0.7)
             else:
                 self.velocidade_nado = 0
         else:
             # Atributos iniciais para criaturas novas
-            self.velocidade = velocidade if velocidade is not None else random.uniform(1.5, 3.0)
-            self.longevidade = longevidade if longevidade is not None else random.uniform(500, 1000)
-            self.tamanho = tamanho if tamanho is not None else random.uniform(4, 8)
-            self.stamina = stamina if stamina is not None else random.uniform(self.tamanho*20, self.tamanho*50)
+            self.velocidade = velocidade if velocidade is not None else self.rng.uniform(1.5, 3.0)
+            self.longevidade = longevidade if longevidade is not None else self.rng.uniform(500, 1000)
+            self.tamanho = tamanho if tamanho is not None else self.rng.uniform(4, 8)
+            self.stamina = stamina if stamina is not None else self.rng.uniform(self.tamanho*20, self.tamanho*50)
 
             # Velocidade de nado (agora com apenas 5% de chance de ter habilidade inicial)
             self.velocidade_nado = velocidade_nado if velocidade_nado is not None else 0
-            if velocidade_nado is None and random.random() < 0.05:  # 5% de chance de ter alguma habilidade inicial
-                self.velocidade_nado = random.uniform(0.3, 0.8)
+            if velocidade_nado is None and self.rng.random() < 0.05:  # 5% de chance de ter alguma habilidade inicial
+                self.velocidade_nado = self.rng.uniform(0.3, 0.8)
         
         # Status dinâmicos
         self.energia = self.stamina * 0.8  # Começa com 80% da stamina máxima
         self.idade = 0
-        self.direcao = random.uniform(0, 2 * math.pi)
+        self.direcao = self.rng.uniform(0, 2 * math.pi)
         self.direção_bloqueada = False  # Para efeito de terrenos como gelo
         self.velocidade_atual = self.velocidade  # Velocidade afetada pelo terreno
         self.filhos = 0
@@ -71,7 +77,7 @@ class CriaturaBase:
         # Variáveis para efeito visual de natação
         self.esta_nadando = False
         self.contador_nado = 0
-        self.amplitude_nado = random.uniform(0.5, 1.5)
+        self.amplitude_nado = self.rng.uniform(0.5, 1.5)
         
         # Detector de terreno próximo (para evitar água se não souber nadar)
         self.detectar_distancia = 30  # Distância para detectar água à frente
@@ -106,6 +112,14 @@ class CriaturaBase:
         """Calcula a distância entre esta criatura e outra entidade"""
         return math.sqrt((self.x - outro.x) ** 2 + (self.y - outro.y) ** 2)
     
+    def _vizinhos(self, entidades, raio, grade=None):
+        """Retorna as entidades a menos de `raio` desta criatura (usa o índice espacial se houver)"""
+        if grade is not None:
+            return grade.consultar_raio(self.x, self.y, raio, excluir=self)
+        
+        # Sem índice: varre a lista inteira
+        return [e for e in entidades if e is not self and self._calcular_distancia(e) < raio]
+    
     def _detectar_agua_a_frente(self, mapa):
         """Detecta se há água na direção do movimento"""
         if not mapa:
@@ -117,72 +131,24 @@ class CriaturaBase:
         
         # Verifica se a posição está dentro dos limites do mapa
         if 0 <= pos_x < self.WIDTH and 0 <= pos_y < self.HEIGHT:
-            terreno_a_frente = mapa.obter_terreno(pos_x, pos_y)
             # Retorna True se for água e a criatura não sabe nadar
-            return terreno_a_frente.nome == "Água" and self.velocidade_nado <= 0
+            return mapa.tipo_em(pos_x, pos_y) == AGUA and self.velocidade_nado <= 0
         
         return False
     
-    def _ha_agua_no_caminho(self, destino_x, destino_y, mapa, distancia_verificacao=50):
+    def _ha_agua_no_caminho(self, destino_x, destino_y, mapa):
         """Verifica se há água no caminho entre a criatura e o destino"""
         if not mapa or self.velocidade_nado > 0:
             # Se não há mapa ou a criatura sabe nadar, não precisa verificar
             return False
             
-        # Distância total até o destino
-        distancia_total = math.sqrt((destino_x - self.x)**2 + (destino_y - self.y)**2)
-        
         # Se a distância for muito pequena, não precisa verificar
-        if distancia_total < 10:
+        if (destino_x - self.x)**2 + (destino_y - self.y)**2 < 100:
             return False
-            
-        # Ângulo em direção ao destino
-        angulo = math.atan2(destino_y - self.y, destino_x - self.x)
-        
-        # Número de pontos a verificar (mais pontos para distâncias maiores)
-        num_pontos = min(10, max(3, int(distancia_total / 20)))
-        
-        # Verifica vários pontos ao longo do caminho
-        for i in range(1, num_pontos + 1):
-            # Posição do ponto a verificar (distribuído ao longo do caminho)
-            fator = i / (num_pontos + 1)  # Evita verificar exatamente no início e no fim
-            check_x = self.x + (destino_x - self.x) * fator
-            check_y = self.y + (destino_y - self.y) * fator
-            
-            # Verifica se o ponto está dentro dos limites do mapa
-            if 0 <= check_x < self.WIDTH and 0 <= check_y < self.HEIGHT:
-                terreno = mapa.obter_terreno(check_x, check_y)
-                if terreno.nome == "Água":
-                    return True  # Encontrou água no caminho
-        
-        # Também verifica se há água nas proximidades do caminho
-        # (para criar um comportamento mais cauteloso)
-        for i in range(1, num_pontos + 1):
-            fator = i / (num_pontos + 1)
-            check_x = self.x + (destino_x - self.x) * fator
-            check_y = self.y + (destino_y - self.y) * fator
-            
-            # Verifica pontos perpendiculares ao caminho
-            perpendicular_angulo = angulo + math.pi/2
-            offset = 15  # Distância lateral para verificar
-            
-            # Verifica à direita do caminho
-            check_x_right = check_x + math.cos(perpendicular_angulo) * offset
-            check_y_right = check_y + math.sin(perpendicular_angulo) * offset
-            
-            # Verifica à esquerda do caminho
-            check_x_left = check_x - math.cos(perpendicular_angulo) * offset
-            check_y_left = check_y - math.sin(perpendicular_angulo) * offset
-            
-            if (0 <= check_x_right < self.WIDTH and 0 <= check_y_right < self.HEIGHT and
-                mapa.obter_terreno(check_x_right, check_y_right).nome == "Água"):
-                return True
-                
-            if (0 <= check_x_left < self.WIDTH and 0 <= check_y_left < self.HEIGHT and
-                mapa.obter_terreno(check_x_left, check_y_left).nome == "Água"):
-                return True
         
-        return False  # Não encontrou água no caminho
+        # Percorre as células da grade de terrenos entre a criatura e o destino, com uma
+        # margem lateral (comportamento mais cauteloso); o mapa memoriza o resultado no tick
+        return mapa.agua_no_caminho(self.x, self.y, destino_x, destino_y)
     
     def _esta_perto_de_parede(self, mapa, x=None, y=None, distancia=None):
         """Verifica se a criatura está perto de uma parede"""
@@ -196,47 +162,21 @@ class CriaturaBase:
         # Usar distância fornecida ou a padrão da criatura
         dist = distancia if distancia is not None else self.distancia_seguranca_parede
         
-        # Verificar se alguma parede está próxima
-        for parede in mapa.paredes:
-            # Encontra o ponto mais próximo na parede
-            closest_x = max(parede.rect.left, min(pos_x, parede.rect.right))
-            closest_y = max(parede.rect.top, min(pos_y, parede.rect.bottom))
-            
-            # Calcula a distância entre o ponto e a parede
-            distancia_x = pos_x - closest_x
-            distancia_y = pos_y - closest_y
-            distancia_parede = math.sqrt(distancia_x**2 + distancia_y**2)
-            
-            if distancia_parede < dist:
-                return True
-                
-        return False
+        # Consulta o campo de distância às paredes do mapa
+        return mapa.perto_de_parede(pos_x, pos_y, dist)
     
     def _ha_parede_no_caminho(self, destino_x, destino_y, mapa):
         """Verifica se há parede no caminho entre a criatura e o destino"""
         if not mapa:
             return False
             
-        # Distância total até o destino
-        distancia_total = math.sqrt((destino_x - self.x)**2 + (destino_y - self.y)**2)
-        
         # Se a distância for muito pequena, não precisa verificar
-        if distancia_total < 10:
+        if (destino_x - self.x)**2 + (destino_y - self.y)**2 < 100:
             return False
-            
-        # Número de pontos a verificar (mais pontos para distâncias maiores)
-        num_pontos = min(10, max(3, int(distancia_total / 20)))
-        
-        # Verifica vários pontos ao longo do caminho
-        for i in range(1, num_pontos + 1):
-            # Posição do ponto a verificar
-            fator = i / (num_pontos + 1)
-            check_x = self.x + (destino_x - self.x) * fator
-            check_y = self.y + (destino_y - self.y) * fator
-            
-            # Verifica se o ponto está perto de uma parede
-            if self._esta_perto_de_parede(mapa, check_x, check_y, self.distancia_seguranca_parede * 0.8):
-                return True  # Encontrou parede no caminho
+        
+        # Distância exata entre o caminho e as paredes (memorizada pelo mapa no tick)
+        if mapa.parede_no_caminho(self.x, self.y, destino_x, destino_y, self.distancia_seguranca_parede * 0.8):
+            return True  # Encontrou parede no caminho
         
         # Verifica se o destino está perto de uma parede
         if self._esta_perto_de_parede(mapa, destino_x, destino_y, self.distancia_seguranca_parede):
@@ -244,30 +184,29 @@ class CriaturaBase:
             
         return False  # Não encontrou parede no caminho
     
+    def _caminhos_livres(self, alvos, mapa, motor=None):
+        """Os alvos sem água (se a criatura não nada) nem parede no caminho; com o motor
+        vetorizado e alvos suficientes, a verificação é feita em lote"""
+        if motor is not None and len(alvos) >= motor.lote_minimo_caminhos:
+            return motor.caminhos_livres(mapa, self, alvos)
+        
+        livres = []
+        for alvo in alvos:
+            if self.velocidade_nado <= 0 and self._ha_agua_no_caminho(alvo.x, alvo.y, mapa):
+                continue
+            if self._ha_parede_no_caminho(alvo.x, alvo.y, mapa):
+                continue
+            livres.append(alvo)
+        return livres
+    
     def _direção_fuga_parede(self, mapa):
         """Calcula a direção para fugir da parede mais próxima"""
         if not mapa:
             return None
             
-        parede_mais_proxima = None
-        ponto_mais_proximo = None
-        menor_distancia = float('inf')
-        
-        # Encontrar a parede mais próxima
-        for parede in mapa.paredes:
-            # Encontra o ponto mais próximo na parede
-            closest_x = max(parede.rect.left, min(self.x, parede.rect.right))
-            closest_y = max(parede.rect.top, min(self.y, parede.rect.bottom))
-            
-            # Calcula a distância entre a criatura e o ponto na parede
-            distancia_x = self.x - closest_x
-            distancia_y = self.y - closest_y
-            distancia = math.sqrt(distancia_x**2 + distancia_y**2)
-            
-            if distancia < menor_distancia:
-                menor_distancia = distancia
-                parede_mais_proxima = parede
-                ponto_mais_proximo = (closest_x, closest_y)
+        # Encontrar o ponto de parede mais próximo (campo de distância do mapa)
+        mais_proxima = mapa.parede_mais_proxima(self.x, self.y)
+        ponto_mais_proximo = mais_proxima[1:] if mais_proxima else None
         
         if ponto_mais_proximo:
             # Calcular ângulo na direção oposta à parede
@@ -277,17 +216,29 @@ class CriaturaBase:
             # Se a distância for muito pequena, adicionar um pequeno offset aleatório
             # para evitar divisão por zero
             if abs(dx) < 0.1 and abs(dy) < 0.1:
-                dx += random.uniform(-1, 1)
-                dy += random.uniform(-1, 1)
+                dx += self.rng.uniform(-1, 1)
+                dy += self.rng.uniform(-1, 1)
                 
             return math.atan2(dy, dx)
             
         return None
     
+    def _buscar_saida_agua(self, mapa):
+        """Tenta encontrar e se mover em direção à terra mais próxima"""
+        # Direção da terra mais próxima pelo campo de saída da água do mapa
+        melhor_direcao = mapa.direcao_saida_agua(self.x, self.y)
+        
+        # Se encontrou terra, move-se nessa direção
+        if melhor_direcao is not None:
+            self.direcao = melhor_direcao
+        else:
+            # Se não encontrou terra, move-se em uma direção aleatória
+            self.direcao = self.rng.uniform(0, 2 * math.pi)
+    
     def _evitar_agua(self):
         """Muda a direção para evitar água detectada à frente"""
         # Muda a direção para uma direção perpendicular
-        novo_angulo = self.direcao + random.choice([math.pi/2, -math.pi/2])
+        novo_angulo = self.direcao + self.rng.choice([math.pi/2, -math.pi/2])
         self.direcao = novo_angulo % (2 * math.pi)  # Normaliza o ângulo
     
     def _evitar_parede(self, mapa):
@@ -300,14 +251,35 @@ class CriaturaBase:
             self.direcao = direcao_fuga
             
             # Adiciona um pequeno desvio aleatório para comportamento mais natural
-            self.direcao += random.uniform(-0.2, 0.2)
+            self.direcao += self.rng.uniform(-0.2, 0.2)
             return True
             
         return False
     
     def atualizar(self, *args, **kwargs):
         """Método base de atualização a ser implementado pelas subclasses"""
-        # Verificar se morreu de velhice
+        # Verificar se morreu de velhice ou de fome
+        if not self._envelhecer():
+            return False
+        
+        # Verificar se está em água para atualizar estado de natação
+        self.esta_nadando = False
+        if 'mapa' in kwargs and kwargs['mapa']:
+            self._perceber_ambiente(kwargs['mapa'])
+        
+        # Como uma última linha de defesa, forçar limites absolutos do mapa
+        self._aplicar_limites_absolutos()
+        
+        return True  # Continua vivo por padrão
+    
+    # O tick de cada criatura é dividido em fases (envelhecer, perceber o ambiente, decidir,
+    # mover, interagir). O `atualizar` das subclasses executa as fases em sequência; o motor
+    # vetorizado executa as fases físicas em arrays e chama apenas _decidir e _interagir.
+    # Nascimentos e remoções feitos nas interações são registrados em `intencoes` (intencoes.py)
+    # e só alteram as listas da simulação no final do tick.
+    
+    def _envelhecer(self):
+        """Envelhece e consome energia; retorna False se a criatura morreu de velhice ou fome"""
         self.idade += 1
         if self.idade >= self.longevidade:
             return False  # Morreu de velhice
@@ -318,54 +290,80 @@ class CriaturaBase:
         
         # Consumir energia constantemente
         self.energia -= self.consumo_energia
+        return True
+    
+    def _perceber_ambiente(self, mapa):
+        """Desvia de paredes e de água à frente e atualiza o estado de natação"""
+        # Verificar se está perto de uma parede e evitar se necessário
+        if self._esta_perto_de_parede(mapa):
+            self._evitar_parede(mapa)
+        
+        # Detectar água à frente e evitar se não souber nadar
+        if self._detectar_agua_a_frente(mapa):
+            self._evitar_agua()
+        
+        if mapa.tipo_em(self.x, self.y) == AGUA:
+            self._nadar()
+    
+    def _nadar(self):
+        """Atualiza o estado de natação de uma criatura que está na água"""
+        self.esta_nadando = True
+        self.contador_nado += 0.2
+        
+        # A criatura está na água mas não sabe nadar - efeito de desespero
+        if self.velocidade_nado <= 0:
+            # Tentar sair da água com movimentos mais rápidos e aleatórios
+            if self.rng.random() < 0.3:  # 30% de chance de mudar direção em pânico
+                self.direcao = self.rng.uniform(0, 2 * math.pi)
+    
+    def _decidir(self, alimentos, criaturas, predadores, registro, mapa=None, grade_presas=None, grade_predadores=None):
+        """Escolhe a direção do movimento; retorna False se a criatura não deve se mover neste tick"""
+        return True
+    
+    def _mover(self, mapa=None):
+        """Aplica os efeitos do terreno, move a criatura e resolve colisões com paredes"""
+        # Aplicar efeitos do terreno se houver mapa
+        if mapa:
+            mapa.aplicar_efeitos_terreno(self)
+        else:
+            # Sem mapa, usa velocidade padrão
+            self.velocidade_atual = self.velocidade
         
-        # Verificar se está em água para atualizar estado de natação
-        self.esta_nadando = False
-        if 'mapa' in kwargs and kwargs['mapa']:
-            mapa = kwargs['mapa']
-            
-            # Verificar se está perto de uma parede e evitar se necessário
-            if self._esta_perto_de_parede(mapa):
-                self._evitar_parede(mapa)
-            
-            # Detectar água à frente e evitar se não souber nadar
-            if self._detectar_agua_a_frente(mapa):
-                self._evitar_agua()
-            
-            terreno_atual = mapa.obter_terreno(self.x, self.y)
-            if terreno_atual.nome == "Água":
-                self.esta_nadando = True
-                self.contador_nado += 0.2
-                
-                # A criatura está na água mas não sabe nadar - efeito de desespero
-                if self.velocidade_nado <= 0:
-                    # Tentar sair da água com movimentos mais rápidos e aleatórios
-                    if random.random() < 0.3:  # 30% de chance de mudar direção em pânico
-                        self.direcao = random.uniform(0, 2 * math.pi)
+        # Mover usando a velocidade afetada pelo terreno
+        self.x += math.cos(self.direcao) * self.velocidade_atual
+        self.y += math.sin(self.direcao) * self.velocidade_atual
         
-        # Como uma última linha de defesa, forçar limites absolutos do mapa
-        self._aplicar_limites_absolutos()
+        # Verificar colisão com paredes se houver mapa
+        if mapa:
+            mapa.verificar_colisao_paredes(self)
+        else:
+            # Manter dentro dos limites da tela (comportamento padrão se não houver mapa)
+            self.x = max(0, min(self.WIDTH, self.x))
+            self.y = max(0, min(self.HEIGHT, self.y))
         
-        return True  # Continua vivo por padrão
+        # Resetar o efeito de bloqueio de direção
+        self.direção_bloqueada = False
+    
+    def _interagir(self, alimentos, criaturas, predadores, intencoes, grade_presas=None, grade_predadores=None):
+        """Interações depois do movimento (comer, caçar, reproduzir)"""
+        pass
     
-    def desenhar(self, superficie):
-        """Método base de desenho com comportamentos comuns"""
-        # Desenhar campo de visão como um círculo transparente
-        s = pygame.Surface((self.campo_visao*2, self.campo_visao*2), pygame.SRCALPHA)
+    def cor_campo_visao(self):
+        """Cor (RGBA) do campo de visão desenhado pela CamadaVisao, ou None para não desenhar"""
         # A cor do campo de visão varia por tipo - será definida nas subclasses
-        cor_campo = (100, 100, 100, 10)  # Cinza transparente padrão
-        pygame.draw.circle(s, cor_campo, (self.campo_visao, self.campo_visao), self.campo_visao)
-        superficie.blit(s, (int(self.x - self.campo_visao), int(self.y - self.campo_visao)))
-        
-        # Ajustar cor baseada na idade (fica mais clara conforme envelhece)
+        return (100, 100, 100, 10)  # Cinza transparente padrão
+    
+    def _cor_ajustada(self):
+        """Cor do corpo, mais clara conforme envelhece"""
         idade_rel = min(1.0, self.idade / self.longevidade)
-        cor_ajustada = (
+        return (
             min(255, self.cor[0] + int(40 * idade_rel)),
             min(255, self.cor[1] + int(40 * idade_rel)),
             min(255, self.cor[2] + int(40 * idade_rel))
         )
-        
-        # Posição ajustada para efeito de natação
+    
+    def _posicao_desenho(self, superficie):
+        """Posição do corpo na tela (com a ondulação de quem nada); desenha o rastro de bolhas"""
         pos_x = int(self.x)
         pos_y = int(self.y)
         
@@ -383,21 +381,57 @@ class CriaturaBase:
                 pygame.draw.circle(superficie, (200, 240, 255, 150), (int(bolha_x), int(bolha_y)), 
                                  random.randint(1, max(2, int(self.velocidade_nado * 3))))
         
-        # Desenhar corpo (implementação específica nas subclasses)
-        self._desenhar_corpo(superficie, pos_x, pos_y, cor_ajustada)
-        
-        # Desenhar barra de energia
+        return pos_x, pos_y
+    
+    def estado_forma(self):
+        """O que muda a forma desenhada além da cor e do tamanho (chave do cache de sprites)"""
+        return ()
+    
+    def estado_detalhes(self):
+        """O que muda os detalhes (olhos, barbatanas) além do tamanho e da direção; None se não houver"""
+        return None
+    
+    def raio_sprite(self):
+        """Metade do lado dos sprites: cabem o corpo, os olhos e as barbatanas"""
+        return int(self.tamanho * (2 + 1.2 * max(0, self.velocidade_nado))) + 2
+    
+    def itens_desenho(self, superficie, sprites):
+        """Pares (Surface, posição) do corpo e da barra de energia, para um único blits da simulação"""
+        pos_x, pos_y = self._posicao_desenho(superficie)
+        
+        # Corpo (implementação específica nas subclasses, pré-renderizada pelo cache): a forma,
+        # com a cor da entidade, e por cima os detalhes que seguem a direção
+        forma, raio = sprites.forma(self, self._cor_ajustada())
+        itens = [(forma, (pos_x - raio, pos_y - raio))]
+        detalhes = sprites.detalhes(self)
+        if detalhes is not None:
+            detalhes, raio = detalhes
+            itens.append((detalhes, (pos_x - raio, pos_y - raio)))
+        
+        # Barra de energia
         max_barra = 20
         comprimento_barra = max(1, int((self.energia / self.stamina) * max_barra))
-        pygame.draw.rect(superficie, (255, 255, 255), (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5, max_barra, 3))
-        cor_barra = self._obter_cor_barra_energia()
-        pygame.draw.rect(superficie, cor_barra, (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5, comprimento_barra, 3))
+        barra = sprites.barra(comprimento_barra, max_barra, self._obter_cor_barra_energia())
+        itens.append((barra, (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5)))
+        return itens
     
-    def _desenhar_corpo(self, superficie, pos_x, pos_y, cor_ajustada):
-        """Método para desenhar o corpo da criatura, a ser sobrescrito pelas subclasses"""
+    def desenhar(self, superficie, sprites):
+        """Desenha só esta entidade (a simulação desenha todas de uma vez com itens_desenho)"""
+        superficie.blits(self.itens_desenho(superficie, sprites), False)
+    
+    def _desenhar_forma(self, superficie, pos_x, pos_y, cor_ajustada, tamanho=None):
+        """Método para desenhar a forma da criatura, a ser sobrescrito pelas subclasses
+        (`tamanho`: a faixa de tamanho do sprite em cache; sem ele, o da própria criatura)"""
+        if tamanho is None:
+            tamanho = self.tamanho
+        
         # Implementação padrão - círculo simples
-        pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(self.tamanho))
-        pygame.draw.circle(superficie, (255, 255, 255), (pos_x, pos_y), int(self.tamanho), 1)
+        pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(tamanho))
+        pygame.draw.circle(superficie, (255, 255, 255), (pos_x, pos_y), int(tamanho), 1)
+    
+    def _desenhar_detalhes(self, superficie, pos_x, pos_y):
+        """Detalhes que seguem a direção do movimento (olhos, barbatanas), nas subclasses"""
+        pass
     
     def _obter_cor_barra_energia(self):
         """Retorna a cor da barra de energia, pode ser sobrescrito pelas subclasses"""
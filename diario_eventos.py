@@ -0,0 +1,347 @@
+"""
+Diário de eventos de uma execução: nascimentos (com o pai e os atributos), mortes (com a
+causa), predações, alimentos surgidos e comidos, e quadros-chave periódicos com a posição de
+todas as entidades e alimentos. Serve para estudar e rever a execução depois (reprodutor.py)
+sem simular de novo.
+
+O arquivo começa com o mesmo cabeçalho dos snapshots (JSON e seções com o mapa, ver
+estado_salvo.py), seguido dos registros em binário little-endian, um atrás do outro; cada
+registro começa com o tipo (1 byte) e o tick (4 bytes). Os registros são acumulados num
+buffer e gravados em blocos, então registrar um evento custa só um struct.pack.
+"""
+import bisect
+import random
+import struct
+import sys
+from array import array
+
+from criatura import Criatura
+from predador import Predador
+from canibal import Canibal
+from alimento import Alimento
+from estado_salvo import Escritor, codificar_mapa, decodificar_mapa, escrever_cabecalho, ler_cabecalho
+
+ASSINATURA = b"SIMLOG\0\0"
+VERSAO = 1
+
+# Tipos de registro
+NASCIMENTO = 1
+MORTE = 2
+PREDACAO = 3
+REFEICAO = 4
+ALIMENTO = 5
+QUADRO_CHAVE = 6
+
+# tipo, tick, id, id do pai (0 = sem pai), espécie, x, y, velocidade, stamina, longevidade,
+# tamanho, velocidade de nado, cor (r, g, b)
+REGISTRO_NASCIMENTO = struct.Struct('<BIIIBfffffffBBB')
+# tipo, tick, id, causa, x, y
+REGISTRO_MORTE = struct.Struct('<BIIBff')
+# tipo, tick, id do predador, id da vítima
+REGISTRO_PREDACAO = struct.Struct('<BIII')
+# tipo, tick, id de quem comeu, x e y do alimento
+REGISTRO_REFEICAO = struct.Struct('<BIIff')
+# tipo, tick, x, y, valor nutricional
+REGISTRO_ALIMENTO = struct.Struct('<BIffH')
+# tipo, tick, número de entidades, número de alimentos; seguem os arrays de ids ('I'), posições
+# das entidades (x, y em 'f'), posições dos alimentos ('f') e valores nutricionais ('H')
+REGISTRO_QUADRO_CHAVE = struct.Struct('<BIII')
+
+# Espécies e causas de morte (índices gravados nos registros)
+ESPECIES = ('presa', 'predador', 'canibal')
+CODIGO_ESPECIE = {Criatura: 0, Predador: 1, Canibal: 2}
+CAUSAS = ('velhice', 'fome', 'devorado')
+VELHICE, FOME, DEVORADO = range(3)
+
+# Registros de tamanho fixo, por tipo
+TAMANHOS = {
+    NASCIMENTO: REGISTRO_NASCIMENTO.size,
+    MORTE: REGISTRO_MORTE.size,
+    PREDACAO: REGISTRO_PREDACAO.size,
+    REFEICAO: REGISTRO_REFEICAO.size,
+    ALIMENTO: REGISTRO_ALIMENTO.size,
+}
+
+
+def _little_endian(dados):
+    """Array em little-endian, a ordem dos registros"""
+    if sys.byteorder != 'little':
+        dados.byteswap()
+    return dados
+
+
+class DiarioEventos:
+    """Grava o diário de eventos de uma simulação (ligado por Simulacao.iniciar_diario)"""
+    def __init__(self, caminho, intervalo_quadro_chave=30, tamanho_buffer=1 << 16):
+        self.caminho = caminho
+        self.intervalo_quadro_chave = max(1, intervalo_quadro_chave)
+        self.tamanho_buffer = tamanho_buffer
+        self.arquivo = None
+        self.buffer = bytearray()
+
+        # Ids das entidades com nascimento registrado, para registrar as inseridas fora do tick (editor)
+        self.conhecidos = set()
+        self.ultimo_quadro_chave = None
+
+    def iniciar(self, simulacao):
+        """Grava o cabeçalho com o mapa, o estado inicial como nascimentos e o primeiro quadro-chave"""
+        escritor = Escritor()
+        cabecalho = {
+            'versao': VERSAO,
+            'largura': simulacao.WIDTH,
+            'altura': simulacao.HEIGHT,
+            'tick_inicial': simulacao.tempo,
+            'intervalo_quadro_chave': self.intervalo_quadro_chave,
+            'especies': ESPECIES,
+            'causas': CAUSAS,
+            'mapa': codificar_mapa(simulacao.mapa, escritor),
+        }
+        self.arquivo = open(self.caminho, 'wb')
+        escrever_cabecalho(self.arquivo, ASSINATURA, cabecalho, escritor)
+
+        self.sincronizar(simulacao)
+        self.quadro_chave(simulacao)
+
+    def registrar(self, tick, intencoes):
+        """Registra as mortes, predações, refeições e nascimentos do tick (antes de serem aplicados)"""
+        buffer = self.buffer
+        autores = intencoes.autores
+        for chave, objeto in intencoes.removidos.items():
+            autor = autores.get(chave)
+            if isinstance(objeto, Alimento):
+                buffer += REGISTRO_REFEICAO.pack(REFEICAO, tick, autor.id if autor is not None else 0,
+                                                 objeto.x, objeto.y)
+                continue
+
+            if autor is not None:
+                buffer += REGISTRO_PREDACAO.pack(PREDACAO, tick, autor.id, objeto.id)
+                causa = DEVORADO
+            elif objeto.idade >= objeto.longevidade:
+                causa = VELHICE
+            else:
+                causa = FOME
+            buffer += REGISTRO_MORTE.pack(MORTE, tick, objeto.id, causa, objeto.x, objeto.y)
+            self.conhecidos.discard(objeto.id)
+
+        for objeto, _ in intencoes.nascimentos:
+            self._nascimento(tick, objeto, autores.get(id(objeto)))
+
+        if len(buffer) >= self.tamanho_buffer:
+            self.descarregar()
+
+    def _nascimento(self, tick, entidade, pai=None):
+        cor = entidade.cor
+        self.buffer += REGISTRO_NASCIMENTO.pack(
+            NASCIMENTO, tick, entidade.id, pai.id if pai is not None else 0, CODIGO_ESPECIE.get(type(entidade), 0),
+            entidade.x, entidade.y, entidade.velocidade, entidade.stamina, entidade.longevidade,
+            entidade.tamanho, entidade.velocidade_nado, cor[0], cor[1], cor[2])
+        self.conhecidos.add(entidade.id)
+
+    def alimento_novo(self, tick, alimento):
+        """Registra um alimento que surgiu no mapa"""
+        self.buffer += REGISTRO_ALIMENTO.pack(ALIMENTO, tick, alimento.x, alimento.y,
+                                              min(65535, int(alimento.valor_nutricional)))
+
+    def sincronizar(self, simulacao):
+        """Registra como nascimentos (sem pai) as entidades que entraram nas listas fora do tick"""
+        conhecidos = self.conhecidos
+        for lista in (simulacao.criaturas, simulacao.predadores):
+            for entidade in lista:
+                if entidade.id not in conhecidos:
+                    self._nascimento(simulacao.tempo, entidade)
+
+    def fim_do_tick(self, simulacao):
+        """Grava um quadro-chave a cada `intervalo_quadro_chave` ticks"""
+        if simulacao.tempo % self.intervalo_quadro_chave == 0:
+            self.quadro_chave(simulacao)
+
+    def quadro_chave(self, simulacao):
+        """Grava a posição de todas as entidades e alimentos"""
+        entidades = simulacao.criaturas + simulacao.predadores
+        alimentos = simulacao.alimentos
+        buffer = self.buffer
+        buffer += REGISTRO_QUADRO_CHAVE.pack(QUADRO_CHAVE, simulacao.tempo, len(entidades), len(alimentos))
+        buffer += _little_endian(array('I', [e.id for e in entidades])).tobytes()
+        buffer += _little_endian(array('f', [v for e in entidades for v in (e.x, e.y)])).tobytes()
+        buffer += _little_endian(array('f', [v for a in alimentos for v in (a.x, a.y)])).tobytes()
+        buffer += _little_endian(array('H', [min(65535, int(a.valor_nutricional)) for a in alimentos])).tobytes()
+        self.ultimo_quadro_chave = simulacao.tempo
+        self.descarregar()
+
+    def descarregar(self):
+        """Grava o buffer no arquivo"""
+        if self.buffer:
+            self.arquivo.write(self.buffer)
+            self.buffer.clear()
+
+    def fechar(self, simulacao=None):
+        """Grava um último quadro-chave com o estado final e fecha o arquivo"""
+        if self.arquivo is None:
+            return
+        if simulacao is not None and simulacao.tempo != self.ultimo_quadro_chave:
+            self.quadro_chave(simulacao)
+        self.descarregar()
+        self.arquivo.close()
+        self.arquivo = None
+
+
+class QuadroChave:
+    """Posições de um quadro-chave decodificadas"""
+    __slots__ = ('tick', 'ids', 'posicoes', 'alimentos', 'valores')
+
+    def __init__(self, tick, ids, posicoes, alimentos, valores):
+        self.tick = tick
+        self.ids = ids
+        self.posicoes = posicoes
+        self.alimentos = alimentos
+        self.valores = valores
+
+
+class LeitorDiario:
+    """Lê um diário de eventos e refaz o estado de qualquer tick a partir do quadro-chave anterior"""
+    def __init__(self, caminho):
+        with open(caminho, 'rb') as arquivo:
+            self.cabecalho, self.secoes = ler_cabecalho(arquivo, ASSINATURA, VERSAO, "diário de eventos")
+            self.dados = arquivo.read()
+
+        self.largura = self.cabecalho['largura']
+        self.altura = self.cabecalho['altura']
+
+        # Uma passada pelos registros: posição de cada quadro-chave, atributos e morte de cada entidade
+        self.ticks_chave = []
+        self.offsets_chave = []
+        self.nascimentos = {}
+        self.mortes = {}
+        self.predacoes = []
+        self.contagens = dict.fromkeys((NASCIMENTO, MORTE, PREDACAO, REFEICAO, ALIMENTO, QUADRO_CHAVE), 0)
+        self._indexar()
+
+        self.tick_inicial = self.ticks_chave[0] if self.ticks_chave else self.cabecalho['tick_inicial']
+        self.tick_final = self.ticks_chave[-1] if self.ticks_chave else self.tick_inicial
+        self._cache_chave = {}
+
+    def _indexar(self):
+        dados = self.dados
+        offset = 0
+        fim = len(dados)
+        while offset < fim:
+            tipo = dados[offset]
+            if tipo == QUADRO_CHAVE:
+                if offset + REGISTRO_QUADRO_CHAVE.size > fim:
+                    break
+                _, tick, n, m = REGISTRO_QUADRO_CHAVE.unpack_from(dados, offset)
+                tamanho = REGISTRO_QUADRO_CHAVE.size + n * 12 + m * 10
+                if offset + tamanho > fim:
+                    break  # Quadro-chave incompleto (execução interrompida)
+                self.ticks_chave.append(tick)
+                self.offsets_chave.append(offset)
+            else:
+                tamanho = TAMANHOS.get(tipo)
+                if tamanho is None:
+                    raise ValueError(f"registro desconhecido ({tipo}) no byte {offset} do diário")
+                if offset + tamanho > fim:
+                    break
+                if tipo == NASCIMENTO:
+                    registro = REGISTRO_NASCIMENTO.unpack_from(dados, offset)
+                    self.nascimentos[registro[2]] = registro
+                elif tipo == MORTE:
+                    registro = REGISTRO_MORTE.unpack_from(dados, offset)
+                    self.mortes[registro[2]] = registro
+                elif tipo == PREDACAO:
+                    self.predacoes.append(REGISTRO_PREDACAO.unpack_from(dados, offset))
+            self.contagens[tipo] += 1
+            offset += tamanho
+        self.fim_dados = offset
+
+    def criar_mapa(self):
+        """Refaz o mapa da execução"""
+        return decodificar_mapa(self.cabecalho['mapa'], self.secoes, self.largura, self.altura, random.Random(0))
+
+    def _quadro_chave(self, indice):
+        """Decodifica o quadro-chave (os dois últimos usados ficam em cache)"""
+        quadro = self._cache_chave.get(indice)
+        if quadro is not None:
+            return quadro
+
+        dados = self.dados
+        offset = self.offsets_chave[indice]
+        _, tick, n, m = REGISTRO_QUADRO_CHAVE.unpack_from(dados, offset)
+        offset += REGISTRO_QUADRO_CHAVE.size
+        secoes = []
+        for typecode, quantidade, largura in (('I', n, 4), ('f', 2 * n, 4), ('f', 2 * m, 4), ('H', m, 2)):
+            secao = array(typecode)
+            secao.frombytes(dados[offset:offset + quantidade * largura])
+            secoes.append(_little_endian(secao))
+            offset += quantidade * largura
+        quadro = QuadroChave(tick, *secoes)
+
+        if len(self._cache_chave) >= 2:
+            self._cache_chave.pop(next(iter(self._cache_chave)))
+        self._cache_chave[indice] = quadro
+        return quadro
+
+    def eventos(self, inicio, fim=None):
+        """Registros (tuplas) entre dois quadros-chave: do quadro-chave `inicio` até o seguinte"""
+        dados = self.dados
+        offset = self.offsets_chave[inicio]
+        _, _, n, m = REGISTRO_QUADRO_CHAVE.unpack_from(dados, offset)
+        offset += REGISTRO_QUADRO_CHAVE.size + n * 12 + m * 10
+        limite = self.offsets_chave[inicio + 1] if inicio + 1 < len(self.offsets_chave) else self.fim_dados
+        estruturas = {
+            NASCIMENTO: REGISTRO_NASCIMENTO,
+            MORTE: REGISTRO_MORTE,
+            PREDACAO: REGISTRO_PREDACAO,
+            REFEICAO: REGISTRO_REFEICAO,
+            ALIMENTO: REGISTRO_ALIMENTO,
+        }
+        while offset < limite:
+            estrutura = estruturas[dados[offset]]
+            registro = estrutura.unpack_from(dados, offset)
+            if fim is not None and registro[1] > fim:
+                return
+            yield registro
+            offset += estrutura.size
+
+    def estado_em(self, tick):
+        """Entidades (id -> (x, y)) e alimentos ((x, y) -> valor) no tick, com as posições
+        interpoladas entre os quadros-chave"""
+        tick = max(self.tick_inicial, min(self.tick_final, tick))
+        indice = max(0, bisect.bisect_right(self.ticks_chave, tick) - 1)
+        anterior = self._quadro_chave(indice)
+        seguinte = self._quadro_chave(indice + 1) if indice + 1 < len(self.ticks_chave) else None
+
+        ids = anterior.ids
+        posicoes = anterior.posicoes
+        entidades = {ids[i]: (posicoes[2 * i], posicoes[2 * i + 1]) for i in range(len(ids))}
+        nascidos = {}
+
+        alimentos = {}
+        posicoes_alimentos = anterior.alimentos
+        for i, valor in enumerate(anterior.valores):
+            alimentos[(posicoes_alimentos[2 * i], posicoes_alimentos[2 * i + 1])] = valor
+
+        for registro in self.eventos(indice, tick):
+            tipo = registro[0]
+            if tipo == NASCIMENTO:
+                entidades[registro[2]] = (registro[5], registro[6])
+                nascidos[registro[2]] = registro[1]
+            elif tipo == MORTE:
+                entidades.pop(registro[2], None)
+            elif tipo == REFEICAO:
+                alimentos.pop((registro[3], registro[4]), None)
+            elif tipo == ALIMENTO:
+                alimentos[(registro[2], registro[3])] = registro[4]
+
+        # Entre dois quadros-chave, cada entidade anda em linha reta até a posição do seguinte
+        if seguinte is not None and seguinte.tick > tick:
+            proximas = seguinte.posicoes
+            destino = {seguinte.ids[i]: i for i in range(len(seguinte.ids))}
+            for id_entidade, (x, y) in entidades.items():
+                i = destino.get(id_entidade)
+                if i is None:
+                    continue
+                partida = nascidos.get(id_entidade, anterior.tick)
+                fracao = (tick - partida) / (seguinte.tick - partida)
+                entidades[id_entidade] = (x + (proximas[2 * i] - x) * fracao, y + (proximas[2 * i + 1] - y) * fracao)
+
+        return entidades, alimentos
@@ -1,6 +1,5 @@
 import pygame
 import pygame_gui
-import random
 import math
 from terreno import Grama, Agua, Lama, Gelo, Deserto, Montanha, Floresta, Pantano
 from criatura import Criatura
@@ -432,7 +431,7 @@ class EditorTools:
                     distancia = math.sqrt((centro_x - x)**2 + (centro_y - y)**2)
                     if distancia <= raio:
                         # Define o novo terreno
-                        self.simulacao.mapa.terrenos[cx][cy] = classe_terreno()
+                        self.simulacao.mapa.definir_terreno(centro_x, centro_y, classe_terreno)
     
     def _aplicar_criatura(self, x, y):
         """Aplica a ferramenta de criatura na posição especificada"""
@@ -442,7 +441,7 @@ class EditorTools:
         # Define a velocidade de nado se a opção estiver ativa
         velocidade_nado = None
         if self.aquatico_ativo:
-            velocidade_nado = random.uniform(0.5, 1.2)
+            velocidade_nado = self.simulacao.rng.uniform(0.5, 1.2)
         
         # Adiciona uma nova criatura na posição do mouse
         nova_criatura = classe_criatura(
@@ -450,7 +449,8 @@ class EditorTools:
             y=y,
             velocidade_nado=velocidade_nado,
             WIDTH=self.simulacao.WIDTH,
-            HEIGHT=self.simulacao.HEIGHT
+            HEIGHT=self.simulacao.HEIGHT,
+            rng=self.simulacao.rng
         )
         
         # Adiciona a criatura à lista apropriada
@@ -458,6 +458,7 @@ class EditorTools:
             self.simulacao.criaturas.append(nova_criatura)
         else:
             self.simulacao.predadores.append(nova_criatura)
+        self.simulacao.agregados.adicionar(nova_criatura, self.simulacao.tempo)
     
     def _aplicar_mutacao(self, x, y):
         """Aplica a ferramenta de mutação nas criaturas próximas"""
@@ -492,7 +493,12 @@ class EditorTools:
                     
                     # Caso especial para velocidade de nado: se era zero, torna possível nadar
                     if atributo == "velocidade_nado" and valor_atual == 0 and self.valor_mutacao > 1:
-                        setattr(criatura, atributo, random.uniform(0.3, 0.8))
+                        setattr(criatura, atributo, criatura.rng.uniform(0.3, 0.8))
+                    
+                    # O motor vetorizado guarda os atributos fixos em arrays; os agregados, suas somas
+                    if self.simulacao.motor is not None:
+                        self.simulacao.motor.recarregar(criatura)
+                    self.simulacao.agregados.atualizar(criatura)
     
     def atualizar(self, dt):
         """Atualiza a interface do editor"""
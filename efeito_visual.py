@@ -1,36 +1,34 @@
 import pygame
-import random
-import math
+
+from textos import renderizar
 
 class EfeitoVisual:
-    """Classe para gerenciar efeitos visuais temporários na simulação"""
-    def __init__(self):
+    """Classe para gerenciar efeitos visuais temporários na simulação (ondas, textos e flashes
+    como dicionários; as partículas, muito mais numerosas, no SistemaParticulas)"""
+    def __init__(self, ativo=True):
         self.efeitos = []
+        # Quando inativo (simulação sem interface), nenhum efeito é criado
+        self.ativo = ativo
+        
+        # Partículas ficam em arrays NumPy (importado só quando há interface)
+        if ativo:
+            from particulas import SistemaParticulas
+            self.particulas = SistemaParticulas()
+        else:
+            self.particulas = None
     
     def adicionar_particulas(self, x, y, cor, num_particulas=10, vida_max=30, velocidade=1.5, tamanho=2):
         """Adiciona um efeito de partículas"""
-        for _ in range(num_particulas):
-            angulo = random.uniform(0, 2 * math.pi)
-            velocidade_rand = random.uniform(0.5, velocidade)
-            vx = math.cos(angulo) * velocidade_rand
-            vy = math.sin(angulo) * velocidade_rand
-            vida = random.randint(vida_max // 2, vida_max)
-            tamanho_rand = random.uniform(tamanho * 0.7, tamanho * 1.3)
-            
-            self.efeitos.append({
-                'tipo': 'particula',
-                'x': x,
-                'y': y,
-                'vx': vx,
-                'vy': vy,
-                'cor': cor,
-                'vida': vida,
-                'vida_max': vida,
-                'tamanho': tamanho_rand
-            })
+        if not self.ativo:
+            return
+        
+        self.particulas.adicionar(x, y, cor, num_particulas, vida_max, velocidade, tamanho)
     
     def adicionar_onda(self, x, y, cor, raio_max=50, espessura=2, vida_max=20):
         """Adiciona um efeito de onda circular que se expande"""
+        if not self.ativo:
+            return
+            
         self.efeitos.append({
             'tipo': 'onda',
             'x': x,
@@ -45,8 +43,11 @@ class EfeitoVisual:
     
     def adicionar_texto_flutuante(self, x, y, texto, cor, vida_max=40, tamanho_fonte=14):
         """Adiciona um texto flutuante que sobe e desaparece"""
-        fonte = pygame.font.SysFont("Arial", tamanho_fonte)
-        texto_renderizado = fonte.render(texto, True, cor)
+        if not self.ativo:
+            return
+            
+        # Cópia própria do texto do cache: a transparência dela muda a cada quadro
+        texto_renderizado = renderizar(texto, "Arial", tamanho_fonte, cor).copy()
         
         self.efeitos.append({
             'tipo': 'texto',
@@ -60,6 +61,9 @@ class EfeitoVisual:
     
     def adicionar_flash(self, x, y, cor, raio_max=30, vida_max=10):
         """Adiciona um flash de luz que aparece e desaparece rapidamente"""
+        if not self.ativo:
+            return
+            
         self.efeitos.append({
             'tipo': 'flash',
             'x': x,
@@ -72,6 +76,9 @@ class EfeitoVisual:
     
     def atualizar(self):
         """Atualiza todos os efeitos ativos"""
+        if self.particulas is not None:
+            self.particulas.atualizar()
+        
         # Filtrar e atualizar efeitos
         novos_efeitos = []
         
@@ -84,16 +91,7 @@ class EfeitoVisual:
                 continue
             
             # Atualizar baseado no tipo
-            if efeito['tipo'] == 'particula':
-                # Atualizar posição
-                efeito['x'] += efeito['vx']
-                efeito['y'] += efeito['vy']
-                
-                # Adicionar gravidade para algumas partículas
-                if random.random() < 0.3:
-                    efeito['vy'] += 0.05
-                
-            elif efeito['tipo'] == 'onda':
+            if efeito['tipo'] == 'onda':
                 # Expandir raio
                 efeito['raio'] += (efeito['raio_max'] - 5) / efeito['vida_max']
                 
@@ -109,25 +107,14 @@ class EfeitoVisual:
     
     def desenhar(self, superficie):
         """Desenha todos os efeitos ativos"""
+        if self.particulas is not None:
+            self.particulas.desenhar(superficie)
+        
         for efeito in self.efeitos:
             # Calcular transparência baseada na vida restante
             alpha = int(255 * (efeito['vida'] / efeito['vida_max']))
             
-            if efeito['tipo'] == 'particula':
-                # Desenhar partícula com transparência
-                cor = list(efeito['cor'])
-                if len(cor) == 3:
-                    cor.append(alpha)  # Adicionar canal alpha
-                else:
-                    cor[3] = alpha  # Atualizar canal alpha
-                
-                # Criar superfície para a partícula
-                tamanho = int(efeito['tamanho'])
-                part_surf = pygame.Surface((tamanho*2, tamanho*2), pygame.SRCALPHA)
-                pygame.draw.circle(part_surf, tuple(cor), (tamanho, tamanho), tamanho)
-                superficie.blit(part_surf, (int(efeito['x'] - tamanho), int(efeito['y'] - tamanho)))
-                
-            elif efeito['tipo'] == 'onda':
+            if efeito['tipo'] == 'onda':
                 # Desenhar onda com transparência
                 cor = list(efeito['cor'])
                 if len(cor) == 3:
@@ -149,9 +136,8 @@ class EfeitoVisual:
                 
             elif efeito['tipo'] == 'texto':
                 # Aplicar transparência ao texto
-                texto_surf = efeito['texto'].copy()
-                texto_surf.set_alpha(alpha)
-                superficie.blit(texto_surf, (int(efeito['x']), int(efeito['y'])))
+                efeito['texto'].set_alpha(alpha)
+                superficie.blit(efeito['texto'], (int(efeito['x']), int(efeito['y'])))
                 
             elif efeito['tipo'] == 'flash':
                 # Desenhar flash com transparência
@@ -179,3 +165,5 @@ class EfeitoVisual:
     def limpar(self):
         """Remove todos os efeitos visuais"""
         self.efeitos = []
+        if self.particulas is not None:
+            self.particulas.limpar()
@@ -0,0 +1,422 @@
+"""
+Snapshots binários do estado completo da simulação.
+
+O arquivo tem um cabeçalho JSON pequeno (escalares, estatísticas, esquema das tabelas)
+seguido de arrays tipados (módulo array), uma seção por coluna: cada lista de entidades
+(criaturas, predadores, alimentos) vira uma tabela por classe, com uma coluna por atributo.
+Nada é serializado com pickle; carregar recria os objetos sem passar pelos construtores,
+então a simulação continua exatamente do ponto salvo (mesmo estado do gerador aleatório).
+"""
+import gc
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+from itertools import repeat
+from operator import itemgetter
+
+from criatura_base import CriaturaBase
+from criatura import Criatura
+from predador import Predador
+from canibal import Canibal
+from alimento import Alimento
+from mapa import Mapa
+from parede import Parede
+
+ASSINATURA = b"SIMSNAP\0"
+VERSAO = 1
+
+# Classes que podem aparecer nas listas da simulação
+CLASSES = {classe.__name__: classe for classe in (Criatura, Predador, Canibal, Alimento)}
+
+# Listas da simulação salvas, na ordem de carregamento
+LISTAS = ('criaturas', 'predadores', 'alimentos')
+
+# Atributos recalculados antes de serem lidos em cada tick: não são salvos e voltam com o valor inicial
+TRANSITORIOS = {'predadores_detectados': list}
+
+
+class EntidadeAusente:
+    """Referência a uma entidade que já não existe (alvo morto): só o id, como o tick precisa"""
+    __slots__ = ('id',)
+
+    def __init__(self, id_entidade):
+        self.id = id_entidade
+
+
+class Escritor:
+    """Acumula as seções (arrays) e o esquema que as descreve"""
+    def __init__(self):
+        self.secoes = []
+        self.dados = []
+
+    def adicionar(self, dados):
+        """Registra um array e retorna o índice da seção"""
+        self.secoes.append([dados.typecode, len(dados)])
+        self.dados.append(dados)
+        return len(self.secoes) - 1
+
+
+def escrever_cabecalho(arquivo, assinatura, cabecalho, escritor):
+    """Grava a assinatura, o cabeçalho JSON (com a lista de seções) e os arrays das seções"""
+    cabecalho['ordem_bytes'] = sys.byteorder
+    cabecalho['secoes'] = escritor.secoes
+    texto = json.dumps(cabecalho, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    arquivo.write(assinatura)
+    arquivo.write(struct.pack('<I', len(texto)))
+    arquivo.write(texto)
+    for dados in escritor.dados:
+        dados.tofile(arquivo)
+
+
+def ler_cabecalho(arquivo, assinatura, versao, descricao):
+    """Lê o que escrever_cabecalho gravou; retorna o cabeçalho e os arrays das seções"""
+    if arquivo.read(len(assinatura)) != assinatura:
+        raise ValueError(f"{arquivo.name} não é um {descricao}")
+    tamanho, = struct.unpack('<I', arquivo.read(4))
+    cabecalho = json.loads(arquivo.read(tamanho).decode('utf-8'))
+    if cabecalho['versao'] != versao:
+        raise ValueError(f"versão de {descricao} não suportada: {cabecalho['versao']}")
+
+    secoes = []
+    for typecode, n in cabecalho['secoes']:
+        dados = array(typecode)
+        dados.fromfile(arquivo, n)
+        if cabecalho['ordem_bytes'] != sys.byteorder:
+            dados.byteswap()
+        secoes.append(dados)
+    return cabecalho, secoes
+
+
+def codificar_mapa(mapa, escritor):
+    """Grade de terrenos e paredes (retângulos e cores) do mapa como seções"""
+    paredes = mapa.paredes
+    return {
+        'tamanho_celula': mapa.tamanho_celula,
+        'terreno': escritor.adicionar(array('B', mapa.grade_terreno)),
+        'paredes': escritor.adicionar(array('i', [v for p in paredes for v in (p.rect.x, p.rect.y, p.rect.w, p.rect.h)])),
+        'cores_paredes': escritor.adicionar(array('h', [c for p in paredes for c in p.cor[:3]])),
+    }
+
+
+def decodificar_mapa(info_mapa, secoes, largura, altura, rng):
+    """Refaz o mapa gravado por codificar_mapa, com as paredes na ordem original
+    (as decorações das paredes são refeitas)"""
+    mapa = Mapa(largura, altura, info_mapa['tamanho_celula'], rng=rng)
+    mapa.grade_terreno = bytearray(secoes[info_mapa['terreno']])
+    mapa._terreno_alterado()
+    retangulos = secoes[info_mapa['paredes']].tolist()
+    cores = secoes[info_mapa['cores_paredes']].tolist()
+    mapa.paredes = [Parede(*retangulos[i * 4:i * 4 + 4], cor=tuple(cores[i * 3:i * 3 + 3]))
+                    for i in range(len(retangulos) // 4)]
+    mapa._reconstruir_campo_paredes()
+    return mapa
+
+
+def _codificar_coluna(valores, escritor):
+    """Escolhe a representação de uma coluna de atributos pelos tipos dos valores"""
+    tipos = set(map(type, valores))
+    tipos_numericos = tipos - {type(None)}
+
+    if tipos == {type(None)}:
+        return {'tipo': 'nulo'}
+
+    if tipos <= {bool}:
+        return {'tipo': 'bool', 'secao': escritor.adicionar(array('B', valores))}
+
+    if tipos == {int}:
+        return {'tipo': 'int', 'secao': escritor.adicionar(array('q', valores))}
+
+    if tipos_numericos and tipos_numericos <= {int, float}:
+        # Números com inteiros e floats misturados (x inicial sorteado com randint, por exemplo)
+        # ou com None: um float64 por valor e máscaras para devolver o tipo exato
+        coluna = {'tipo': 'num'}
+        if type(None) in tipos:
+            coluna['nulos'] = escritor.adicionar(array('B', [v is None for v in valores]))
+            valores = [0.0 if v is None else v for v in valores]
+        if int in tipos:
+            coluna['inteiros'] = escritor.adicionar(array('B', [type(v) is int for v in valores]))
+        coluna['secao'] = escritor.adicionar(array('d', valores))
+        return coluna
+
+    if tipos <= {str, type(None)}:
+        tabela = sorted(set(v for v in valores if v is not None))
+        codigos = {texto: i for i, texto in enumerate(tabela)}
+        return {'tipo': 'str', 'tabela': tabela,
+                'secao': escritor.adicionar(array('i', [-1 if v is None else codigos[v] for v in valores]))}
+
+    if all(t is type(None) or issubclass(t, CriaturaBase) or t is EntidadeAusente for t in tipos):
+        # Referência a outra entidade (alvo): o id, resolvido depois de criar todas
+        return {'tipo': 'ref', 'secao': escritor.adicionar(array('q', [0 if v is None else v.id for v in valores]))}
+
+    if tipos == {tuple}:
+        comprimentos = set(map(len, valores))
+        if len(comprimentos) == 1:
+            planos = [item for tupla in valores for item in tupla]
+            if set(map(type, planos)) == {int}:
+                dados = array('q', planos)
+            else:
+                dados = array('d', planos)
+            return {'tipo': 'tupla', 'tamanho': comprimentos.pop(), 'secao': escritor.adicionar(dados)}
+
+    raise ValueError(f"atributo com tipos não suportados no snapshot: {sorted(t.__name__ for t in tipos)}")
+
+
+def _decodificar_coluna(coluna, secoes, n):
+    """Lista de valores de uma coluna (referências ainda como ids)"""
+    tipo = coluna['tipo']
+    if tipo == 'nulo':
+        return [None] * n
+
+    valores = secoes[coluna['secao']].tolist()
+    if tipo == 'bool':
+        return [bool(v) for v in valores]
+    if tipo in ('int', 'ref'):
+        return valores
+    if tipo == 'num':
+        if 'inteiros' in coluna:
+            valores = [int(v) if inteiro else v for v, inteiro in zip(valores, secoes[coluna['inteiros']])]
+        if 'nulos' in coluna:
+            valores = [None if nulo else v for v, nulo in zip(valores, secoes[coluna['nulos']])]
+        return valores
+    if tipo == 'str':
+        tabela = coluna['tabela']
+        return [None if codigo < 0 else tabela[codigo] for codigo in valores]
+    if tipo == 'tupla':
+        k = coluna['tamanho']
+        return [tuple(valores[i:i + k]) for i in range(0, len(valores), k)]
+    raise ValueError(f"tipo de coluna desconhecido no snapshot: {tipo}")
+
+
+def _nomes_salvos(atributos):
+    """Nomes dos atributos que vão para o snapshot"""
+    return [nome for nome in atributos
+            if nome != 'rng' and not nome.startswith('_') and nome not in TRANSITORIOS]
+
+
+def _codificar_lista(lista, escritor):
+    """Uma tabela por classe presente na lista, com as posições para refazer a ordem"""
+    posicoes_por_classe = {}
+    for i, entidade in enumerate(lista):
+        posicoes_por_classe.setdefault(type(entidade).__name__, []).append(i)
+
+    tabelas = []
+    for nome_classe, posicoes in posicoes_por_classe.items():
+        if nome_classe not in CLASSES:
+            raise ValueError(f"classe não suportada no snapshot: {nome_classe}")
+        entidades = [lista[i] for i in posicoes]
+
+        # Atributos salvos: os do objeto, exceto o gerador (compartilhado com a simulação),
+        # os privados (índices do motor vetorizado) e os transitórios
+        nomes = _nomes_salvos(vars(entidades[0]))
+        if len(set(map(len, map(vars, entidades)))) > 1:
+            # Alguma entidade tem atributos a mais ou a menos (os privados do motor podem variar)
+            for entidade in entidades:
+                if _nomes_salvos(vars(entidade)) != nomes:
+                    raise ValueError(f"entidades {nome_classe} com atributos diferentes entre si")
+
+        # Uma passada por entidade lendo todos os atributos (o dicionário de cada objeto é visitado
+        # uma vez só) e depois a transposição em colunas
+        linhas = list(map(itemgetter(*nomes), map(vars, entidades)))
+        colunas = {}
+        for nome, valores in zip(nomes, zip(*linhas)):
+            colunas[nome] = _codificar_coluna(valores, escritor)
+
+        tabelas.append({
+            'classe': nome_classe,
+            'n': len(entidades),
+            'posicoes': escritor.adicionar(array('I', posicoes)),
+            'colunas': colunas,
+            'rng': hasattr(entidades[0], 'rng'),
+            'transitorios': [nome for nome in TRANSITORIOS if hasattr(entidades[0], nome)],
+        })
+    return {'n': len(lista), 'tabelas': tabelas}
+
+
+def _decodificar_lista(descricao, secoes, rng, referencias):
+    """Recria os objetos de uma lista; as colunas de referência ficam em `referencias` para depois"""
+    lista = [None] * descricao['n']
+    for tabela in descricao['tabelas']:
+        classe = CLASSES.get(tabela['classe'])
+        if classe is None:
+            raise ValueError(f"classe desconhecida no snapshot: {tabela['classe']}")
+        n = tabela['n']
+        nomes = list(tabela['colunas'])
+        colunas = [_decodificar_coluna(tabela['colunas'][nome], secoes, n) for nome in nomes]
+        refs = [nome for nome in nomes if tabela['colunas'][nome]['tipo'] == 'ref']
+
+        # Colunas constantes: o gerador da simulação e os atributos transitórios (um objeto novo cada)
+        if tabela['rng']:
+            nomes.append('rng')
+            colunas.append(repeat(rng, n))
+        for nome in tabela['transitorios']:
+            nomes.append(nome)
+            colunas.append([TRANSITORIOS[nome]() for _ in range(n)])
+
+        entidades = list(map(classe.__new__, repeat(classe, n)))
+        for entidade, atributos in zip(entidades, map(dict, map(zip, repeat(nomes), zip(*colunas)))):
+            entidade.__dict__ = atributos
+        for posicao, entidade in zip(secoes[tabela['posicoes']], entidades):
+            lista[posicao] = entidade
+        for nome in refs:
+            referencias.extend(zip(entidades, repeat(nome)))
+    return lista
+
+
+def _codificar_estatisticas(valor):
+    """Estatísticas em JSON; entidades referenciadas (a mais forte) viram o id"""
+    if isinstance(valor, dict):
+        return {chave: _codificar_estatisticas(v) for chave, v in valor.items()}
+    if isinstance(valor, CriaturaBase):
+        return {'__entidade__': valor.id}
+    return valor
+
+
+def _decodificar_estatisticas(valor, por_id):
+    if isinstance(valor, dict):
+        if set(valor) == {'__entidade__'}:
+            return por_id.get(valor['__entidade__'])
+        return {chave: _decodificar_estatisticas(v, por_id) for chave, v in valor.items()}
+    return valor
+
+
+def _sem_coleta_de_lixo(funcao):
+    """Desliga o coletor de ciclos durante a função: as centenas de milhares de listas e
+    dicionários criados de uma vez disparariam várias coletas completas sem nada para coletar"""
+    def envoltorio(*args):
+        ativo = gc.isenabled()
+        gc.disable()
+        try:
+            return funcao(*args)
+        finally:
+            if ativo:
+                gc.enable()
+    return envoltorio
+
+
+@_sem_coleta_de_lixo
+def salvar_estado(simulacao, caminho):
+    """Grava o estado completo da simulação (deve ser chamado entre dois ticks)"""
+    escritor = Escritor()
+    mapa = simulacao.mapa
+
+    versao_rng, estado_rng, gauss_rng = simulacao.rng.getstate()
+    cabecalho = {
+        'versao': VERSAO,
+        'largura': simulacao.WIDTH,
+        'altura': simulacao.HEIGHT,
+        'tempo': simulacao.tempo,
+        'seed': simulacao.seed,
+        'taxa_alimento': simulacao.taxa_alimento,
+        'aceleracao': simulacao.aceleracao,
+        'indice_espacial': simulacao.indice_espacial,
+        'vetorizado': simulacao.motor is not None,
+        'jogo_finalizado': simulacao.jogo_finalizado,
+        'vencedor': simulacao.vencedor,
+        'contador_id': CriaturaBase.contador_id,
+        'estatisticas': _codificar_estatisticas(simulacao.estatisticas),
+        'estatisticas_finais': _codificar_estatisticas(simulacao.estatisticas_finais),
+        'rng': {
+            'versao': versao_rng,
+            'gauss': gauss_rng,
+            'estado': escritor.adicionar(array('Q', estado_rng)),
+        },
+        'mapa': codificar_mapa(mapa, escritor),
+        # Somas dos agregados como estão: refeitas do zero, arredondariam diferente nos últimos bits
+        'agregados': {classe.__name__: [especie.n, especie.somas, especie.quadrados,
+                                        especie.soma_nascimento, especie.quadrado_nascimento, especie.remocoes]
+                      for classe, especie in simulacao.agregados.especies.items()},
+        'listas': {nome: _codificar_lista(getattr(simulacao, nome), escritor) for nome in LISTAS},
+    }
+    if simulacao.motor is not None:
+        # Ordem das entidades nos arrays do motor vetorizado: ela define a sequência das chamadas
+        # ao gerador aleatório nas fases por objeto, então também precisa ser refeita
+        ids = [entidade.id for armazem in simulacao.motor.armazens.values() for entidade in armazem.entidades]
+        cabecalho['motor'] = escritor.adicionar(array('q', ids))
+
+    # Escreve num arquivo temporário e troca no final: uma queda no meio não estraga o snapshot anterior
+    temporario = caminho + ".tmp"
+    with open(temporario, 'wb') as arquivo:
+        escrever_cabecalho(arquivo, ASSINATURA, cabecalho, escritor)
+    os.replace(temporario, caminho)
+
+
+@_sem_coleta_de_lixo
+def carregar_estado(simulacao, caminho, vetorizado=None):
+    """Substitui o estado da simulação pelo do snapshot. O motor vetorizado fica ligado se estava
+    ligado quando o snapshot foi salvo; com `vetorizado`, o snapshot precisa ter sido salvo nesse modo"""
+    with open(caminho, 'rb') as arquivo:
+        cabecalho, secoes = ler_cabecalho(arquivo, ASSINATURA, VERSAO, "snapshot da simulação")
+
+    if (cabecalho['largura'], cabecalho['altura']) != (simulacao.WIDTH, simulacao.HEIGHT):
+        raise ValueError(f"snapshot de {cabecalho['largura']}x{cabecalho['altura']}, "
+                         f"simulação de {simulacao.WIDTH}x{simulacao.HEIGHT}")
+
+    # Os dois modos consomem o gerador aleatório em sequências diferentes: continuar no outro modo
+    # não daria o resultado da execução original
+    salvo_vetorizado = cabecalho.get('vetorizado', 'motor' in cabecalho)
+    if vetorizado is not None and vetorizado != salvo_vetorizado:
+        raise ValueError(f"snapshot salvo {'com' if salvo_vetorizado else 'sem'} o motor vetorizado")
+
+    # Gerador aleatório (o estado é restaurado no final, depois de tudo que poderia consumi-lo)
+    rng = random.Random()
+
+    mapa = decodificar_mapa(cabecalho['mapa'], secoes, simulacao.WIDTH, simulacao.HEIGHT, rng)
+    mapa.simulacao = simulacao
+
+    # Entidades e alimentos; depois, as referências entre entidades
+    referencias = []
+    listas = {nome: _decodificar_lista(cabecalho['listas'][nome], secoes, rng, referencias) for nome in LISTAS}
+    por_id = {entidade.id: entidade for nome in ('criaturas', 'predadores') for entidade in listas[nome]}
+    for entidade, nome in referencias:
+        id_ref = getattr(entidade, nome)
+        if id_ref == 0:
+            setattr(entidade, nome, None)
+        else:
+            setattr(entidade, nome, por_id.get(id_ref) or EntidadeAusente(id_ref))
+
+    simulacao.mapa = mapa
+    simulacao.rng = rng
+    simulacao.criaturas = listas['criaturas']
+    simulacao.predadores = listas['predadores']
+    simulacao.alimentos = listas['alimentos']
+    simulacao.tempo = cabecalho['tempo']
+    simulacao.seed = cabecalho.get('seed')
+    simulacao.taxa_alimento = cabecalho['taxa_alimento']
+    simulacao.aceleracao = cabecalho['aceleracao']
+    simulacao.indice_espacial = cabecalho['indice_espacial']
+    simulacao.jogo_finalizado = cabecalho['jogo_finalizado']
+    simulacao.vencedor = cabecalho['vencedor']
+    simulacao.estatisticas = _decodificar_estatisticas(cabecalho['estatisticas'], por_id)
+    simulacao.estatisticas_finais = _decodificar_estatisticas(cabecalho['estatisticas_finais'], por_id)
+    CriaturaBase.contador_id = cabecalho['contador_id']
+
+    # Estruturas derivadas das listas
+    simulacao.intencoes.limpar()
+    simulacao.registro.reconstruir(simulacao.criaturas, simulacao.predadores)
+    simulacao.agregados.recalcular(simulacao.tempo, simulacao.criaturas, simulacao.predadores)
+    for nome_classe, salvos in cabecalho['agregados'].items():
+        n, somas, quadrados, soma_nascimento, quadrado_nascimento = salvos[:5]
+        especie = simulacao.agregados.especies.get(CLASSES[nome_classe])
+        if especie is not None and especie.n == n:
+            especie.somas[:] = somas
+            especie.quadrados[:] = quadrados
+            especie.soma_nascimento = soma_nascimento
+            especie.quadrado_nascimento = quadrado_nascimento
+            # Remoções desde a última ressoma (snapshots antigos não as têm)
+            especie.remocoes = salvos[5] if len(salvos) > 5 else 0
+    simulacao.efeitos.limpar()
+    simulacao._acumulador = 0.0
+
+    # Um motor vetorizado novo (se o snapshot foi salvo com ele), com as entidades na ordem em que
+    # estavam nos arrays
+    simulacao.usar_motor_vetorizado(False)
+    if salvo_vetorizado:
+        simulacao.usar_motor_vetorizado(True)
+        if 'motor' in cabecalho:
+            simulacao.motor.sincronizar([por_id[i] for i in secoes[cabecalho['motor']] if i in por_id])
+
+    info_rng = cabecalho['rng']
+    rng.setstate((info_rng['versao'], tuple(secoes[info_rng['estado']]), info_rng['gauss']))
@@ -0,0 +1,145 @@
+import heapq
+import math
+
+class GradeEspacial:
+    """Índice espacial em grade uniforme para consultas de vizinhança por raio"""
+    def __init__(self, largura, altura, tamanho_celula=64, margem=16):
+        self.largura = largura
+        self.altura = altura
+        self.tamanho_celula = tamanho_celula
+
+        # Margem extra nas consultas: as entidades continuam se movendo depois
+        # que a grade é reconstruída, então uma entidade pode ter saído da sua célula
+        self.margem = margem
+
+        # Número de células em cada eixo (posições fora do mapa vão para as bordas)
+        self.celulas_x = max(1, int(math.ceil(largura / tamanho_celula)))
+        self.celulas_y = max(1, int(math.ceil(altura / tamanho_celula)))
+
+        # Cada célula guarda a lista de entidades que estão nela
+        self.celulas = [[] for _ in range(self.celulas_x * self.celulas_y)]
+
+        # Célula em que cada entidade foi inserida (por id do objeto), para remoção
+        self._celula_de = {}
+
+        # Maior tamanho entre as entidades inseridas (para consultas de contato)
+        self.maior_tamanho = 0
+
+    def _indice(self, x, y):
+        """Converte uma posição para o índice da célula correspondente"""
+        ix = min(max(0, int(x // self.tamanho_celula)), self.celulas_x - 1)
+        iy = min(max(0, int(y // self.tamanho_celula)), self.celulas_y - 1)
+        return ix * self.celulas_y + iy
+
+    def limpar(self):
+        """Remove todas as entidades da grade"""
+        for celula in self.celulas:
+            celula.clear()
+        self._celula_de.clear()
+        self.maior_tamanho = 0
+
+    def reconstruir(self, entidades):
+        """Reconstrói a grade a partir da lista completa de entidades"""
+        self.limpar()
+        for entidade in entidades:
+            self.inserir(entidade)
+
+    def inserir(self, entidade):
+        """Insere uma entidade na célula da sua posição atual"""
+        indice = self._indice(entidade.x, entidade.y)
+        self.celulas[indice].append(entidade)
+        self._celula_de[id(entidade)] = indice
+
+        tamanho = getattr(entidade, 'tamanho', 0)
+        if tamanho > self.maior_tamanho:
+            self.maior_tamanho = tamanho
+
+    def remover(self, entidade):
+        """Remove uma entidade da grade (sem efeito se ela não estiver na grade)"""
+        indice = self._celula_de.pop(id(entidade), None)
+        if indice is None:
+            return False
+
+        celula = self.celulas[indice]
+        for i, outra in enumerate(celula):
+            if outra is entidade:
+                # Troca com o último elemento para remover sem deslocar a lista
+                celula[i] = celula[-1]
+                celula.pop()
+                return True
+        return False
+
+    def consultar_raio(self, x, y, raio, excluir=None):
+        """Retorna as entidades a uma distância menor que `raio` do ponto (x, y)"""
+        alcance = raio + self.margem
+        ix_min = min(max(0, int((x - alcance) // self.tamanho_celula)), self.celulas_x - 1)
+        ix_max = min(max(0, int((x + alcance) // self.tamanho_celula)), self.celulas_x - 1)
+        iy_min = min(max(0, int((y - alcance) // self.tamanho_celula)), self.celulas_y - 1)
+        iy_max = min(max(0, int((y + alcance) // self.tamanho_celula)), self.celulas_y - 1)
+
+        raio_quadrado = raio * raio
+        resultado = []
+        for ix in range(ix_min, ix_max + 1):
+            base = ix * self.celulas_y
+            for iy in range(iy_min, iy_max + 1):
+                for entidade in self.celulas[base + iy]:
+                    if entidade is excluir:
+                        continue
+                    dx = entidade.x - x
+                    dy = entidade.y - y
+                    # Filtro exato com a posição atual da entidade
+                    if dx * dx + dy * dy < raio_quadrado:
+                        resultado.append(entidade)
+        return resultado
+
+    def mais_proximos(self, x, y, raio, excluir=None):
+        """Gera as entidades a menos de `raio` do ponto (x, y) em ordem crescente de distância,
+        visitando as células em anéis; quem consome só os primeiros não paga pelo resto"""
+        tamanho = self.tamanho_celula
+        cx = int(x // tamanho)
+        cy = int(y // tamanho)
+        raio_quadrado = raio * raio
+        candidatos = []
+        ordem = 0
+        anel = 0
+        while True:
+            # Células do anel (a borda do quadrado de lado 2 * anel + 1 em volta da célula do ponto)
+            for ix in range(max(0, cx - anel), min(self.celulas_x - 1, cx + anel) + 1):
+                borda_x = ix == cx - anel or ix == cx + anel
+                base = ix * self.celulas_y
+                for iy in range(max(0, cy - anel), min(self.celulas_y - 1, cy + anel) + 1):
+                    if not borda_x and iy != cy - anel and iy != cy + anel:
+                        continue
+                    for entidade in self.celulas[base + iy]:
+                        if entidade is excluir:
+                            continue
+                        dx = entidade.x - x
+                        dy = entidade.y - y
+                        distancia = dx * dx + dy * dy
+                        if distancia < raio_quadrado:
+                            heapq.heappush(candidatos, (distancia, ordem, entidade))
+                            ordem += 1
+
+            # Menor distância possível de uma entidade fora dos anéis já visitados (as células da
+            # borda da grade também guardam quem está fora do mapa, então aquele lado não limita)
+            infinito = float('inf')
+            limite = min(
+                x - (cx - anel) * tamanho if cx - anel > 0 else infinito,
+                (cx + anel + 1) * tamanho - x if cx + anel < self.celulas_x - 1 else infinito,
+                y - (cy - anel) * tamanho if cy - anel > 0 else infinito,
+                (cy + anel + 1) * tamanho - y if cy + anel < self.celulas_y - 1 else infinito,
+            ) - self.margem
+
+            # Já é seguro entregar quem está mais perto que esse limite
+            limite_quadrado = limite * limite if limite > 0 else 0
+            while candidatos and candidatos[0][0] <= limite_quadrado:
+                yield heapq.heappop(candidatos)[2]
+            if limite >= raio:
+                break
+            anel += 1
+
+        while candidatos:
+            yield heapq.heappop(candidatos)[2]
+
+    def __len__(self):
+        return len(self._celula_de)
@@ -0,0 +1,50 @@
+class Intencoes:
+    """Mudanças nas listas da simulação registradas durante um tick e aplicadas de uma vez no final"""
+    def __init__(self):
+        # Objetos removidos neste tick (criaturas mortas ou devoradas, alimentos comidos): id -> objeto
+        self.removidos = {}
+
+        # Objetos criados neste tick e a lista em que devem entrar
+        self.nascimentos = []
+
+        # Quem causou a remoção (o predador, quem comeu o alimento) ou o nascimento (o pai): id -> entidade
+        self.autores = {}
+
+    def remover(self, objeto, autor=None):
+        """Registra a remoção do objeto; retorna False se ele já tinha sido removido neste tick"""
+        chave = id(objeto)
+        if chave in self.removidos:
+            return False
+        self.removidos[chave] = objeto
+        if autor is not None:
+            self.autores[chave] = autor
+        return True
+
+    def removido(self, objeto):
+        """Verifica se o objeto foi removido neste tick"""
+        return id(objeto) in self.removidos
+
+    def adicionar(self, objeto, lista, pai=None):
+        """Registra um objeto que entra na lista no final do tick"""
+        self.nascimentos.append((objeto, lista))
+        if pai is not None:
+            self.autores[id(objeto)] = pai
+
+    def aplicar(self, *listas):
+        """Remove os objetos removidos das listas (compactando cada uma uma única vez) e insere os novos"""
+        if self.removidos:
+            removidos = self.removidos
+            for lista in listas:
+                if lista:
+                    lista[:] = [objeto for objeto in lista if id(objeto) not in removidos]
+
+        for objeto, lista in self.nascimentos:
+            lista.append(objeto)
+
+        self.limpar()
+
+    def limpar(self):
+        """Descarta as mudanças registradas"""
+        self.removidos = {}
+        self.nascimentos = []
+        self.autores = {}
@@ -32,19 +32,26 @@ def main():
         # Estado inicial: mostrar menu
         mostrar_menu = True
         
+        # Tempos do laço principal (F3 mostra o painel, F4 grava um trace)
+        perfilador = simulacao.perfilador
+        
         running = True
         while running:
             # Tempo decorrido desde o último frame (para animações suaves)
             dt = clock.tick(FPS) / 1000.0  # Converte para segundos
+            inicio_quadro = perfilador.inicio()
             
             # Posição atual do mouse ou último toque
             current_pos = pygame.mouse.get_pos()
             
             # Processar eventos
+            t = perfilador.inicio()
             for event in pygame.event.get():
                 # Tratamento para evento de saída
                 if event.type == pygame.QUIT:
                     running = False
+                    # Fecha o diário de eventos, se estiver sendo gravado
+                    simulacao.parar_diario()
                 
                 # Traduzir eventos de toque para eventos de mouse em dispositivos móveis
                 if hasattr(pygame, 'FINGERDOWN') and event.type == pygame.FINGERDOWN:
@@ -77,22 +84,37 @@ def main():
                     # Checar se o usuário quer voltar ao menu
                     if resultado == "voltar_menu":
                         mostrar_menu = True
+            perfilador.fim('eventos', t)
             
             # Atualizar
+            t = perfilador.inicio()
             if mostrar_menu:
                 menu.atualizar(dt)
             else:
                 # Passar posição do mouse para atualização dos controles de toque
-                simulacao.atualizar(dt, current_pos)
+                simulacao.atualizar_interface(dt, current_pos)
+                
+                # Passo fixo: os ticks acompanham o tempo real (vezes a aceleração), limitados
+                # ao orçamento do quadro; o desenho segue a taxa da tela
+                simulacao.avancar(dt)
+            perfilador.fim('atualizar', t)
             
             # Desenhar
+            t = perfilador.inicio()
             if mostrar_menu:
                 menu.desenhar(screen)
             else:
                 simulacao.desenhar(screen)
+            perfilador.fim('desenhar', t)
             
             # Atualizar tela
+            t = perfilador.inicio()
             pygame.display.flip()
+            perfilador.fim('flip', t)
+            
+            # Duração do quadro sem a espera do clock
+            perfilador.fim('quadro', inicio_quadro)
+            perfilador.fechar_quadro()
         
         pygame.quit()
         sys.exit()
@@ -1,12 +1,18 @@
 import pygame
 import random
 import math
-from terreno import Grama, Lama, Gelo, Agua, Deserto, Montanha, Floresta, Pantano
+import heapq
+from array import array
+from terreno import Grama, Lama, Gelo, Agua, Deserto, Montanha, Floresta, Pantano, AGUA, TERRENOS
 from parede import Parede
 
 class Mapa:
     """Gerencia o mapa do jogo, incluindo terrenos e paredes"""
-    def __init__(self, largura, altura, tamanho_celula=20):
+    def __init__(self, largura, altura, tamanho_celula=20, rng=None):
+        # Gerador aleatório da simulação usado na geração dos mapas (a decoração das paredes
+        # é visual e usa o módulo random global)
+        self.rng = rng if rng is not None else random
+        
         self.largura = largura
         self.altura = altura
         self.tamanho_celula = tamanho_celula
@@ -15,12 +21,37 @@ class Mapa:
         self.celulas_x = largura // tamanho_celula
         self.celulas_y = altura // tamanho_celula
         
-        # Inicializa a grade de terrenos com grama (padrão)
-        self.terrenos = [[Grama() for _ in range(self.celulas_y)] for _ in range(self.celulas_x)]
+        # Camada estática (terrenos e paredes) desenhada uma vez e reaproveitada a cada quadro;
+        # None força redesenhar tudo, e as células alteradas ficam em _celulas_sujas
+        self._camada_estatica = None
+        self._celulas_sujas = set()
+        
+        # Linhas de visão: máscara de água dilatada (margem lateral do caminho) e resultados
+        # memorizados por par (célula de origem, célula de destino) durante um tick
+        self._agua_dilatada = None
+        self._paredes_por_celula = None
+        self._memo_agua = {}
+        self._memo_paredes = {}
+        self._memo_caminhos = {}
+        
+        # Grade de terrenos: um byte por célula com o identificador do tipo (índice x * celulas_y + y);
+        # as instâncias de terreno são compartilhadas (terreno.TERRENOS). Inicializa com grama (padrão)
+        self._preencher_terreno(Grama)
         
         # Lista de paredes
         self.paredes = []
         
+        # Campo de distância às paredes: o mapa é amostrado em células de `passo_campo_paredes`
+        # pixels e cada amostra guarda a distância até a parede mais próxima e as paredes
+        # a menos de `alcance_campo_paredes` dela (consultas de proximidade em O(1))
+        self.passo_campo_paredes = max(1, tamanho_celula // 2)
+        self.alcance_campo_paredes = 80
+        self._reconstruir_campo_paredes()
+        
+        # Campo de saída da água: para cada célula, a célula de terra mais próxima
+        # (calculado sob demanda e descartado quando o terreno muda)
+        self._terra_mais_proxima = None
+        
         # Adicionar paredes ao redor do mapa (bordas)
         self._criar_paredes_bordas()
     
@@ -41,18 +72,101 @@ class Mapa:
         self.adicionar_parede(self.largura - espessura_parede, espessura_parede, 
                              espessura_parede, self.altura - 2 * espessura_parede)
     
-    def obter_terreno(self, x, y):
-        """Retorna o terreno na posição (x, y)"""
-        # Converte posição para índices da grade
+    def _celula(self, x, y):
+        """Converte uma posição para o índice da célula na grade de terrenos"""
         ix = min(max(0, int(x // self.tamanho_celula)), self.celulas_x - 1)
         iy = min(max(0, int(y // self.tamanho_celula)), self.celulas_y - 1)
-        return self.terrenos[ix][iy]
+        return ix * self.celulas_y + iy
+    
+    def obter_terreno(self, x, y):
+        """Retorna o terreno na posição (x, y)"""
+        return TERRENOS[self.grade_terreno[self._celula(x, y)]]
+    
+    def tipo_em(self, x, y):
+        """Retorna o identificador do terreno na posição (x, y) (constantes de terreno.py)"""
+        return self.grade_terreno[self._celula(x, y)]
     
     def definir_terreno(self, x, y, terreno):
-        """Define o terreno na posição (x, y)"""
+        """Define o terreno na posição (x, y) (aceita uma classe ou instância de terreno)"""
+        celula = self._celula(x, y)
+        self.grade_terreno[celula] = terreno.id
+        self._terreno_alterado(celula)
+    
+    def _preencher_terreno(self, tipo_terreno):
+        """Preenche o mapa inteiro com um único tipo de terreno"""
+        self.grade_terreno = bytearray([tipo_terreno.id]) * (self.celulas_x * self.celulas_y)
+        self._terreno_alterado()
+    
+    def _terreno_alterado(self, celula=None):
+        """Descarta o que é derivado do terreno: o campo de saída da água e a camada desenhada
+        (só a célula alterada, se informada, ou o mapa inteiro)"""
+        self.invalidar_campo_agua()
+        self._agua_dilatada = None
+        self._memo_agua.clear()
+        if celula is None:
+            self._camada_estatica = None
+        else:
+            self._celulas_sujas.add(celula)
+    
+    def invalidar_campo_agua(self):
+        """Descarta o campo de saída da água (deve ser chamado sempre que o terreno mudar)"""
+        self._terra_mais_proxima = None
+    
+    def _calcular_campo_agua(self):
+        """Calcula, a partir de todas as células de terra, a terra mais próxima de cada célula"""
+        celulas_y = self.celulas_y
+        total = self.celulas_x * celulas_y
+        
+        # Índice da célula de terra mais próxima (-1: nenhuma terra alcançável)
+        terra_mais_proxima = array('l', [-1]) * total
+        
+        # A busca começa ao mesmo tempo de todas as células de terra e se expande pela
+        # água em ordem de distância (euclidiana, em células) até a terra de origem
+        fila = []
+        for i, tipo in enumerate(self.grade_terreno):
+            if tipo != AGUA:
+                terra_mais_proxima[i] = i
+                fila.append((0, i, i))
+        
+        visitadas = bytearray(total)
+        while fila:
+            _, i, origem = heapq.heappop(fila)
+            if visitadas[i]:
+                continue
+            visitadas[i] = 1
+            terra_mais_proxima[i] = origem
+            
+            x, y = divmod(i, celulas_y)
+            ox, oy = divmod(origem, celulas_y)
+            # Vizinhança de 8 células
+            for nx in (x - 1, x, x + 1):
+                if nx < 0 or nx >= self.celulas_x:
+                    continue
+                for ny in (y - 1, y, y + 1):
+                    if ny < 0 or ny >= celulas_y:
+                        continue
+                    j = nx * celulas_y + ny
+                    if not visitadas[j]:
+                        heapq.heappush(fila, ((nx - ox)**2 + (ny - oy)**2, j, origem))
+        
+        self._terra_mais_proxima = terra_mais_proxima
+    
+    def direcao_saida_agua(self, x, y):
+        """Retorna o ângulo de (x, y) até a terra mais próxima, ou None se o mapa não tiver terra"""
+        if self._terra_mais_proxima is None:
+            self._calcular_campo_agua()
+        
         ix = min(max(0, int(x // self.tamanho_celula)), self.celulas_x - 1)
         iy = min(max(0, int(y // self.tamanho_celula)), self.celulas_y - 1)
-        self.terrenos[ix][iy] = terreno
+        destino = self._terra_mais_proxima[ix * self.celulas_y + iy]
+        if destino < 0:
+            return None
+        
+        # Mira no centro da célula de terra
+        tx, ty = divmod(destino, self.celulas_y)
+        alvo_x = (tx + 0.5) * self.tamanho_celula
+        alvo_y = (ty + 0.5) * self.tamanho_celula
+        return math.atan2(alvo_y - y, alvo_x - x)
     
     def criar_terreno_aleatorio(self, probabilidades=None):
         """Cria um mapa com terrenos aleatórios baseado nas probabilidades fornecidas"""
@@ -69,7 +183,7 @@ class Mapa:
                 Pantano: 0.05
             }
         
-        tipos_terreno = list(probabilidades.keys())
+        tipos_terreno = [tipo.id for tipo in probabilidades.keys()]
         pesos = list(probabilidades.values())
         
         # Aplica terreno aleatório por célula com agrupamento natural
@@ -84,11 +198,12 @@ class Mapa:
         for x in range((self.celulas_x // escala) + 1):
             linha = []
             for y in range((self.celulas_y // escala) + 1):
-                tipo_terreno = random.choices(tipos_terreno, weights=pesos)[0]
+                tipo_terreno = self.rng.choices(tipos_terreno, weights=pesos)[0]
                 linha.append(tipo_terreno)
             grade_grosseira.append(linha)
         
         # Interpola para criar a grade completa
+        grade = self.grade_terreno
         for x in range(self.celulas_x):
             for y in range(self.celulas_y):
                 # Encontra as células da grade grosseira que envolvem este ponto
@@ -123,19 +238,311 @@ class Mapa:
                 ]
                 
                 # Adiciona aleatoriedade
-                if random.random() < 0.15:  # 15% de chance de selecionar um tipo aleatório
-                    self.terrenos[x][y] = random.choices(tipos_terreno, weights=pesos)[0]()
+                if self.rng.random() < 0.15:  # 15% de chance de selecionar um tipo aleatório
+                    grade[x * self.celulas_y + y] = self.rng.choices(tipos_terreno, weights=pesos)[0]
                 else:
-                    terreno_escolhido = random.choices(vizinhos, weights=pesos_vizinhos)[0]
-                    self.terrenos[x][y] = terreno_escolhido()
+                    terreno_escolhido = self.rng.choices(vizinhos, weights=pesos_vizinhos)[0]
+                    grade[x * self.celulas_y + y] = terreno_escolhido
+        
+        self._terreno_alterado()
     
     def adicionar_parede(self, x, y, largura, altura):
         """Adiciona uma parede ao mapa"""
-        self.paredes.append(Parede(x, y, largura, altura))
+        parede = Parede(x, y, largura, altura)
+        self.paredes.append(parede)
+        
+        # Atualiza o campo de distância só na região da nova parede
+        if self._paredes_indexadas == len(self.paredes) - 1:
+            self._indexar_parede(parede)
+            self._paredes_alteradas()
+        else:
+            self._reconstruir_campo_paredes()
+        
+        # Redesenhar na camada estática apenas as células cobertas pela parede
+        self._marcar_area_suja(parede.area_desenho())
+    
+    def _reconstruir_campo_paredes(self):
+        """Recalcula o campo de distância às paredes a partir da lista completa de paredes"""
+        passo = self.passo_campo_paredes
+        self.amostras_x = max(1, int(math.ceil(self.largura / passo)))
+        self.amostras_y = max(1, int(math.ceil(self.altura / passo)))
+        total = self.amostras_x * self.amostras_y
+        
+        # Distância de cada amostra (célula) à parede mais próxima, limitada ao alcance
+        self.campo_paredes = array('f', [self.alcance_campo_paredes]) * total
+        
+        # Paredes a menos do alcance de cada amostra, na mesma ordem de self.paredes
+        self.paredes_proximas = [()] * total
+        
+        self._paredes_indexadas = 0
+        for parede in self.paredes:
+            self._indexar_parede(parede)
+        self._paredes_alteradas()
+        
+        # As paredes mudaram: a camada desenhada também precisa ser refeita
+        self._camada_estatica = None
+    
+    def _indexar_parede(self, parede):
+        """Registra uma parede nas amostras do campo que estão dentro do alcance dela"""
+        passo = self.passo_campo_paredes
+        alcance = self.alcance_campo_paredes
+        rect = parede.rect
+        
+        ix_min = max(0, int((rect.left - alcance) // passo))
+        ix_max = min(self.amostras_x - 1, int((rect.right + alcance) // passo))
+        iy_min = max(0, int((rect.top - alcance) // passo))
+        iy_max = min(self.amostras_y - 1, int((rect.bottom + alcance) // passo))
+        
+        for ix in range(ix_min, ix_max + 1):
+            # Distância horizontal entre a célula da amostra e o retângulo da parede
+            esquerda = ix * passo
+            dx = max(0, rect.left - (esquerda + passo), esquerda - rect.right)
+            base = ix * self.amostras_y
+            
+            for iy in range(iy_min, iy_max + 1):
+                topo = iy * passo
+                dy = max(0, rect.top - (topo + passo), topo - rect.bottom)
+                distancia = math.sqrt(dx * dx + dy * dy)
+                
+                if distancia < alcance:
+                    i = base + iy
+                    self.paredes_proximas[i] = self.paredes_proximas[i] + (parede,)
+                    if distancia < self.campo_paredes[i]:
+                        self.campo_paredes[i] = distancia
+        
+        self._paredes_indexadas += 1
+    
+    def garantir_campo_paredes(self):
+        """Reindexa o campo de distância se a lista de paredes foi alterada sem passar por adicionar_parede"""
+        if self._paredes_indexadas != len(self.paredes):
+            self._reconstruir_campo_paredes()
+    
+    def _amostra_campo_paredes(self, x, y):
+        """Retorna o índice da amostra do campo que contém (x, y), ou None fora do mapa"""
+        self.garantir_campo_paredes()
+        
+        if not (0 <= x < self.largura and 0 <= y < self.altura):
+            return None
+        
+        passo = self.passo_campo_paredes
+        ix = min(int(x // passo), self.amostras_x - 1)
+        iy = min(int(y // passo), self.amostras_y - 1)
+        return ix * self.amostras_y + iy
+    
+    def _paredes_candidatas(self, x, y, distancia):
+        """Retorna as paredes que podem estar a menos de `distancia` de (x, y)"""
+        i = self._amostra_campo_paredes(x, y)
+        if i is None or distancia > self.alcance_campo_paredes:
+            # Fora do campo: é preciso olhar todas as paredes
+            return self.paredes
+        
+        # O campo é um limite inferior da distância dentro da amostra
+        if self.campo_paredes[i] >= distancia:
+            return ()
+        return self.paredes_proximas[i]
+    
+    def perto_de_parede(self, x, y, distancia):
+        """Verifica se há alguma parede a menos de `distancia` do ponto (x, y)"""
+        distancia_quadrada = distancia * distancia
+        for parede in self._paredes_candidatas(x, y, distancia):
+            closest_x = max(parede.rect.left, min(x, parede.rect.right))
+            closest_y = max(parede.rect.top, min(y, parede.rect.bottom))
+            dx = x - closest_x
+            dy = y - closest_y
+            if dx * dx + dy * dy < distancia_quadrada:
+                return True
+        return False
+    
+    def parede_mais_proxima(self, x, y):
+        """Retorna (distância, ponto_x, ponto_y) do ponto de parede mais próximo de (x, y), ou None sem paredes"""
+        i = self._amostra_campo_paredes(x, y)
+        if i is not None:
+            melhor = self._ponto_mais_proximo(self.paredes_proximas[i], x, y)
+            # Dentro do alcance do campo a resposta é exata
+            if melhor is not None and melhor[0] < self.alcance_campo_paredes:
+                return melhor
+        
+        # Longe de todas as paredes (ou fora do mapa): varre a lista inteira
+        return self._ponto_mais_proximo(self.paredes, x, y)
+    
+    def _ponto_mais_proximo(self, paredes, x, y):
+        """Retorna (distância, ponto_x, ponto_y) do ponto mais próximo de (x, y) entre as paredes dadas"""
+        melhor = None
+        for parede in paredes:
+            closest_x = max(parede.rect.left, min(x, parede.rect.right))
+            closest_y = max(parede.rect.top, min(y, parede.rect.bottom))
+            distancia = math.sqrt((x - closest_x)**2 + (y - closest_y)**2)
+            if melhor is None or distancia < melhor[0]:
+                melhor = (distancia, closest_x, closest_y)
+        return melhor
+    
+    def _paredes_alteradas(self):
+        """Descarta o que as linhas de visão derivam das paredes"""
+        self._paredes_por_celula = None
+        self._memo_paredes.clear()
+    
+    def _calcular_paredes_por_celula(self):
+        """Paredes candidatas de cada célula da grade de terrenos (as da amostra do campo no centro dela)"""
+        self.garantir_campo_paredes()
+        meia = self.tamanho_celula / 2
+        self._paredes_por_celula = [
+            self.paredes_proximas[self._amostra_campo_paredes(ix * self.tamanho_celula + meia, iy * self.tamanho_celula + meia)]
+            for ix in range(self.celulas_x)
+            for iy in range(self.celulas_y)
+        ]
+    
+    def limpar_memo_visao(self):
+        """Descarta as linhas de visão memorizadas (chamado a cada tick)"""
+        self._memo_agua.clear()
+        self._memo_paredes.clear()
+        self._memo_caminhos.clear()
+    
+    def _celulas_no_caminho(self, origem, destino):
+        """Células atravessadas pelo segmento entre os centros das células origem e destino
+        (percurso em grade, sem a célula de origem e terminando no destino)"""
+        celulas_y = self.celulas_y
+        ix, iy = divmod(origem, celulas_y)
+        ix_destino, iy_destino = divmod(destino, celulas_y)
+        
+        passo_x = 1 if ix_destino > ix else -1
+        passo_y = 1 if iy_destino > iy else -1
+        nx = abs(ix_destino - ix)
+        ny = abs(iy_destino - iy)
+        
+        # O segmento cruza a i-ésima borda vertical em t = (i + 0.5) / nx e a j-ésima horizontal
+        # em t = (j + 0.5) / ny; a comparação é feita em inteiros
+        celulas = []
+        i = j = 0
+        while i < nx or j < ny:
+            decisao = (1 + 2 * i) * ny - (1 + 2 * j) * nx
+            if decisao == 0:
+                # Passa exatamente por um canto: as duas células vizinhas também são tocadas
+                celulas.append((ix + passo_x) * celulas_y + iy)
+                celulas.append(ix * celulas_y + iy + passo_y)
+                ix += passo_x
+                iy += passo_y
+                i += 1
+                j += 1
+            elif decisao < 0:
+                ix += passo_x
+                i += 1
+            else:
+                iy += passo_y
+                j += 1
+            celulas.append(ix * celulas_y + iy)
+        return celulas
+    
+    def _caminho(self, origem, destino, chave):
+        """_celulas_no_caminho memorizado no tick (água e paredes consultam os mesmos pares)"""
+        celulas = self._memo_caminhos.get(chave)
+        if celulas is None:
+            celulas = self._memo_caminhos[chave] = self._celulas_no_caminho(origem, destino)
+        return celulas
+    
+    def _calcular_agua_dilatada(self):
+        """Marca as células com água nelas ou em alguma vizinha (margem lateral de meia a uma célula)"""
+        celulas_x = self.celulas_x
+        celulas_y = self.celulas_y
+        grade = self.grade_terreno
+        dilatada = bytearray(celulas_x * celulas_y)
+        
+        for celula, tipo in enumerate(grade):
+            if tipo != AGUA:
+                continue
+            ix, iy = divmod(celula, celulas_y)
+            for vx in range(max(0, ix - 1), min(celulas_x, ix + 2)):
+                base = vx * celulas_y
+                for vy in range(max(0, iy - 1), min(celulas_y, iy + 2)):
+                    dilatada[base + vy] = 1
+        
+        self._agua_dilatada = dilatada
+    
+    def agua_dilatada(self):
+        """Células com água nelas ou em alguma vizinha (1) e as demais (0), na ordem da grade de terrenos"""
+        if self._agua_dilatada is None:
+            self._calcular_agua_dilatada()
+        return self._agua_dilatada
+    
+    def paredes_por_celula(self):
+        """Paredes candidatas das linhas de visão que passam por cada célula da grade de terrenos"""
+        if self._paredes_por_celula is None or self._paredes_indexadas != len(self.paredes):
+            self._calcular_paredes_por_celula()
+        return self._paredes_por_celula
+    
+    def agua_no_caminho(self, x0, y0, x1, y1):
+        """Verifica se o caminho de (x0, y0) até (x1, y1) passa por água ou rente a ela"""
+        origem = self._celula(x0, y0)
+        destino = self._celula(x1, y1)
+        if origem == destino:
+            return False
+        
+        chave = origem * len(self.grade_terreno) + destino
+        resultado = self._memo_agua.get(chave)
+        if resultado is None:
+            dilatada = self.agua_dilatada()
+            
+            # Células intermediárias: água nelas ou ao lado; destino: só água nele mesmo
+            celulas = self._caminho(origem, destino, chave)
+            resultado = self.grade_terreno[destino] == AGUA
+            if not resultado:
+                for celula in celulas[:-1]:
+                    if dilatada[celula]:
+                        resultado = True
+                        break
+            self._memo_agua[chave] = resultado
+        return resultado
+    
+    def parede_no_caminho(self, x0, y0, x1, y1, distancia):
+        """Verifica se há parede a menos de `distancia` do caminho de (x0, y0) até (x1, y1)
+        (trecho entre as células das pontas; a proximidade das pontas é verificada à parte)"""
+        origem = self._celula(x0, y0)
+        destino = self._celula(x1, y1)
+        if origem == destino:
+            return False
+        
+        # As paredes candidatas vêm das amostras do campo nos centros das células; elas cobrem
+        # qualquer ponto da célula enquanto a distância somada à meia diagonal couber no alcance
+        if distancia + self.tamanho_celula * 0.71 >= self.alcance_campo_paredes:
+            celulas = self._celulas_no_caminho(origem, destino)[:-1]
+            return bool(celulas) and self._distancia_trecho_paredes(celulas, self.paredes) < distancia
+        
+        chave = origem * len(self.grade_terreno) + destino
+        minima = self._memo_paredes.get(chave)
+        if minima is None:
+            celulas = self._caminho(origem, destino, chave)[:-1]
+            minima = float('inf')
+            if celulas:
+                paredes_por_celula = self.paredes_por_celula()
+                candidatas = set()
+                for celula in celulas:
+                    candidatas.update(paredes_por_celula[celula])
+                if candidatas:
+                    minima = self._distancia_trecho_paredes(celulas, candidatas)
+            self._memo_paredes[chave] = minima
+        return minima < distancia
+    
+    def _distancia_trecho_paredes(self, celulas, paredes):
+        """Menor distância entre as paredes e o segmento que liga os centros da primeira e da última célula"""
+        meia = self.tamanho_celula / 2
+        ix, iy = divmod(celulas[0], self.celulas_y)
+        x0 = ix * self.tamanho_celula + meia
+        y0 = iy * self.tamanho_celula + meia
+        ix, iy = divmod(celulas[-1], self.celulas_y)
+        x1 = ix * self.tamanho_celula + meia
+        y1 = iy * self.tamanho_celula + meia
+        
+        minima = float('inf')
+        for parede in paredes:
+            distancia = _distancia_segmento_retangulo(x0, y0, x1, y1, parede.rect)
+            if distancia < minima:
+                minima = distancia
+                if minima == 0:
+                    break
+        return minima
     
     def verificar_colisao_paredes(self, entidade):
         """Verifica e resolve colisões da entidade com todas as paredes"""
-        for parede in self.paredes:
+        for parede in self._paredes_candidatas(entidade.x, entidade.y, entidade.tamanho):
             if parede.colidir(entidade.x, entidade.y, entidade.tamanho):
                 parede.resolver_colisao(entidade)
                 return True
@@ -157,27 +564,79 @@ class Mapa:
     
     def desenhar(self, superficie):
         """Desenha o mapa na superfície"""
+        # Terrenos e paredes vêm da camada estática; só o que mudou é redesenhado
+        if self._camada_estatica is None:
+            self._renderizar_camada_estatica()
+        elif self._celulas_sujas:
+            self._redesenhar_celulas_sujas()
+        
+        superficie.blit(self._camada_estatica, (0, 0))
+    
+    def _renderizar_camada_estatica(self):
+        """Desenha todos os terrenos e paredes em uma superfície reaproveitada entre os quadros"""
+        camada = pygame.Surface((self.largura, self.altura))
+        if pygame.display.get_surface() is not None:
+            # Mesmo formato da tela, para o blit ser mais rápido
+            camada = camada.convert()
+        
         # Desenha os terrenos
         for x in range(self.celulas_x):
             for y in range(self.celulas_y):
-                rect = pygame.Rect(
-                    x * self.tamanho_celula,
-                    y * self.tamanho_celula,
-                    self.tamanho_celula,
-                    self.tamanho_celula
-                )
-                
-                # Verificar se o renderizador está disponível
-                if hasattr(self, 'renderer') and self.renderer is not None:
-                    # Usa o renderizador para desenhar texturas melhoradas
-                    self.renderer.desenhar_terreno(superficie, self.terrenos[x][y], rect, self.tamanho_celula)
-                else:
-                    # Fallback para desenho direto se o renderizador não estiver disponível
-                    self.terrenos[x][y].desenhar(superficie, rect)
+                self._desenhar_celula(camada, x, y)
         
-        # Desenha as paredes
-        for parede in self.paredes:
-            parede.desenhar(superficie)
+        # Desenha as paredes (cada uma renderizada uma vez na própria imagem)
+        camada.blits([parede.item_desenho() for parede in self.paredes], False)
+        
+        self._camada_estatica = camada
+        self._celulas_sujas.clear()
+    
+    def _redesenhar_celulas_sujas(self):
+        """Redesenha na camada estática apenas as células alteradas desde o último quadro"""
+        camada = self._camada_estatica
+        for celula in self._celulas_sujas:
+            x, y = divmod(celula, self.celulas_y)
+            rect = self._desenhar_celula(camada, x, y)
+            
+            # Redesenha as partes das paredes que cobrem a célula
+            camada.set_clip(rect)
+            camada.blits([parede.item_desenho() for parede in self.paredes
+                          if parede.area_desenho().colliderect(rect)], False)
+            camada.set_clip(None)
+        
+        self._celulas_sujas.clear()
+    
+    def _marcar_area_suja(self, area):
+        """Marca para redesenho as células que tocam o retângulo `area` (em pixels)"""
+        if self._camada_estatica is None:
+            return
+        
+        x_min = max(0, area.left // self.tamanho_celula)
+        x_max = min(self.celulas_x - 1, area.right // self.tamanho_celula)
+        y_min = max(0, area.top // self.tamanho_celula)
+        y_max = min(self.celulas_y - 1, area.bottom // self.tamanho_celula)
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                self._celulas_sujas.add(x * self.celulas_y + y)
+    
+    def _desenhar_celula(self, superficie, x, y):
+        """Desenha o terreno de uma célula e retorna o retângulo dela"""
+        rect = pygame.Rect(
+            x * self.tamanho_celula,
+            y * self.tamanho_celula,
+            self.tamanho_celula,
+            self.tamanho_celula
+        )
+        terreno = TERRENOS[self.grade_terreno[x * self.celulas_y + y]]
+        
+        # Verificar se o renderizador está disponível
+        if hasattr(self, 'renderer') and self.renderer is not None:
+            # Usa o renderizador para desenhar texturas melhoradas
+            self.renderer.desenhar_terreno(superficie, terreno, rect, self.tamanho_celula)
+        else:
+            # Fallback para desenho direto se o renderizador não estiver disponível
+            terreno.desenhar(superficie, rect)
+        
+        return rect
     
     def criar_terreno_personalizado(self, percentuais):
         """Cria um mapa com terrenos baseados nos percentuais fornecidos"""
@@ -198,8 +657,12 @@ class Mapa:
     
     def criar_mapa_predefinido(self, tipo, percentuais_personalizados=None):
         """Cria um mapa predefinido com base no tipo escolhido"""
+        # O terreno será recriado
+        self._terreno_alterado()
+        
         # Limpar paredes existentes (exceto as bordas)
         self.paredes = []
+        self._reconstruir_campo_paredes()
         # Recriar as paredes das bordas
         self._criar_paredes_bordas()
         
@@ -222,7 +685,7 @@ class Mapa:
     def _criar_mapa_planicie(self):
         """Cria um mapa de planície com algumas áreas específicas"""
         # Reinicia o mapa com grama
-        self.terrenos = [[Grama() for _ in range(self.celulas_y)] for _ in range(self.celulas_x)]
+        self._preencher_terreno(Grama)
         
         # Adiciona algumas áreas de floresta
         self._criar_area_circular(self.largura//4, self.altura//4, 100, Floresta)
@@ -234,19 +697,19 @@ class Mapa:
             centro_x = self.celulas_x // 2 + int(10 * math.sin(y / 10))
             for x in range(max(0, centro_x - largura_rio//self.tamanho_celula), 
                           min(self.celulas_x, centro_x + largura_rio//self.tamanho_celula)):
-                self.terrenos[x][y] = Agua()
+                self.grade_terreno[x * self.celulas_y + y] = AGUA
         
         # Adiciona algumas paredes como rochas
         for _ in range(10):
-            x = random.randint(20, self.largura - 50)
-            y = random.randint(20, self.altura - 50)
-            tamanho = random.randint(15, 40)
+            x = self.rng.randint(20, self.largura - 50)
+            y = self.rng.randint(20, self.altura - 50)
+            tamanho = self.rng.randint(15, 40)
             self.adicionar_parede(x, y, tamanho, tamanho)
     
     def _criar_mapa_ilha(self):
         """Cria um mapa de ilha cercada por água"""
         # Preenche tudo com água primeiro
-        self.terrenos = [[Agua() for _ in range(self.celulas_y)] for _ in range(self.celulas_x)]
+        self._preencher_terreno(Agua)
         
         # Cria uma ilha central
         centro_x = self.largura // 2
@@ -261,19 +724,19 @@ class Mapa:
         
         # Adiciona algumas paredes como pedras na água
         for _ in range(15):
-            angulo = random.uniform(0, 2 * math.pi)
-            distancia = random.uniform(raio_ilha * 1.1, raio_ilha * 1.5)
+            angulo = self.rng.uniform(0, 2 * math.pi)
+            distancia = self.rng.uniform(raio_ilha * 1.1, raio_ilha * 1.5)
             x = centro_x + int(math.cos(angulo) * distancia)
             y = centro_y + int(math.sin(angulo) * distancia)
             
             if 20 <= x < self.largura - 40 and 20 <= y < self.altura - 40:
-                tamanho = random.randint(15, 30)
+                tamanho = self.rng.randint(15, 30)
                 self.adicionar_parede(x, y, tamanho, tamanho)
     
     def _criar_mapa_labirinto(self):
         """Cria um mapa de labirinto com paredes"""
         # Reinicia o mapa com grama
-        self.terrenos = [[Grama() for _ in range(self.celulas_y)] for _ in range(self.celulas_x)]
+        self._preencher_terreno(Grama)
         
         # Cria paredes do labirinto
         espessura_parede = 10
@@ -281,63 +744,63 @@ class Mapa:
         
         # Paredes horizontais
         for y in range(espacamento, self.altura - espacamento, espacamento):
-            abertura = random.randint(0, self.largura - espacamento)
+            abertura = self.rng.randint(0, self.largura - espacamento)
             self.adicionar_parede(espessura_parede, y, abertura - espessura_parede, espessura_parede)
             self.adicionar_parede(abertura + espacamento, y, 
                                 self.largura - abertura - espacamento - espessura_parede, espessura_parede)
         
         # Paredes verticais
         for x in range(espacamento, self.largura - espacamento, espacamento):
-            abertura = random.randint(0, self.altura - espacamento)
+            abertura = self.rng.randint(0, self.altura - espacamento)
             self.adicionar_parede(x, espessura_parede, espessura_parede, abertura - espessura_parede)
             self.adicionar_parede(x, abertura + espacamento, 
                                 espessura_parede, self.altura - abertura - espacamento - espessura_parede)
         
         # Adiciona áreas de diferentes terrenos
-        num_areas = random.randint(5, 10)
+        num_areas = self.rng.randint(5, 10)
         for _ in range(num_areas):
-            x = random.randint(50, self.largura - 50)
-            y = random.randint(50, self.altura - 50)
-            raio = random.randint(30, 60)
-            terreno = random.choice([Lama, Gelo, Pantano, Deserto])
+            x = self.rng.randint(50, self.largura - 50)
+            y = self.rng.randint(50, self.altura - 50)
+            raio = self.rng.randint(30, 60)
+            terreno = self.rng.choice([Lama, Gelo, Pantano, Deserto])
             self._criar_area_circular(x, y, raio, terreno)
     
     def _criar_mapa_montanhoso(self):
         """Cria um mapa montanhoso com muitos obstáculos e terrenos variados"""
         # Base de montanhas
-        self.terrenos = [[Montanha() for _ in range(self.celulas_y)] for _ in range(self.celulas_x)]
+        self._preencher_terreno(Montanha)
         
         # Cria vários vales (áreas de grama)
-        num_vales = random.randint(3, 6)
+        num_vales = self.rng.randint(3, 6)
         for _ in range(num_vales):
-            x = random.randint(50, self.largura - 50)
-            y = random.randint(50, self.altura - 50)
-            raio = random.randint(60, 120)
+            x = self.rng.randint(50, self.largura - 50)
+            y = self.rng.randint(50, self.altura - 50)
+            raio = self.rng.randint(60, 120)
             self._criar_area_circular(x, y, raio, Grama)
         
         # Adiciona lagos
-        num_lagos = random.randint(2, 4)
+        num_lagos = self.rng.randint(2, 4)
         for _ in range(num_lagos):
-            x = random.randint(50, self.largura - 50)
-            y = random.randint(50, self.altura - 50)
-            raio = random.randint(30, 70)
+            x = self.rng.randint(50, self.largura - 50)
+            y = self.rng.randint(50, self.altura - 50)
+            raio = self.rng.randint(30, 70)
             self._criar_area_circular(x, y, raio, Agua)
         
         # Adiciona desertos
-        num_desertos = random.randint(1, 3)
+        num_desertos = self.rng.randint(1, 3)
         for _ in range(num_desertos):
-            x = random.randint(50, self.largura - 50)
-            y = random.randint(50, self.altura - 50)
-            raio = random.randint(40, 80)
+            x = self.rng.randint(50, self.largura - 50)
+            y = self.rng.randint(50, self.altura - 50)
+            raio = self.rng.randint(40, 80)
             self._criar_area_circular(x, y, raio, Deserto)
         
         # Adiciona muitas paredes como picos montanhosos
-        num_picos = random.randint(20, 40)
+        num_picos = self.rng.randint(20, 40)
         for _ in range(num_picos):
-            x = random.randint(20, self.largura - 40)
-            y = random.randint(20, self.altura - 40)
-            largura = random.randint(10, 40)
-            altura = random.randint(10, 40)
+            x = self.rng.randint(20, self.largura - 40)
+            y = self.rng.randint(20, self.altura - 40)
+            largura = self.rng.randint(10, 40)
+            altura = self.rng.randint(10, 40)
             self.adicionar_parede(x, y, largura, altura)
     
     def _criar_mapa_diversificado(self):
@@ -346,7 +809,7 @@ class Mapa:
         self.criar_terreno_aleatorio()
         
         # Garante que todos os tipos de terreno estejam presentes
-        terrenos = [Grama(), Lama(), Gelo(), Agua(), Deserto(), Montanha(), Floresta(), Pantano()]
+        terrenos = [Grama, Lama, Gelo, Agua, Deserto, Montanha, Floresta, Pantano]
         
         # Cria áreas de cada tipo
         raio_base = min(self.largura, self.altura) / 8
@@ -356,26 +819,27 @@ class Mapa:
                      self.altura/2, self.altura/2, self.altura/6, self.altura*5/6]
         
         for i in range(len(terrenos)):
-            tipo_terreno = type(terrenos[i])
-            raio = int(raio_base * (0.7 + random.random() * 0.6))
+            tipo_terreno = terrenos[i]
+            raio = int(raio_base * (0.7 + self.rng.random() * 0.6))
             self._criar_area_circular(int(posicoes_x[i]), int(posicoes_y[i]), raio, tipo_terreno)
         
         # Adiciona algumas paredes espalhadas
-        num_paredes = random.randint(10, 20)
+        num_paredes = self.rng.randint(10, 20)
         for _ in range(num_paredes):
-            x = random.randint(20, self.largura - 40)
-            y = random.randint(20, self.altura - 40)
-            largura = random.randint(15, 50)
-            altura = random.randint(15, 50)
+            x = self.rng.randint(20, self.largura - 40)
+            y = self.rng.randint(20, self.altura - 40)
+            largura = self.rng.randint(15, 50)
+            altura = self.rng.randint(15, 50)
             self.adicionar_parede(x, y, largura, altura)
     
     def _criar_area_circular(self, centro_x, centro_y, raio, tipo_terreno):
         """Cria uma área circular de um determinado tipo de terreno"""
         # Determina os limites da área a verificar
-        x_min = max(0, (centro_x - raio) // self.tamanho_celula)
-        x_max = min(self.celulas_x, (centro_x + raio) // self.tamanho_celula + 1)
-        y_min = max(0, (centro_y - raio) // self.tamanho_celula)
-        y_max = min(self.celulas_y, (centro_y + raio) // self.tamanho_celula + 1)
+        # (int: o raio pode vir como float, por exemplo no mapa de ilha)
+        x_min = max(0, int((centro_x - raio) // self.tamanho_celula))
+        x_max = min(self.celulas_x, int((centro_x + raio) // self.tamanho_celula) + 1)
+        y_min = max(0, int((centro_y - raio) // self.tamanho_celula))
+        y_max = min(self.celulas_y, int((centro_y + raio) // self.tamanho_celula) + 1)
         
         # Para cada célula na região
         for x in range(x_min, x_max):
@@ -392,7 +856,55 @@ class Mapa:
                 # Se a distância for menor que o raio, define o terreno
                 if distancia < raio:
                     # Borda suave (mistura com terrenos existentes perto da borda)
-                    if distancia > raio * 0.8 and random.random() < 0.5:
+                    if distancia > raio * 0.8 and self.rng.random() < 0.5:
                         continue
                     
-                    self.terrenos[x][y] = tipo_terreno()
\ No newline at end of file
+                    self.grade_terreno[x * self.celulas_y + y] = tipo_terreno.id
+        
+        self._terreno_alterado()
+
+
+def _distancia_ponto_segmento(px, py, x0, y0, x1, y1):
+    """Distância do ponto (px, py) ao segmento (x0, y0)-(x1, y1)"""
+    dx = x1 - x0
+    dy = y1 - y0
+    comprimento = dx * dx + dy * dy
+    t = 0.0 if comprimento == 0 else max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / comprimento))
+    return math.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+
+
+def _distancia_segmento_retangulo(x0, y0, x1, y1, rect):
+    """Distância exata entre o segmento (x0, y0)-(x1, y1) e o retângulo (0 se eles se cruzam)"""
+    esquerda, topo, direita, base = rect.left, rect.top, rect.right, rect.bottom
+    
+    # Recorte de Liang-Barsky: o segmento cruza o retângulo?
+    t0, t1 = 0.0, 1.0
+    dx = x1 - x0
+    dy = y1 - y0
+    cruza = True
+    for p, q in ((-dx, x0 - esquerda), (dx, direita - x0), (-dy, y0 - topo), (dy, base - y0)):
+        if p == 0:
+            if q < 0:
+                cruza = False
+                break
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                cruza = False
+                break
+    if cruza:
+        return 0.0
+    
+    # Sem interseção: o ponto mais próximo é uma ponta do segmento ou um canto do retângulo
+    return min(
+        math.hypot(x0 - max(esquerda, min(x0, direita)), y0 - max(topo, min(y0, base))),
+        math.hypot(x1 - max(esquerda, min(x1, direita)), y1 - max(topo, min(y1, base))),
+        _distancia_ponto_segmento(esquerda, topo, x0, y0, x1, y1),
+        _distancia_ponto_segmento(direita, topo, x0, y0, x1, y1),
+        _distancia_ponto_segmento(esquerda, base, x0, y0, x1, y1),
+        _distancia_ponto_segmento(direita, base, x0, y0, x1, y1)
+    )
@@ -16,6 +16,7 @@ class Menu:
             'n_alimentos': 40,
             'taxa_alimento': 0.05,  # Novas unidades de comida por segundo
             'modo_atributos': 'aleatorio',  # 'padrao' ou 'aleatorio'
+            'seed': None,  # Semente do gerador aleatório (None = não reprodutível)
             
             # Porcentagens de terrenos (total deve ser 100%)
             'terrenos': {
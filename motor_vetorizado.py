@@ -0,0 +1,480 @@
+from operator import attrgetter
+
+import numpy as np
+
+from terreno import AGUA, TERRENOS
+
+# Atributos guardados nos arrays de cada espécie. Os fixos são definidos na criação da
+# entidade e copiados uma única vez. Os dinâmicos são escritos de volta nos objetos pelas fases
+# do motor; depois das chamadas por objeto que os alteram (colisões, desvios), só as posições
+# afetadas são recarregadas. A energia é a exceção: decidir e interagir a alteram em qualquer
+# entidade, então ela é recarregada inteira no início de cada tick.
+CAMPOS_FIXOS = ('longevidade', 'velocidade', 'velocidade_nado', 'tamanho', 'stamina',
+                'consumo_energia', 'distancia_seguranca_parede', 'detectar_distancia')
+CAMPOS_DINAMICOS = ('x', 'y', 'direcao', 'energia', 'idade')
+
+# Tipo dos arrays que não são float
+TIPOS = {'idade': np.int64}
+
+# A partir de quantos alvos caminhos_livres compensa a verificação em lote
+MIN_LOTE_CAMINHOS = 8
+
+
+class ArmazemEspecie:
+    """Estrutura de arrays com os atributos físicos de todas as entidades de uma espécie"""
+    def __init__(self, capacidade=64):
+        # Entidade de cada posição dos arrays (entidade._indice aponta para cá)
+        self.entidades = []
+
+        self.capacidade = 0
+        self.arrays = {}
+        self._alocar(capacidade)
+
+    def _alocar(self, capacidade):
+        """Realoca os arrays com a nova capacidade, copiando os valores atuais"""
+        n = len(self.entidades)
+        for nome in CAMPOS_FIXOS + CAMPOS_DINAMICOS:
+            novo = np.zeros(capacidade, dtype=TIPOS.get(nome, float))
+            if nome in self.arrays:
+                novo[:n] = self.arrays[nome][:n]
+            self.arrays[nome] = novo
+        self.capacidade = capacidade
+
+    def __len__(self):
+        return len(self.entidades)
+
+    def __getitem__(self, nome):
+        """Visão das posições ocupadas do array de um atributo"""
+        return self.arrays[nome][:len(self.entidades)]
+
+    def adotar(self, entidade):
+        """Passa a entidade para os arrays da espécie"""
+        i = len(self.entidades)
+        if i == self.capacidade:
+            self._alocar(self.capacidade * 2)
+
+        for nome in CAMPOS_FIXOS + CAMPOS_DINAMICOS:
+            self.arrays[nome][i] = getattr(entidade, nome)
+
+        entidade._armazem = self
+        entidade._indice = i
+        self.entidades.append(entidade)
+
+    def liberar(self, entidade):
+        """Remove a entidade dos arrays (troca com a última posição, sem deslocar as demais)"""
+        i = entidade._indice
+        ultimo = len(self.entidades) - 1
+        if i != ultimo:
+            for array in self.arrays.values():
+                array[i] = array[ultimo]
+            movida = self.entidades[ultimo]
+            movida._indice = i
+            self.entidades[i] = movida
+        self.entidades.pop()
+
+        entidade._armazem = None
+
+    def carregar(self, nomes, indices=None):
+        """Copia atributos dos objetos para os arrays (de todas as entidades ou só das dos índices)"""
+        if indices is None:
+            n = len(self.entidades)
+            for nome in nomes:
+                array = self.arrays[nome]
+                array[:n] = np.fromiter(map(attrgetter(nome), self.entidades), array.dtype, n)
+        else:
+            for nome in nomes:
+                array = self.arrays[nome]
+                for i in indices:
+                    array[i] = getattr(self.entidades[i], nome)
+
+    def escrever(self, nome, indices=None):
+        """Copia um atributo dos arrays de volta para os objetos"""
+        if indices is None:
+            for entidade, valor in zip(self.entidades, self[nome].tolist()):
+                setattr(entidade, nome, valor)
+        else:
+            for i, valor in zip(indices.tolist(), self.arrays[nome][indices].tolist()):
+                setattr(self.entidades[i], nome, valor)
+
+
+class MotorVetorizado:
+    """Executa as fases físicas do tick (envelhecimento, percepção do terreno, movimento) em arrays NumPy"""
+    def __init__(self, WIDTH, HEIGHT):
+        self.WIDTH = WIDTH
+        self.HEIGHT = HEIGHT
+
+        # Um armazém por espécie (classe da entidade)
+        self.armazens = {}
+
+        # Efeitos constantes de cada terreno, indexados pelo identificador
+        # (a água depende da velocidade de nado e é tratada à parte, ver _efeitos_terreno)
+        self.modificadores_velocidade = np.array([t.modificador_velocidade for t in TERRENOS])
+        self.efeitos_energia = np.array([0.0 if t.id == AGUA else t.efeito_energia(None) for t in TERRENOS])
+
+        # Com menos alvos que isso, CriaturaBase._caminhos_livres verifica por objeto
+        self.lote_minimo_caminhos = MIN_LOTE_CAMINHOS
+
+        # Paredes em arrays para caminhos_livres, refeitas quando as paredes do mapa mudam
+        self._origem_paredes = None
+        self._retangulos = None
+        self._mascaras_paredes = None
+
+    def sincronizar(self, *listas):
+        """Adota as entidades novas das listas e libera as que saíram delas"""
+        presentes = set()
+        for lista in listas:
+            for entidade in lista:
+                presentes.add(id(entidade))
+                if getattr(entidade, '_armazem', None) is None:
+                    armazem = self.armazens.get(type(entidade))
+                    if armazem is None:
+                        armazem = self.armazens[type(entidade)] = ArmazemEspecie()
+                    armazem.adotar(entidade)
+
+        for armazem in self.armazens.values():
+            for entidade in armazem.entidades[::-1]:
+                if id(entidade) not in presentes:
+                    armazem.liberar(entidade)
+
+    def recarregar(self, entidade):
+        """Copia de novo os atributos de uma entidade alterada fora do tick (ferramentas do editor)"""
+        armazem = getattr(entidade, '_armazem', None)
+        if armazem is not None:
+            armazem.carregar(CAMPOS_FIXOS + CAMPOS_DINAMICOS, (entidade._indice,))
+
+    def liberar_todos(self):
+        """Remove todas as entidades dos arrays"""
+        for armazem in self.armazens.values():
+            for entidade in armazem.entidades[::-1]:
+                armazem.liberar(entidade)
+
+    def envelhecer(self):
+        """Fase de envelhecimento de todas as espécies; retorna as entidades que morreram"""
+        mortos = []
+        for armazem in self.armazens.values():
+            if not armazem.entidades:
+                continue
+
+            # Energia atual dos objetos (o tick anterior a alterou por objeto)
+            armazem.carregar(('energia',))
+
+            idade = armazem['idade']
+            energia = armazem['energia']
+            idade += 1
+
+            # Mesma ordem do CriaturaBase._envelhecer: velhice, fome e só então o consumo
+            morreu = (idade >= armazem['longevidade']) | (energia <= 0)
+            energia -= np.where(morreu, 0.0, armazem['consumo_energia'])
+
+            armazem.escrever('idade')
+            armazem.escrever('energia')
+            mortos.extend(armazem.entidades[i] for i in np.flatnonzero(morreu))
+        return mortos
+
+    def _celulas(self, mapa, x, y):
+        """Coordenadas (ix, iy) das células da grade de terrenos nas posições (x, y), como Mapa._celula"""
+        ix = np.clip(np.floor_divide(x, mapa.tamanho_celula).astype(np.intp), 0, mapa.celulas_x - 1)
+        iy = np.clip(np.floor_divide(y, mapa.tamanho_celula).astype(np.intp), 0, mapa.celulas_y - 1)
+        return ix, iy
+
+    def _tipos_terreno(self, mapa, x, y):
+        """Identificadores de terreno nas posições (x, y), como Mapa.tipo_em"""
+        grade = np.frombuffer(mapa.grade_terreno, dtype=np.uint8)
+        ix, iy = self._celulas(mapa, x, y)
+        return grade[ix * mapa.celulas_y + iy]
+
+    def _talvez_perto_de_parede(self, mapa, x, y, distancia):
+        """Filtro pelo campo de distância do mapa: False garante que não há parede a menos de `distancia`"""
+        mapa.garantir_campo_paredes()
+        campo = np.frombuffer(mapa.campo_paredes, dtype=np.float32)
+        passo = mapa.passo_campo_paredes
+
+        dentro = (x >= 0) & (x < mapa.largura) & (y >= 0) & (y < mapa.altura)
+        ix = np.clip(np.floor_divide(x, passo).astype(np.intp), 0, mapa.amostras_x - 1)
+        iy = np.clip(np.floor_divide(y, passo).astype(np.intp), 0, mapa.amostras_y - 1)
+
+        # Fora do mapa ou além do alcance do campo é preciso verificar exatamente
+        return ~dentro | (distancia > mapa.alcance_campo_paredes) | (campo[ix * mapa.amostras_y + iy] < distancia)
+
+    def _preparar_paredes(self, mapa):
+        """Retângulos das paredes em arrays e, para cada célula, as paredes candidatas de
+        Mapa.paredes_por_celula como bits (uma palavra de 64 bits a cada 64 paredes)"""
+        paredes_por_celula = mapa.paredes_por_celula()
+        if paredes_por_celula is self._origem_paredes:
+            return
+        paredes = mapa.paredes
+        self._retangulos = tuple(np.array([getattr(parede.rect, lado) for parede in paredes], dtype=float)
+                                 for lado in ('left', 'top', 'right', 'bottom'))
+
+        indice = {id(parede): i for i, parede in enumerate(paredes)}
+        palavras = max(1, (len(paredes) + 63) // 64)
+        mascaras = []
+        for candidatas in paredes_por_celula:
+            bits = 0
+            for parede in candidatas:
+                bits |= 1 << indice[id(parede)]
+            mascaras.append([(bits >> (64 * k)) & 0xFFFFFFFFFFFFFFFF for k in range(palavras)])
+        self._mascaras_paredes = np.array(mascaras, dtype=np.uint64)
+        self._origem_paredes = paredes_por_celula
+
+    @staticmethod
+    def _percursos(nx, ny):
+        """Células tocadas pelos percursos em grade de Mapa._celulas_no_caminho, em passos (a, b)
+        a partir da origem, para percursos de nx por ny células. O percurso cruza a i-ésima borda
+        vertical no instante (2i + 1) * ny e a j-ésima horizontal em (2j + 1) * nx (na escala de
+        Mapa._celulas_no_caminho); a célula depois de cada cruzamento conta os cruzamentos do outro
+        eixo até ali, e num canto (instantes iguais) as duas vizinhas também são tocadas. Retorna
+        (a, b, validas), um percurso por linha, sem ordem."""
+        nx = nx[:, None]
+        ny = ny[:, None]
+        i = np.arange(int(nx.max(initial=0)))
+        j = np.arange(int(ny.max(initial=0)))
+
+        # Depois do i-ésimo cruzamento vertical: a = i + 1 e b = cruzamentos horizontais até ali
+        # (contando ou não o que acontece no mesmo instante)
+        instante = (2 * i + 1) * ny
+        divisor = 2 * np.maximum(nx, 1)
+        b_ate = np.minimum((instante + nx) // divisor, ny)
+        b_antes = np.clip(-((nx - instante) // divisor), 0, ny)
+        a_vertical = np.broadcast_to(i + 1, instante.shape)
+        validas_vertical = np.broadcast_to(i < nx, instante.shape)
+
+        # Depois do j-ésimo cruzamento horizontal, o mesmo com os eixos trocados
+        instante = (2 * j + 1) * nx
+        divisor = 2 * np.maximum(ny, 1)
+        a_ate = np.minimum((instante + ny) // divisor, nx)
+        a_antes = np.clip(-((ny - instante) // divisor), 0, nx)
+        b_horizontal = np.broadcast_to(j + 1, instante.shape)
+        validas_horizontal = np.broadcast_to(j < ny, instante.shape)
+
+        a = np.concatenate((a_vertical, a_vertical, a_ate, a_antes), axis=1)
+        b = np.concatenate((b_ate, b_antes, b_horizontal, b_horizontal), axis=1)
+        validas = np.concatenate((validas_vertical, validas_vertical, validas_horizontal, validas_horizontal), axis=1)
+        return a, b, validas
+
+    def _distancias_segmentos_paredes(self, x0, y0, x1, y1, paredes):
+        """Distância de cada segmento à parede de mesmo índice em `paredes`, como mapa._distancia_segmento_retangulo"""
+        esquerda, topo, direita, base = (lado[paredes] for lado in self._retangulos)
+        dx = x1 - x0
+        dy = y1 - y0
+
+        # Recorte de Liang-Barsky: o segmento cruza o retângulo?
+        t0 = np.zeros(len(paredes))
+        t1 = np.ones(len(paredes))
+        cruza = np.ones(len(paredes), dtype=bool)
+        for p, q in ((-dx, x0 - esquerda), (dx, direita - x0), (-dy, y0 - topo), (dy, base - y0)):
+            nulo = p == 0
+            cruza &= ~(nulo & (q < 0))
+            t = q / np.where(nulo, 1.0, p)
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+            cruza &= t0 <= t1
+
+        # Sem interseção: o ponto mais próximo é uma ponta do segmento ou um canto do retângulo
+        comprimento = dx * dx + dy * dy
+        vazio = comprimento == 0
+        comprimento = np.where(vazio, 1.0, comprimento)
+
+        def ponto_segmento(px, py):
+            t = np.where(vazio, 0.0, np.clip(((px - x0) * dx + (py - y0) * dy) / comprimento, 0.0, 1.0))
+            return np.hypot(px - (x0 + t * dx), py - (y0 + t * dy))
+
+        distancia = np.minimum(
+            np.hypot(x0 - np.maximum(esquerda, np.minimum(x0, direita)), y0 - np.maximum(topo, np.minimum(y0, base))),
+            np.hypot(x1 - np.maximum(esquerda, np.minimum(x1, direita)), y1 - np.maximum(topo, np.minimum(y1, base))))
+        for px, py in ((esquerda, topo), (direita, topo), (esquerda, base), (direita, base)):
+            distancia = np.minimum(distancia, ponto_segmento(px, py))
+        return np.where(cruza, 0.0, distancia)
+
+    def caminhos_livres(self, mapa, entidade, alvos):
+        """Os alvos sem água (se a entidade não nada) nem parede no caminho, pelas mesmas regras de
+        CriaturaBase._ha_agua_no_caminho e _ha_parede_no_caminho, verificados todos de uma vez"""
+        n = len(alvos)
+        x = np.fromiter(map(attrgetter('x'), alvos), float, n)
+        y = np.fromiter(map(attrgetter('y'), alvos), float, n)
+
+        # Alvos a menos de 10 px não são verificados
+        longe = (x - entidade.x) ** 2 + (y - entidade.y) ** 2 >= 100
+        bloqueado = np.zeros(n, dtype=bool)
+
+        self._preparar_paredes(mapa)
+        esquerda, topo, direita, base = self._retangulos
+        tem_paredes = len(esquerda) > 0
+
+        # Destino perto de uma parede (Mapa.perto_de_parede): os que o campo não descarta são
+        # verificados contra todas as paredes
+        if tem_paredes:
+            distancia = entidade.distancia_seguranca_parede
+            perto = np.flatnonzero(longe & self._talvez_perto_de_parede(mapa, x, y, distancia))
+            if len(perto):
+                xd = x[perto, None]
+                yd = y[perto, None]
+                dx = xd - np.maximum(esquerda, np.minimum(xd, direita))
+                dy = yd - np.maximum(topo, np.minimum(yd, base))
+                bloqueado[perto] = (dx * dx + dy * dy < distancia * distancia).any(axis=1)
+
+        # Percursos na grade de terrenos entre as células da entidade e dos alvos
+        tamanho = mapa.tamanho_celula
+        celulas_y = mapa.celulas_y
+        ix0 = min(max(0, int(entidade.x // tamanho)), mapa.celulas_x - 1)
+        iy0 = min(max(0, int(entidade.y // tamanho)), celulas_y - 1)
+        ix, iy = self._celulas(mapa, x, y)
+        caminho = np.flatnonzero(longe & ((ix != ix0) | (iy != iy0)))
+        if len(caminho):
+            # O percurso só depende da célula de destino: cada uma é verificada uma vez
+            destinos, inverso = np.unique(ix[caminho] * celulas_y + iy[caminho], return_inverse=True)
+            ix, iy = np.divmod(destinos, celulas_y)
+            passo_x = np.where(ix > ix0, 1, -1)
+            passo_y = np.where(iy > iy0, 1, -1)
+            nx = np.abs(ix - ix0)
+            ny = np.abs(iy - iy0)
+            a, b, validas = self._percursos(nx, ny)
+            intermediarias = validas & ~((a == nx[:, None]) & (b == ny[:, None]))
+            celulas = np.where(intermediarias,
+                               (ix0 + passo_x[:, None] * a) * celulas_y + iy0 + passo_y[:, None] * b, 0)
+            bloqueio = np.zeros(len(destinos), dtype=bool)
+
+            # Água: nas células intermediárias ou ao lado delas, ou no próprio destino
+            if entidade.velocidade_nado <= 0:
+                dilatada = np.frombuffer(mapa.agua_dilatada(), dtype=np.uint8)
+                grade = np.frombuffer(mapa.grade_terreno, dtype=np.uint8)
+                bloqueio |= (grade[destinos] == AGUA) | ((dilatada[celulas] != 0) & intermediarias).any(axis=1)
+
+            # Paredes perto do trecho entre a primeira e a última célula intermediária
+            tem_intermediarias = intermediarias.any(axis=1)
+            if tem_paredes and tem_intermediarias.any():
+                distancia = entidade.distancia_seguranca_parede * 0.8
+                if distancia + tamanho * 0.71 >= mapa.alcance_campo_paredes:
+                    candidatas = np.ones((len(destinos), len(esquerda)), dtype=bool)
+                else:
+                    uniao = np.bitwise_or.reduce(self._mascaras_paredes[celulas] * intermediarias[:, :, None], axis=1)
+                    bits = np.arange(len(esquerda))
+                    candidatas = (uniao[:, bits // 64] >> (bits % 64).astype(np.uint64)) & np.uint64(1) != 0
+
+                # Primeira célula do percurso: um passo no eixo que cruza primeiro (x no empate);
+                # última: a anterior ao destino, um passo antes no eixo que cruza por último
+                primeiro_x = ny <= nx
+                ultimo_x = nx >= ny
+                meia = tamanho / 2
+                x0 = (ix0 + passo_x * np.where(primeiro_x, 1, 0)) * tamanho + meia
+                y0 = (iy0 + passo_y * np.where(primeiro_x, 0, 1)) * tamanho + meia
+                x1 = (ix0 + passo_x * np.where(ultimo_x, nx - 1, nx)) * tamanho + meia
+                y1 = (iy0 + passo_y * np.where(ultimo_x, ny, ny - 1)) * tamanho + meia
+                linhas, paredes = np.nonzero(candidatas & tem_intermediarias[:, None])
+                distancias = self._distancias_segmentos_paredes(x0[linhas], y0[linhas], x1[linhas], y1[linhas], paredes)
+                bloqueio[linhas[distancias < distancia]] = True
+
+            bloqueado[caminho] |= bloqueio[inverso]
+
+        bloqueado &= longe
+        return [alvo for alvo, fora in zip(alvos, bloqueado.tolist()) if not fora]
+
+    def perceber_ambiente(self, mapa):
+        """Fase de percepção (CriaturaBase._perceber_ambiente e limites absolutos) para todas as espécies"""
+        for armazem in self.armazens.values():
+            if not armazem.entidades:
+                continue
+            entidades = armazem.entidades
+            for entidade in entidades:
+                entidade.esta_nadando = False
+
+            x = armazem['x']
+            y = armazem['y']
+
+            if mapa:
+                # Desviar de paredes: só as entidades que o campo não descarta são verificadas
+                candidatas = np.flatnonzero(self._talvez_perto_de_parede(mapa, x, y, armazem['distancia_seguranca_parede']))
+                for i in candidatas:
+                    entidade = entidades[i]
+                    if entidade._esta_perto_de_parede(mapa):
+                        entidade._evitar_parede(mapa)
+                armazem.carregar(('direcao',), candidatas)
+
+                # Água à frente para quem não sabe nadar
+                direcao = armazem['direcao']
+                frente_x = x + np.cos(direcao) * armazem['detectar_distancia']
+                frente_y = y + np.sin(direcao) * armazem['detectar_distancia']
+                dentro = (frente_x >= 0) & (frente_x < self.WIDTH) & (frente_y >= 0) & (frente_y < self.HEIGHT)
+                agua_a_frente = dentro & (self._tipos_terreno(mapa, frente_x, frente_y) == AGUA) & \
+                    (armazem['velocidade_nado'] <= 0)
+                desviadas = np.flatnonzero(agua_a_frente)
+                for i in desviadas:
+                    entidades[i]._evitar_agua()
+                armazem.carregar(('direcao',), desviadas)
+
+                # Natação (o pânico de quem não sabe nadar é aleatório, por objeto)
+                nadando = np.flatnonzero(self._tipos_terreno(mapa, x, y) == AGUA)
+                for i in nadando:
+                    entidades[i]._nadar()
+                armazem.carregar(('direcao',), nadando)
+
+            # Limites absolutos do mapa (CriaturaBase._aplicar_limites_absolutos)
+            margem = armazem['tamanho'] + 25
+            fora = (x < margem) | (x > self.WIDTH - margem) | (y < margem) | (y > self.HEIGHT - margem)
+            if fora.any():
+                np.clip(x, margem, self.WIDTH - margem, out=x)
+                np.clip(y, margem, self.HEIGHT - margem, out=y)
+                indices = np.flatnonzero(fora)
+                armazem.escrever('x', indices)
+                armazem.escrever('y', indices)
+
+    def _efeitos_terreno(self, tipos, velocidade_nado):
+        """Modificador de velocidade e efeito na energia do terreno (regras de terreno.py)"""
+        modificador = self.modificadores_velocidade[tipos]
+        energia = self.efeitos_energia[tipos]
+
+        # Água (terreno.Agua): quem não nada quase não se move e se afoga
+        agua = tipos == AGUA
+        if agua.any():
+            nao_nada = velocidade_nado <= 0
+            modificador = np.where(agua, np.where(nao_nada, 0.05, velocidade_nado), modificador)
+            energia = np.where(agua, np.where(nao_nada, -0.5, np.where(velocidade_nado < 0.5, -0.2, -0.05)), energia)
+
+        return modificador, energia
+
+    def mover(self, entidades, mapa):
+        """Fase de movimento (CriaturaBase._mover) das entidades informadas"""
+        # Agrupa as entidades por armazém
+        indices_por_armazem = {}
+        for entidade in entidades:
+            indices_por_armazem.setdefault(entidade._armazem, []).append(entidade._indice)
+            # O sorteio de Gelo.efeito_movimento não é feito aqui: o gelo não trava a direção
+            entidade.direção_bloqueada = False
+
+        for armazem, indices in indices_por_armazem.items():
+            # As decisões alteraram direção e energia dos objetos
+            armazem.carregar(('direcao', 'energia'), indices)
+            idx = np.array(indices, dtype=np.intp)
+            x = armazem.arrays['x']
+            y = armazem.arrays['y']
+
+            # Efeitos do terreno
+            if mapa:
+                tipos = self._tipos_terreno(mapa, x[idx], y[idx])
+                modificador, efeito_energia = self._efeitos_terreno(tipos, armazem.arrays['velocidade_nado'][idx])
+                velocidade_atual = armazem.arrays['velocidade'][idx] * modificador
+                energia = armazem.arrays['energia']
+                energia[idx] = np.minimum(energia[idx] + efeito_energia, armazem.arrays['stamina'][idx])
+                armazem.escrever('energia', idx)
+            else:
+                velocidade_atual = armazem.arrays['velocidade'][idx]
+
+            for i, valor in zip(indices, velocidade_atual.tolist()):
+                armazem.entidades[i].velocidade_atual = valor
+
+            # Movimento
+            direcao = armazem.arrays['direcao'][idx]
+            x[idx] += np.cos(direcao) * velocidade_atual
+            y[idx] += np.sin(direcao) * velocidade_atual
+            if not mapa:
+                x[idx] = np.clip(x[idx], 0, self.WIDTH)
+                y[idx] = np.clip(y[idx], 0, self.HEIGHT)
+            armazem.escrever('x', idx)
+            armazem.escrever('y', idx)
+
+            # Colisões: só as entidades que o campo de distância não descarta
+            if mapa:
+                candidatas = self._talvez_perto_de_parede(mapa, x[idx], y[idx], armazem.arrays['tamanho'][idx])
+                colididas = [i for i in idx[candidatas].tolist()
+                             if mapa.verificar_colisao_paredes(armazem.entidades[i])]
+                armazem.carregar(('x', 'y', 'direcao'), colididas)
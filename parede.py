@@ -1,6 +1,8 @@
-import pygame
+import math
 import random
 
+import pygame
+
 class Parede:
     """Classe que representa obstáculos intransponíveis no mapa"""
     def __init__(self, x, y, largura, altura, cor=None):
@@ -48,8 +50,15 @@ class Parede:
                 'y_rel': y_rel,
                 'tamanho': tamanho,
                 'tipo': tipo,
-                'cor': cor_dec
+                'cor': cor_dec,
+                # Ângulo da rachadura e formato do buraco (50% de chance de ser retângulo),
+                # sorteados aqui para a parede ter sempre a mesma aparência
+                'angulo': random.uniform(0, 6.28),
+                'retangulo': random.random() < 0.5
             })
+        
+        # Imagem da parede (área de area_desenho), renderizada no primeiro desenho e reaproveitada
+        self._imagem = None
     
     def _clarear_cor(self, cor, valor):
         """Retorna uma versão mais clara da cor"""
@@ -67,6 +76,14 @@ class Parede:
             max(0, cor[2] - valor)
         )
     
+    def area_desenho(self):
+        """Retângulo que contém tudo o que a parede desenha (as decorações podem passar da borda)"""
+        margem = int(0.25 * min(abs(self.rect.width), abs(self.rect.height))) + 2
+        # Alguns geradores criam paredes com altura negativa: a área é sempre normalizada
+        area = self.rect.inflate(0, 0)
+        area.normalize()
+        return area.inflate(2 * margem, 2 * margem)
+    
     def colidir(self, x, y, raio):
         """Verifica se um círculo com centro (x,y) e raio especificado colide com a parede"""
         # Encontra o ponto mais próximo na parede do centro do círculo
@@ -115,26 +132,39 @@ class Parede:
                 else:  # Colisão predominantemente vertical
                     entidade.direcao = -entidade.direcao  # Reflexão no eixo y
     
+    def item_desenho(self):
+        """Par (Surface, posição) da parede já renderizada, para um blits do mapa"""
+        area = self.area_desenho()
+        if self._imagem is None:
+            self._imagem = pygame.Surface(area.size, pygame.SRCALPHA)
+            self._renderizar(self._imagem, self.rect.move(-area.x, -area.y))
+        return self._imagem, area.topleft
+    
     def desenhar(self, superficie):
         """Desenha a parede na superfície com detalhes visuais"""
+        imagem, posicao = self.item_desenho()
+        superficie.blit(imagem, posicao)
+    
+    def _renderizar(self, superficie, rect):
+        """Desenha a parede e as decorações com o retângulo principal em `rect`"""
         # Desenhar o retângulo principal da parede
-        pygame.draw.rect(superficie, self.cor, self.rect)
+        pygame.draw.rect(superficie, self.cor, rect)
         
         # Desenhar detalhes decorativos
         for dec in self.decoracoes:
-            pos_x = self.rect.x + int(dec['x_rel'] * self.rect.width)
-            pos_y = self.rect.y + int(dec['y_rel'] * self.rect.height)
+            pos_x = rect.x + int(dec['x_rel'] * rect.width)
+            pos_y = rect.y + int(dec['y_rel'] * rect.height)
             tamanho = int(dec['tamanho'])
             
             if dec['tipo'] == 1:  # Rachadura (linha)
-                angulo = random.uniform(0, 6.28)  # Ângulo aleatório (0-2π)
+                angulo = dec['angulo']
                 end_x = pos_x + int(math.cos(angulo) * tamanho)
                 end_y = pos_y + int(math.sin(angulo) * tamanho)
                 pygame.draw.line(superficie, dec['cor'], (pos_x, pos_y), (end_x, end_y), max(1, int(tamanho/5)))
             elif dec['tipo'] == 2:  # Mancha (círculo)
                 pygame.draw.circle(superficie, dec['cor'], (pos_x, pos_y), tamanho//2)
             else:  # Buraco (pequeno retângulo ou círculo)
-                if random.random() < 0.5:  # 50% chance de ser retângulo
+                if dec['retangulo']:
                     mini_rect = pygame.Rect(
                         pos_x - tamanho//2, 
                         pos_y - tamanho//2, 
@@ -146,7 +176,4 @@ class Parede:
                     pygame.draw.circle(superficie, dec['cor'], (pos_x, pos_y), tamanho//2)
         
         # Adicionar contorno para destacar a parede
-        pygame.draw.rect(superficie, self._escurecer_cor(self.cor, 30), self.rect, 2)
-
-# Importação para usar math.cos e math.sin
-import math
\ No newline at end of file
+        pygame.draw.rect(superficie, self._escurecer_cor(self.cor, 30), rect, 2)
@@ -0,0 +1,117 @@
+import numpy as np
+import pygame
+
+
+class SistemaParticulas:
+    """Partículas em arrays NumPy pré-alocados, com capacidade fixa. A atualização é vetorizada e
+    o desenho usa sprites de ponto em cache (por cor, raio e nível de transparência) num único blits."""
+    # Níveis de transparência distintos nos sprites
+    NIVEIS_ALFA = 16
+
+    def __init__(self, capacidade=4096):
+        self.capacidade = capacidade
+        self.n = 0
+
+        # As partículas vivas ocupam as posições [0, n) de cada array
+        self.x = np.zeros(capacidade)
+        self.y = np.zeros(capacidade)
+        self.vx = np.zeros(capacidade)
+        self.vy = np.zeros(capacidade)
+        self.vida = np.zeros(capacidade, dtype=np.int32)
+        self.vida_max = np.ones(capacidade, dtype=np.int32)
+        self.raio = np.zeros(capacidade, dtype=np.int32)
+        self.cor = np.zeros(capacidade, dtype=np.int32)
+
+        # Cores (RGB) usadas até agora; as partículas guardam o índice
+        self.paleta = []
+        self._indice_cor = {}
+
+        # (cor, raio, nível de transparência) combinados num inteiro -> Surface
+        self._sprites = {}
+
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.n
+
+    def limpar(self):
+        self.n = 0
+
+    def adicionar(self, x, y, cor, quantidade, vida_max=30, velocidade=1.5, tamanho=2):
+        """Lança `quantidade` partículas de (x, y) em direções aleatórias; as que não couberem na
+        capacidade são descartadas"""
+        inicio = self.n
+        quantidade = min(quantidade, self.capacidade - inicio)
+        if quantidade <= 0:
+            return
+        fim = inicio + quantidade
+        rng = self.rng
+
+        rgb = tuple(cor[:3])
+        indice = self._indice_cor.get(rgb)
+        if indice is None:
+            indice = self._indice_cor[rgb] = len(self.paleta)
+            self.paleta.append(rgb)
+
+        angulo = rng.uniform(0, 2 * np.pi, quantidade)
+        velocidade_rand = rng.uniform(0.5, velocidade, quantidade)
+        self.x[inicio:fim] = x
+        self.y[inicio:fim] = y
+        self.vx[inicio:fim] = np.cos(angulo) * velocidade_rand
+        self.vy[inicio:fim] = np.sin(angulo) * velocidade_rand
+        vida = rng.integers(vida_max // 2, vida_max, quantidade, endpoint=True)
+        self.vida[inicio:fim] = vida
+        self.vida_max[inicio:fim] = vida
+        self.raio[inicio:fim] = np.maximum(1, rng.uniform(tamanho * 0.7, tamanho * 1.3, quantidade).astype(np.int32))
+        self.cor[inicio:fim] = indice
+        self.n = fim
+
+    def atualizar(self):
+        """Um quadro: envelhece, descarta as que acabaram e move as demais"""
+        n = self.n
+        if not n:
+            return
+
+        vida = self.vida[:n]
+        vida -= 1
+        vivas = vida > 0
+        if not vivas.all():
+            # Compacta as vivas no início dos arrays
+            m = int(np.count_nonzero(vivas))
+            for array in (self.x, self.y, self.vx, self.vy, self.vida, self.vida_max, self.raio, self.cor):
+                array[:m] = array[:n][vivas]
+            self.n = n = m
+
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+        # Gravidade em parte das partículas
+        self.vy[:n] += 0.05 * (self.rng.random(n) < 0.3)
+
+    def _sprite(self, chave):
+        niveis = self.NIVEIS_ALFA
+        nivel = chave % niveis
+        raio = chave // niveis % 64
+        r, g, b = self.paleta[chave // (niveis * 64)]
+        sprite = pygame.Surface((raio * 2, raio * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (r, g, b, (nivel + 1) * 256 // niveis - 1), (raio, raio), raio)
+        self._sprites[chave] = sprite
+        return sprite
+
+    def desenhar(self, superficie):
+        n = self.n
+        if not n:
+            return
+
+        # Transparência proporcional à vida restante
+        niveis = self.NIVEIS_ALFA
+        nivel = self.vida[:n] * niveis // (self.vida_max[:n] + 1)
+        raio = np.minimum(self.raio[:n], 63)
+        chaves = (self.cor[:n] * 64 + raio) * niveis + nivel
+        xs = (self.x[:n] - raio).astype(np.int32)
+        ys = (self.y[:n] - raio).astype(np.int32)
+
+        sprites = self._sprites
+        obter = sprites.get
+        superficie.blits([(obter(chave) or self._sprite(chave), posicao)
+                          for chave, posicao in zip(chaves.tolist(), zip(xs.tolist(), ys.tolist()))], False)
@@ -0,0 +1,157 @@
+import json
+import time
+from collections import deque
+
+import pygame
+
+from textos import fonte
+
+
+class Perfilador:
+    """Cronômetros das fases do tick e do quadro: médias móveis, percentis do quadro e trace do Chrome"""
+    def __init__(self, janela=120, janela_quadros=600, limite_trace=500000):
+        # Painel na tela (médias e percentis) e gravação de trace; desligados não custam
+        # mais que uma comparação por fase
+        self.ativo = False
+        self.gravando_trace = False
+        self.medindo = False
+
+        # Tempo de cada fase (ms) nos últimos `janela` quadros; fases com nome "pai.filha"
+        self.fases = {}
+        self.janela = janela
+
+        # Duração total dos últimos quadros (ms), para os percentis
+        self.tempos_quadro = deque(maxlen=janela_quadros)
+
+        # Soma das medições do quadro corrente (ns); uma fase pode rodar várias vezes por quadro
+        self._acumulado = {}
+
+        # Eventos "X" (completos) no formato de trace do Chrome
+        self.eventos_trace = []
+        self.limite_trace = limite_trace
+        self._origem = time.perf_counter_ns()
+
+        # Painel pré-renderizado, refeito a cada alguns quadros
+        self._painel = None
+        self._quadros_desde_painel = 0
+        self.mensagem = None
+
+    def _atualizar_estado(self):
+        self.medindo = self.ativo or self.gravando_trace
+        if not self.medindo:
+            self._acumulado.clear()
+
+    def alternar(self):
+        """Liga ou desliga o painel de tempos"""
+        self.ativo = not self.ativo
+        self._painel = None
+        self._atualizar_estado()
+
+    def iniciar_trace(self):
+        """Começa a gravar eventos para exportar como trace"""
+        self.eventos_trace = []
+        self.gravando_trace = True
+        self._atualizar_estado()
+
+    def parar_trace(self, caminho):
+        """Para a gravação e exporta o trace para o arquivo"""
+        self.gravando_trace = False
+        self._atualizar_estado()
+        self.exportar_trace(caminho)
+
+    def inicio(self):
+        """Marca o início de uma fase (0 quando desligado)"""
+        return time.perf_counter_ns() if self.medindo else 0
+
+    def fim(self, nome, inicio):
+        """Registra a duração da fase iniciada em `inicio`"""
+        if not inicio:
+            return
+        agora = time.perf_counter_ns()
+        duracao = agora - inicio
+        self._acumulado[nome] = self._acumulado.get(nome, 0) + duracao
+
+        if self.gravando_trace and len(self.eventos_trace) < self.limite_trace:
+            self.eventos_trace.append({
+                'name': nome,
+                'cat': nome.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (inicio - self._origem) / 1000.0,
+                'dur': duracao / 1000.0,
+                'pid': 1,
+                'tid': 1,
+            })
+
+    def fechar_quadro(self):
+        """Consolida as medições do quadro nas médias móveis"""
+        if not self.medindo:
+            return
+
+        acumulado = self._acumulado
+        # Fases que não rodaram neste quadro (pausa, por exemplo) contam como zero
+        for nome, tempos in self.fases.items():
+            tempos.append(acumulado.pop(nome, 0) / 1e6)
+        for nome, duracao in acumulado.items():
+            self.fases[nome] = deque([duracao / 1e6], maxlen=self.janela)
+        acumulado.clear()
+
+        quadro = self.fases.get('quadro')
+        if quadro:
+            self.tempos_quadro.append(quadro[-1])
+        self._quadros_desde_painel += 1
+
+    def media(self, nome):
+        """Tempo médio da fase por quadro (ms) na janela"""
+        tempos = self.fases.get(nome)
+        return sum(tempos) / len(tempos) if tempos else 0.0
+
+    def percentil(self, p):
+        """Percentil `p` (0-100) da duração do quadro (ms)"""
+        if not self.tempos_quadro:
+            return 0.0
+        valores = sorted(self.tempos_quadro)
+        return valores[min(len(valores) - 1, int(round(p / 100.0 * (len(valores) - 1))))]
+
+    def exportar_trace(self, caminho):
+        """Grava os eventos no formato JSON de trace do Chrome (chrome://tracing, Perfetto)"""
+        eventos = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'simulacao'}}]
+        eventos.extend(self.eventos_trace)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, arquivo)
+        self.eventos_trace = []
+
+    def _linhas_painel(self):
+        """Texto do painel: quadro (média, p95, p99) e média de cada fase"""
+        media_quadro = sum(self.tempos_quadro) / len(self.tempos_quadro) if self.tempos_quadro else 0.0
+        linhas = [
+            f"quadro  {media_quadro:6.2f} ms  p95 {self.percentil(95):6.2f}  p99 {self.percentil(99):6.2f}",
+        ]
+        for nome in sorted(self.fases):
+            if nome == 'quadro':
+                continue
+            media = self.media(nome)
+            parcela = 100.0 * media / media_quadro if media_quadro else 0.0
+            nivel = nome.count('.')
+            rotulo = "  " * nivel + nome.rsplit('.', 1)[-1]
+            linhas.append(f"{rotulo:<18} {media:6.2f} ms {parcela:5.1f}%")
+        if self.gravando_trace:
+            linhas.append(f"gravando trace ({len(self.eventos_trace)} eventos)")
+        if self.mensagem:
+            linhas.append(self.mensagem)
+        return linhas
+
+    def desenhar(self, superficie):
+        """Desenha o painel de tempos no canto superior direito"""
+        if self._painel is None or self._quadros_desde_painel >= 15:
+            # Os tempos mudam a cada atualização: renderizados direto, sem passar pelo cache de textos
+            fonte_painel = fonte("monospace", 13)
+            linhas = [fonte_painel.render(linha, True, (230, 230, 230)) for linha in self._linhas_painel()]
+            altura_linha = fonte_painel.get_linesize()
+            largura = max(linha.get_width() for linha in linhas) + 12
+            self._painel = pygame.Surface((largura, altura_linha * len(linhas) + 10), pygame.SRCALPHA)
+            self._painel.fill((0, 0, 0, 170))
+            for i, linha in enumerate(linhas):
+                self._painel.blit(linha, (6, 5 + i * altura_linha))
+            self._quadros_desde_painel = 0
+
+        superficie.blit(self._painel, (superficie.get_width() - self._painel.get_width() - 10, 10))
@@ -7,9 +7,9 @@ class Predador(CriaturaBase):
     """Classe que representa predadores carnívoros"""
     
     def __init__(self, x=None, y=None, velocidade=None, stamina=None, tamanho=None, 
-                velocidade_nado=None, campo=None, pai=None, WIDTH=800, HEIGHT=600):
+                velocidade_nado=None, campo=None, pai=None, WIDTH=800, HEIGHT=600, rng=None):
         # Inicializar a classe base primeiro
-        super().__init__(x, y, velocidade, stamina, None, tamanho, velocidade_nado, pai, WIDTH, HEIGHT)
+        super().__init__(x, y, velocidade, stamina, None, tamanho, velocidade_nado, pai, WIDTH, HEIGHT, rng)
         
         # Atributos específicos de predadores
         # Ajustar valores específicos para predadores
@@ -19,14 +19,14 @@ class Predador(CriaturaBase):
             pass  # As mutações já foram aplicadas na classe base
         else:
             # Atributos para predadores novos (quando não vem de mutação)
-            self.velocidade = velocidade if velocidade is not None else random.uniform(2.0, 3.5)
-            self.stamina = stamina if stamina is not None else random.uniform(100 *self.tamanho, 200* self.tamanho)
-            self.tamanho = tamanho if tamanho is not None else random.uniform(8, 12)
-            self.campo_visao = campo if campo is not None else random.uniform(self.tamanho *25, self.tamanho*100)   # Campo de visão maior que presas
+            self.velocidade = velocidade if velocidade is not None else self.rng.uniform(2.0, 3.5)
+            self.stamina = stamina if stamina is not None else self.rng.uniform(100 *self.tamanho, 200* self.tamanho)
+            self.tamanho = tamanho if tamanho is not None else self.rng.uniform(8, 12)
+            self.campo_visao = campo if campo is not None else self.rng.uniform(self.tamanho *25, self.tamanho*100)   # Campo de visão maior que presas
 
             self.energia = self.stamina
             # Predadores vivem mais tempo
-            self.longevidade = random.uniform(600, 1000)  # Predadores vivem um pouco menos
+            self.longevidade = self.rng.uniform(600, 1000)  # Predadores vivem um pouco menos
         
         # Status dinâmicos específicos de predadores
         self.tempo_cacar = 0
@@ -59,13 +59,21 @@ class Predador(CriaturaBase):
         
         self.cor = (r, g, b)
     
-    def atualizar(self, criaturas, predadores=None, mapa=None):
+    def atualizar(self, criaturas, predadores, registro, intencoes, mapa=None, grade_presas=None):
         # Chamar o método base primeiro para verificações de vida e energia
         if not super().atualizar(mapa=mapa):
             return False  # Morreu de velhice ou fome
         
+        self._decidir(None, criaturas, predadores, registro, mapa, grade_presas)
+        self._mover(mapa)
+        self._interagir(None, criaturas, predadores, intencoes, grade_presas)
+        
+        return True  # Continua vivo
+    
+    def _decidir(self, alimentos, criaturas, predadores, registro, mapa=None, grade_presas=None, grade_predadores=None, motor=None):
+        """Escolhe a direção: perseguir o alvo atual ou procurar uma nova presa"""
         # Se não estiver com direção bloqueada pelo terreno
-        if not hasattr(self, 'direção_bloqueada') or not self.direção_bloqueada:
+        if not self.direção_bloqueada:
             # Verificar se está perto de uma parede e evitar se necessário
             if mapa and self._esta_perto_de_parede(mapa):
                 self._evitar_parede(mapa)
@@ -75,15 +83,11 @@ class Predador(CriaturaBase):
                 self._buscar_saida_agua(mapa)
             # Se já está caçando um alvo
             elif self.alvo:
-                # Verificar se o alvo ainda existe
-                alvo_existe = False
-                
-                # O alvo é sempre uma criatura para predadores normais
-                for criatura in criaturas:
-                    if criatura.id == self.alvo.id:
-                        self.alvo = criatura  # Atualizar referência
-                        alvo_existe = True
-                        break
+                # Verificar se o alvo ainda existe (o alvo é sempre uma criatura para predadores normais)
+                alvo = registro.obter(self.alvo.id, criaturas)
+                alvo_existe = alvo is not None
+                if alvo_existe:
+                    self.alvo = alvo  # Atualizar referência
                 
                 if not alvo_existe or self.tempo_cacar <= 0:
                     # Alvo não existe mais ou cansou de caçar, encontrar novo alvo
@@ -94,7 +98,7 @@ class Predador(CriaturaBase):
                     # Perseguir alvo
                     if not self._perseguir_alvo(mapa):
                         # Se não conseguiu perseguir (água ou parede no caminho), procura outro alvo
-                        presa = self._encontrar_presa(criaturas, mapa)
+                        presa = self._encontrar_presa(criaturas, mapa, grade_presas, motor)
                         if presa:
                             self.alvo = presa
                             self.tempo_cacar = 200
@@ -104,128 +108,53 @@ class Predador(CriaturaBase):
                         self.tempo_cacar -= 1
             else:
                 # Encontrar novo alvo
-                presa = self._encontrar_presa(criaturas, mapa)
+                presa = self._encontrar_presa(criaturas, mapa, grade_presas, motor)
                 if presa:
                     self.alvo = presa
                     self.tempo_cacar = 200  # Caçar por 200 frames (≈3.3 segundos a 60 FPS)
                 else:
                     self._movimento_aleatorio()
         
-        # Aplicar efeitos do terreno se houver mapa
-        if mapa:
-            # Garante que as propriedades necessárias existam
-            if not hasattr(self, 'velocidade_atual'):
-                self.velocidade_atual = self.velocidade
-            if not hasattr(self, 'direção_bloqueada'):
-                self.direção_bloqueada = False
-                
-            mapa.aplicar_efeitos_terreno(self)
-        else:
-            # Sem mapa, usa velocidade padrão
-            self.velocidade_atual = self.velocidade
-        
-        # Mover usando a velocidade afetada pelo terreno
-        self.x += math.cos(self.direcao) * self.velocidade_atual
-        self.y += math.sin(self.direcao) * self.velocidade_atual
-        
-        # Verificar colisão com paredes se houver mapa
-        if mapa:
-            mapa.verificar_colisao_paredes(self)
-        else:
-            # Manter dentro dos limites da tela (comportamento padrão se não houver mapa)
-            self.x = max(0, min(self.WIDTH, self.x))
-            self.y = max(0, min(self.HEIGHT, self.y))
-        
-        # Resetar o efeito de bloqueio de direção
-        if hasattr(self, 'direção_bloqueada'):
-            self.direção_bloqueada = False
-        
+        return True
+    
+    def _interagir(self, alimentos, criaturas, predadores, intencoes, grade_presas=None, grade_predadores=None):
+        """Tenta comer uma presa alcançada e, se conseguir, reproduzir"""
         # Tentar comer alguma criatura
-        if self._cacar(criaturas):
+        if self._cacar(criaturas, intencoes, grade_presas):
             # Se conseguiu caçar, tenta reproduzir
-            self._reproduzir(predadores)
-        
-        return True  # Continua vivo
+            self._reproduzir(predadores, intencoes)
 
-    def _buscar_saida_agua(self, mapa):
-        """Tenta encontrar e se mover em direção à terra mais próxima"""
-        # Verificar em várias direções para encontrar terra
-        direcoes_teste = 12  # Número de direções a verificar
-        melhor_direcao = None
-        menor_distancia = float('inf')
-        
-        for i in range(direcoes_teste):
-            angulo = (2 * math.pi / direcoes_teste) * i
-            distancia_teste = 5  # Começa próximo
-            max_distancia = 200  # Limite de busca
-            
-            # Continua verificando na direção até encontrar terra ou atingir o limite
-            while distancia_teste < max_distancia:
-                pos_x = self.x + math.cos(angulo) * distancia_teste
-                pos_y = self.y + math.sin(angulo) * distancia_teste
-                
-                # Verificar se está dentro dos limites e se é terra
-                if (0 <= pos_x < self.WIDTH and 0 <= pos_y < self.HEIGHT):
-                    terreno = mapa.obter_terreno(pos_x, pos_y)
-                    if terreno.nome != "Água":
-                        # Encontrou terra, verificar se é a mais próxima
-                        if distancia_teste < menor_distancia:
-                            menor_distancia = distancia_teste
-                            melhor_direcao = angulo
-                        break
-                
-                distancia_teste += 20  # Incrementa a distância de busca
-        
-        # Se encontrou terra, move-se nessa direção
-        if melhor_direcao is not None:
-            self.direcao = melhor_direcao
-        else:
-            # Se não encontrou terra, move-se em uma direção aleatória
-            self.direcao = random.uniform(0, 2 * math.pi)
-    
-    def _encontrar_presa(self, criaturas, mapa=None):
+    def _encontrar_presa(self, criaturas, mapa=None, grade_presas=None, motor=None):
         """Encontra uma presa potencial dentro do campo de visão"""
         if not criaturas:
             return None
         
         # Filtrar criaturas que estão dentro do campo de visão
-        presas_proximas = [c for c in criaturas if self._calcular_distancia(c) < self.campo_visao]
+        presas_proximas = self._vizinhos(criaturas, self.campo_visao, grade_presas)
         
         if not presas_proximas:
             return None
             
         # Se tiver mapa e o predador não sabe nadar, filtrar presas que não têm água ou paredes no caminho
         if mapa:
-            presas_seguras = []
-            for presa in presas_proximas:
-                seguro = True
-                
-                # Verificar água no caminho
-                if self.velocidade_nado <= 0 and self._ha_agua_no_caminho(presa.x, presa.y, mapa):
-                    seguro = False
-                
-                # Verificar parede no caminho ou se a presa está perto demais de uma parede
-                if seguro and self._ha_parede_no_caminho(presa.x, presa.y, mapa):
-                    seguro = False
-                    
-                if seguro:
-                    presas_seguras.append(presa)
+            # Sem água (se não sabe nadar) nem parede no caminho, e sem parede perto do alvo
+            presas_seguras = self._caminhos_livres(presas_proximas, mapa, motor)
             
             # Se houver presas seguras, escolhe uma delas
             if presas_seguras:
-                return random.choice(presas_seguras)
+                return self.rng.choice(presas_seguras)
                 
             # Se não houver presas seguras mas o predador estiver com muita fome, pode arriscar
             elif self.energia < self.stamina * 0.2:
                 # 50% de chance de arriscar quando está com muita fome
-                if random.random() < 0.5:
-                    return random.choice(presas_proximas)
+                if self.rng.random() < 0.5:
+                    return self.rng.choice(presas_proximas)
                 return None
             else:
                 return None
         
         # Se não tiver mapa, escolher uma presa aleatória entre as próximas
-        return random.choice(presas_proximas)
+        return self.rng.choice(presas_proximas)
     
     def _perseguir_alvo(self, mapa=None):
         """Direciona o predador em direção ao alvo"""
@@ -246,21 +175,28 @@ class Predador(CriaturaBase):
     
     def _movimento_aleatorio(self):
         """Faz o predador se mover aleatoriamente"""
-        if random.random() < 0.03:  # 3% de chance de mudar de direção
-            self.direcao = random.uniform(0, 2 * math.pi)
+        if self.rng.random() < 0.03:  # 3% de chance de mudar de direção
+            self.direcao = self.rng.uniform(0, 2 * math.pi)
     
-    def _cacar(self, criaturas):
+    def _cacar(self, criaturas, intencoes, grade_presas=None):
         """Tenta capturar e comer uma presa próxima"""
+        # Candidatas: com índice espacial, só as presas ao alcance de contato
+        if grade_presas is not None:
+            candidatas = grade_presas.consultar_raio(self.x, self.y, self.tamanho + grade_presas.maior_tamanho)
+        else:
+            candidatas = criaturas
+        
         # Tentar comer criaturas
-        for i, criatura in enumerate(criaturas):
-            if self._calcular_distancia(criatura) < self.tamanho + criatura.tamanho:
+        for criatura in candidatas:
+            if self._calcular_distancia(criatura) < self.tamanho + criatura.tamanho and intencoes.remover(criatura, self):
                 # Ganhar energia proporcional ao tamanho da criatura
                 ganho_energia = criatura.tamanho * 100 + criatura.energia * 10
                 self.energia += ganho_energia
                 self.energia = min(self.energia, self.stamina)  # Limitar à stamina máxima
                 
-                # Remover a criatura comida
-                criaturas.pop(i)
+                # A criatura comida sai da lista no final do tick; da grade, imediatamente
+                if grade_presas is not None:
+                    grade_presas.remover(criatura)
                 
                 # Resetar alvo
                 self.alvo = None
@@ -269,21 +205,21 @@ class Predador(CriaturaBase):
         
         return False
         
-    def _reproduzir(self, predadores):
+    def _reproduzir(self, predadores, intencoes):
         """Tenta reproduzir se tiver energia suficiente"""
         
         if self.energia > self.custo_reproducao and self.idade > 100:
-            if random.random() < 0.01 * self.tamanho: 
+            if self.rng.random() < 0.01 * self.tamanho: 
                 # Gastar energia para reproduzir
                 self.energia -= self.custo_reproducao
                 self.filhos += 1
                 
                 # Criar filho próximo ao pai
-                offset_x = random.uniform(-20, 20)
-                offset_y = random.uniform(-20, 20)
+                offset_x = self.rng.uniform(-20, 20)
+                offset_y = self.rng.uniform(-20, 20)
                 
                 # 5% de chance de mutação para canibal durante a reprodução
-                if random.random() < 0.05:
+                if self.rng.random() < 0.05:
                     # Importação local para evitar circular import
                     from canibal import Canibal
                     filho = Canibal(
@@ -294,7 +230,8 @@ class Predador(CriaturaBase):
                         tamanho=self.tamanho,
                         velocidade_nado=self.velocidade_nado,
                         WIDTH=self.WIDTH,
-                        HEIGHT=self.HEIGHT
+                        HEIGHT=self.HEIGHT,
+                        rng=self.rng
                     )
                 else:
                     filho = Predador(
@@ -305,20 +242,25 @@ class Predador(CriaturaBase):
                         HEIGHT=self.HEIGHT
                     )
                 
-                predadores.append(filho)
+                intencoes.adicionar(filho, predadores, self)
                 return True
         
         return False
     
-    def _desenhar_corpo(self, superficie, pos_x, pos_y, cor_ajustada):
+    def _desenhar_forma(self, superficie, pos_x, pos_y, cor_ajustada, tamanho=None):
         """Desenha o corpo do predador"""
+        if tamanho is None:
+            tamanho = self.tamanho
+        
         # Desenhar corpo do predador
-        pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(self.tamanho))
+        pygame.draw.circle(superficie, cor_ajustada, (pos_x, pos_y), int(tamanho))
         
         # Desenhar contorno
         cor_contorno = (200, 50, 50)
-        pygame.draw.circle(superficie, cor_contorno, (pos_x, pos_y), int(self.tamanho), 1)
-        
+        pygame.draw.circle(superficie, cor_contorno, (pos_x, pos_y), int(tamanho), 1)
+    
+    def _desenhar_detalhes(self, superficie, pos_x, pos_y):
+        """Olhos e nadadeira, que seguem a direção do movimento"""
         # Desenhar "olhos" na direção do movimento (predadores têm olhos maiores)
         olho_x = pos_x + math.cos(self.direcao) * (self.tamanho * 0.6)
         olho_y = pos_y + math.sin(self.direcao) * (self.tamanho * 0.6)
@@ -355,22 +297,11 @@ class Predador(CriaturaBase):
             
             pygame.draw.polygon(superficie, (0, 100, 200), pontos_nadadeira)
     
-    def desenhar(self, superficie):
-        """Sobrescreve o método de desenho para incluir o campo de visão específico do predador"""
-        # Desenhar campo de visão como um círculo transparente
-        s = pygame.Surface((self.campo_visao*2, self.campo_visao*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (200, 0, 0, 10), (self.campo_visao, self.campo_visao), self.campo_visao)
-        superficie.blit(s, (int(self.x - self.campo_visao), int(self.y - self.campo_visao)))
-        
-        # Ajustar cor baseada na idade (fica mais clara conforme envelhece)
-        idade_rel = min(1.0, self.idade / self.longevidade)
-        cor_ajustada = (
-            min(255, self.cor[0] + int(40 * idade_rel)),
-            min(255, self.cor[1] + int(40 * idade_rel)),
-            min(255, self.cor[2] + int(40 * idade_rel))
-        )
-        
-        # Posição ajustada para efeito de natação
+    def cor_campo_visao(self):
+        return (200, 0, 0, 10)
+    
+    def _posicao_desenho(self, superficie):
+        """Posição do corpo na tela, com a ondulação e o rastro de bolhas de quem está nadando"""
         pos_x = int(self.x)
         pos_y = int(self.y)
         
@@ -389,15 +320,10 @@ class Predador(CriaturaBase):
                 pygame.draw.circle(superficie, (200, 240, 255, 180), (int(bolha_x), int(bolha_y)), 
                                  random.randint(1, max(3, int(self.velocidade_nado * 4))))
         
-        # Desenhar corpo do predador
-        self._desenhar_corpo(superficie, pos_x, pos_y, cor_ajustada)
-        
-        # Desenhar barra de energia
-        max_barra = 20
-        comprimento_barra = max(1, int((self.energia / self.stamina) * max_barra))
-        pygame.draw.rect(superficie, (255, 255, 255), (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5, max_barra, 3))
-        cor_barra = (220, 50, 50)
-        pygame.draw.rect(superficie, cor_barra, (pos_x - max_barra//2, pos_y - int(self.tamanho) - 5, comprimento_barra, 3))
+        return pos_x, pos_y
+    
+    def estado_detalhes(self):
+        return (self.velocidade_nado > 0.5 and self.esta_nadando, round(self.velocidade_nado, 1))
     
     def _obter_cor_barra_energia(self):
         """Retorna a cor da barra de energia"""
@@ -0,0 +1,53 @@
+class RegistroEntidades:
+    """Índice id -> entidade das criaturas vivas, para validar alvos sem percorrer as listas"""
+    def __init__(self, intencoes=None):
+        # id da entidade -> (entidade, lista da simulação em que ela está)
+        self.entidades = {}
+
+        # Remoções ainda não aplicadas às listas também contam como mortes
+        self.intencoes = intencoes
+
+    def adicionar(self, entidade, lista):
+        """Registra uma entidade que entrou na lista"""
+        self.entidades[entidade.id] = (entidade, lista)
+
+    def remover(self, entidade):
+        """Retira a entidade do registro (sem efeito se ela não estiver registrada)"""
+        registro = self.entidades.get(entidade.id)
+        if registro is not None and registro[0] is entidade:
+            del self.entidades[entidade.id]
+
+    def reconstruir(self, *listas):
+        """Reconstrói o registro a partir das listas completas"""
+        self.entidades.clear()
+        for lista in listas:
+            for entidade in lista:
+                self.entidades[entidade.id] = (entidade, lista)
+
+    def sincronizado(self, *listas):
+        """Verifica se o registro tem o mesmo número de entidades das listas (o editor insere direto nelas)"""
+        return len(self.entidades) == sum(len(lista) for lista in listas)
+
+    def aplicar(self, intencoes):
+        """Atualiza o registro com os nascimentos e mortes do tick (antes de Intencoes.aplicar)"""
+        for objeto in intencoes.removidos.values():
+            if hasattr(objeto, 'id'):
+                self.remover(objeto)
+        for objeto, lista in intencoes.nascimentos:
+            self.adicionar(objeto, lista)
+
+    def obter(self, id_entidade, lista=None):
+        """Retorna a entidade viva com esse id (opcionalmente só se estiver na lista dada), ou None"""
+        registro = self.entidades.get(id_entidade)
+        if registro is None:
+            return None
+
+        entidade, lista_entidade = registro
+        if lista is not None and lista_entidade is not lista:
+            return None
+        if self.intencoes is not None and self.intencoes.removido(entidade):
+            return None
+        return entidade
+
+    def __len__(self):
+        return len(self.entidades)
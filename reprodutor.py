@@ -0,0 +1,187 @@
+"""
+Reprodutor de diários de eventos (gravados com `python -m simulacao --eventos ARQUIVO` ou com
+F6 na interface): desenha qualquer momento da execução a partir do quadro-chave anterior e
+dos eventos seguintes, sem rodar a IA das criaturas.
+
+Uso:
+    python reprodutor.py eventos.simlog
+    python reprodutor.py eventos.simlog --resumo
+    python reprodutor.py eventos.simlog --tick 1500 --imagem quadro.png
+
+Controles: ESPAÇO pausa, ←/→ voltam/avançam um tick (com SHIFT, um quadro-chave), ↑/↓ mudam
+a velocidade, HOME/END vão ao início/fim, clicar na barra inferior salta para aquele tick.
+"""
+import argparse
+import os
+import sys
+from collections import Counter
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from alimento import Alimento
+from textos import fonte
+from diario_eventos import (LeitorDiario, ESPECIES, CAUSAS, NASCIMENTO, MORTE, PREDACAO, REFEICAO,
+                            ALIMENTO, QUADRO_CHAVE)
+
+# Contorno de cada espécie (presa, predador, canibal)
+CONTORNOS = ((255, 255, 255), (0, 0, 0), (255, 0, 0))
+
+ALTURA_BARRA = 24
+
+
+class Reprodutor:
+    """Desenha o estado reconstruído de um tick do diário"""
+    def __init__(self, leitor):
+        self.leitor = leitor
+        self.mapa = leitor.criar_mapa()
+        self.tick = float(leitor.tick_inicial)
+        self.velocidade = 1.0
+        self.pausa = False
+        self.ticks_por_segundo = 60
+
+    def desenhar(self, superficie):
+        leitor = self.leitor
+        tick = int(self.tick)
+        entidades, alimentos = leitor.estado_em(tick)
+
+        self.mapa.desenhar(superficie)
+        for (x, y), valor in alimentos.items():
+            Alimento(x, y, valor).desenhar(superficie)
+
+        nascimentos = leitor.nascimentos
+        contagem = [0, 0, 0]
+        for id_entidade, (x, y) in entidades.items():
+            registro = nascimentos.get(id_entidade)
+            if registro is None:
+                especie, tamanho, cor = 0, 5, (150, 150, 150)
+            else:
+                especie, tamanho, cor = registro[4], registro[10], registro[12:15]
+            contagem[especie] += 1
+            centro = (int(x), int(y))
+            pygame.draw.circle(superficie, cor, centro, int(tamanho))
+            pygame.draw.circle(superficie, CONTORNOS[especie], centro, int(tamanho), 1)
+
+        # Texto com o tick e as populações
+        estado = "pausado" if self.pausa else f"{self.velocidade:g}x"
+        texto = (f"tick {tick}/{leitor.tick_final}  {estado}  presas {contagem[0]}  "
+                 f"predadores {contagem[1]}  canibais {contagem[2]}  alimentos {len(alimentos)}")
+        # Muda a cada quadro: renderizado direto, sem passar pelo cache de textos
+        superficie.blit(fonte("Arial", 16).render(texto, True, (255, 255, 255), (0, 0, 0)), (10, 10))
+
+        # Barra do tempo, com a posição atual
+        altura = superficie.get_height()
+        largura = superficie.get_width()
+        pygame.draw.rect(superficie, (30, 30, 30), (0, altura - ALTURA_BARRA, largura, ALTURA_BARRA))
+        duracao = max(1, leitor.tick_final - leitor.tick_inicial)
+        x = int((tick - leitor.tick_inicial) / duracao * (largura - 1))
+        pygame.draw.rect(superficie, (90, 160, 255), (0, altura - ALTURA_BARRA + 8, x, ALTURA_BARRA - 16))
+        pygame.draw.line(superficie, (255, 255, 255), (x, altura - ALTURA_BARRA), (x, altura - 1), 2)
+
+    def avancar(self, dt):
+        """Anda o tempo de reprodução"""
+        if not self.pausa:
+            self.ir_para(self.tick + self.velocidade * self.ticks_por_segundo * dt)
+
+    def ir_para(self, tick):
+        leitor = self.leitor
+        self.tick = max(float(leitor.tick_inicial), min(float(leitor.tick_final), tick))
+
+    def processar_eventos(self, evento, largura):
+        leitor = self.leitor
+        if evento.type == pygame.KEYDOWN:
+            passo = leitor.cabecalho['intervalo_quadro_chave'] if evento.mod & pygame.KMOD_SHIFT else 1
+            if evento.key == pygame.K_SPACE:
+                self.pausa = not self.pausa
+            elif evento.key == pygame.K_RIGHT:
+                self.ir_para(int(self.tick) + passo)
+            elif evento.key == pygame.K_LEFT:
+                self.ir_para(int(self.tick) - passo)
+            elif evento.key == pygame.K_UP:
+                self.velocidade = min(64.0, self.velocidade * 2)
+            elif evento.key == pygame.K_DOWN:
+                self.velocidade = max(0.125, self.velocidade / 2)
+            elif evento.key == pygame.K_HOME:
+                self.ir_para(leitor.tick_inicial)
+            elif evento.key == pygame.K_END:
+                self.ir_para(leitor.tick_final)
+        elif evento.type == pygame.MOUSEBUTTONDOWN and evento.button == 1:
+            altura = pygame.display.get_surface().get_height()
+            if evento.pos[1] >= altura - ALTURA_BARRA:
+                fracao = evento.pos[0] / max(1, largura - 1)
+                self.ir_para(leitor.tick_inicial + fracao * (leitor.tick_final - leitor.tick_inicial))
+
+
+def resumir(leitor):
+    """Imprime as contagens de eventos, as causas de morte e os maiores predadores"""
+    nomes = {NASCIMENTO: 'nascimentos', MORTE: 'mortes', PREDACAO: 'predações', REFEICAO: 'refeições',
+             ALIMENTO: 'alimentos surgidos', QUADRO_CHAVE: 'quadros-chave'}
+    print(f"ticks {leitor.tick_inicial}-{leitor.tick_final}")
+    for tipo, nome in nomes.items():
+        print(f"{nome:<20} {leitor.contagens[tipo]:>8}")
+
+    nascimentos = leitor.nascimentos
+    mortes = Counter((ESPECIES[nascimentos[i][4]] if i in nascimentos else '?', CAUSAS[registro[3]])
+                     for i, registro in leitor.mortes.items())
+    print("\nmortes por espécie e causa")
+    for (especie, causa), n in sorted(mortes.items()):
+        print(f"  {especie:<10} {causa:<10} {n:>8}")
+
+    abates = Counter(registro[2] for registro in leitor.predacoes)
+    if abates:
+        print("\npredadores com mais abates")
+        for id_predador, n in abates.most_common(5):
+            especie = ESPECIES[nascimentos[id_predador][4]] if id_predador in nascimentos else '?'
+            print(f"  #{id_predador:<8} {especie:<10} {n:>5}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Revê uma execução a partir do diário de eventos")
+    parser.add_argument('diario', help="arquivo gravado com --eventos ou F6")
+    parser.add_argument('--resumo', action='store_true', help="só imprime o resumo dos eventos")
+    parser.add_argument('--tick', type=int, help="tick inicial (com --imagem, o tick desenhado)")
+    parser.add_argument('--imagem', help="desenha o tick nesta imagem e sai, sem abrir a janela")
+    args = parser.parse_args(argv)
+
+    leitor = LeitorDiario(args.diario)
+    if args.resumo:
+        resumir(leitor)
+        return 0
+
+    if args.imagem:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    tela = pygame.display.set_mode((leitor.largura, leitor.altura))
+    pygame.display.set_caption(f"Reprodutor - {os.path.basename(args.diario)}")
+    reprodutor = Reprodutor(leitor)
+    if args.tick is not None:
+        reprodutor.ir_para(args.tick)
+
+    if args.imagem:
+        reprodutor.pausa = True
+        reprodutor.desenhar(tela)
+        pygame.image.save(tela, args.imagem)
+        pygame.quit()
+        return 0
+
+    relogio = pygame.time.Clock()
+    rodando = True
+    while rodando:
+        dt = relogio.tick(60) / 1000.0
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+                rodando = False
+            else:
+                reprodutor.processar_eventos(evento, leitor.largura)
+        reprodutor.avancar(dt)
+        reprodutor.desenhar(tela)
+        pygame.display.flip()
+
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
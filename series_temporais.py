@@ -0,0 +1,246 @@
+"""
+Séries temporais da simulação em memória fixa: um buffer circular por nível de resolução.
+O nível 0 guarda os últimos ticks um a um; cada nível seguinte guarda médias de `fator`
+pontos do anterior, com a mesma capacidade, então cobre um período `fator` vezes maior.
+Com 4 níveis de 10 000 pontos e fator 10, uma execução de dez milhões de ticks cabe em
+cerca de 1,8 MB (ticks em 8 bytes e valores em 4).
+"""
+import bisect
+from array import array
+
+import pygame
+
+from textos import fonte, renderizar
+
+# Métricas registradas a cada tick (médias dos atributos das presas)
+METRICAS = ('presas', 'predadores', 'canibais', 'alimentos',
+            'velocidade', 'stamina', 'tamanho', 'velocidade_nado', 'idade')
+
+
+class NivelSerie:
+    """Buffer circular de pontos (tick e um valor por métrica) de uma resolução"""
+    def __init__(self, capacidade, n_metricas, fator, resolucao):
+        self.capacidade = capacidade
+        # Pontos do nível anterior por ponto deste e ticks por ponto
+        self.fator = fator
+        self.resolucao = resolucao
+        self.ticks = array('d', bytes(8 * capacidade))
+        self.valores = [array('f', bytes(4 * capacidade)) for _ in range(n_metricas)]
+        self.inicio = 0
+        self.n = 0
+
+        # Pontos do nível anterior ainda não agrupados neste (soma do tick e de cada métrica)
+        self.acumulado = [0.0] * (n_metricas + 1)
+        self.n_acumulado = 0
+
+    def adicionar(self, tick, valores):
+        if self.n < self.capacidade:
+            posicao = (self.inicio + self.n) % self.capacidade
+            self.n += 1
+        else:
+            # Cheio: sobrescreve o ponto mais antigo
+            posicao = self.inicio
+            self.inicio = (self.inicio + 1) % self.capacidade
+        self.ticks[posicao] = tick
+        for coluna, valor in zip(self.valores, valores):
+            coluna[posicao] = valor
+
+    def acumular(self, tick, valores):
+        """Soma um ponto do nível anterior; retorna a média quando `fator` pontos foram somados"""
+        acumulado = self.acumulado
+        acumulado[0] += tick
+        for i, valor in enumerate(valores, 1):
+            acumulado[i] += valor
+        self.n_acumulado += 1
+        if self.n_acumulado < self.fator:
+            return None
+
+        medias = [soma / self.fator for soma in acumulado]
+        self.acumulado = [0.0] * len(acumulado)
+        self.n_acumulado = 0
+        self.adicionar(medias[0], medias[1:])
+        return medias
+
+    def tick_mais_antigo(self):
+        return self.ticks[self.inicio] if self.n else None
+
+    def _cronologico(self, dados):
+        """Conteúdo do buffer do mais antigo ao mais novo"""
+        fim = self.inicio + self.n
+        if fim <= self.capacidade:
+            return dados[self.inicio:fim]
+        return dados[self.inicio:] + dados[:fim - self.capacidade]
+
+    def pontos(self, coluna, desde=None):
+        """Ticks e valores (arrays) em ordem cronológica, a partir do tick `desde`"""
+        ticks = self._cronologico(self.ticks)
+        valores = self._cronologico(self.valores[coluna])
+        if desde is not None:
+            i = bisect.bisect_left(ticks, desde)
+            ticks = ticks[i:]
+            valores = valores[i:]
+        return ticks, valores
+
+
+class SerieTemporal:
+    """Métricas por tick em vários níveis de resolução, com memória limitada"""
+    def __init__(self, metricas=METRICAS, capacidade=10000, niveis=4, fator=10):
+        self.metricas = metricas
+        self.indices = {nome: i for i, nome in enumerate(metricas)}
+        self.capacidade = capacidade
+        self.n_niveis = niveis
+        self.fator = fator
+        self.limpar()
+
+    def limpar(self):
+        """Descarta todo o histórico"""
+        self.niveis = [NivelSerie(self.capacidade, len(self.metricas), self.fator if i else 1, self.fator ** i)
+                       for i in range(self.n_niveis)]
+        self.primeiro_tick = None
+
+        # Incrementada a cada ponto novo (o painel só redesenha quando ela muda)
+        self.versao = 0
+
+    def registrar(self, tick, valores):
+        """Registra os valores das métricas (na ordem de `metricas`) de um tick"""
+        if self.primeiro_tick is None:
+            self.primeiro_tick = tick
+        self.niveis[0].adicionar(tick, valores)
+
+        # Cada nível agrupa `fator` pontos do anterior
+        for nivel in self.niveis[1:]:
+            medias = nivel.acumular(tick, valores)
+            if medias is None:
+                break
+            tick, valores = medias[0], medias[1:]
+        self.versao += 1
+
+    def ultimo(self, nome):
+        """Valor mais recente da métrica (None sem pontos)"""
+        nivel = self.niveis[0]
+        if not nivel.n:
+            return None
+        return nivel.valores[self.indices[nome]][(nivel.inicio + nivel.n - 1) % nivel.capacidade]
+
+    def pontos(self, nome, desde=None, maximo=None):
+        """Ticks e valores da métrica desde o tick `desde` (padrão: o início), no nível mais fino que
+        ainda cobre esse período com no máximo `maximo` pontos (os níveis mais grossos ficam até
+        `fator` - 1 ticks atrás do mais recente)"""
+        if desde is None:
+            desde = self.primeiro_tick
+        if desde is None:
+            return array('d'), array('f')
+        coluna = self.indices[nome]
+        ultimo_tick = self.niveis[0].ticks[(self.niveis[0].inicio + self.niveis[0].n - 1) % self.capacidade]
+        for nivel in self.niveis:
+            mais_antigo = nivel.tick_mais_antigo()
+            if mais_antigo is None or mais_antigo > desde + nivel.resolucao:
+                continue
+            if maximo is None or (ultimo_tick - desde) / nivel.resolucao <= maximo:
+                return nivel.pontos(coluna, desde)
+        # Nenhum nível cobre o período inteiro: o mais grosso tem o histórico mais longo
+        for nivel in reversed(self.niveis):
+            if nivel.n:
+                return nivel.pontos(coluna, desde)
+        return array('d'), array('f')
+
+    def memoria(self):
+        """Bytes ocupados pelos buffers"""
+        return sum(nivel.ticks.itemsize * len(nivel.ticks) +
+                   sum(coluna.itemsize * len(coluna) for coluna in nivel.valores) for nivel in self.niveis)
+
+
+# Cores das linhas do painel
+CORES_POPULACAO = {'presas': (80, 200, 255), 'predadores': (255, 90, 90), 'canibais': (220, 60, 220),
+                   'alimentos': (120, 230, 90)}
+CORES_ATRIBUTOS = {'velocidade': (255, 210, 80), 'stamina': (120, 230, 180), 'tamanho': (200, 160, 255),
+                   'velocidade_nado': (90, 170, 255), 'idade': (230, 230, 230)}
+
+
+class PainelGraficos:
+    """Gráficos da população e dos atributos médios das presas, desenhados numa Surface em cache"""
+    def __init__(self, serie, largura=330, altura_grafico=110):
+        self.serie = serie
+        self.largura = largura
+        self.altura_grafico = altura_grafico
+        self.ativo = False
+        self._superficie = None
+        self._versao = None
+        self._quadros_desde_desenho = 0
+
+        # A Surface é refeita só com pontos novos e no máximo a cada `intervalo` quadros
+        self.intervalo = 10
+
+    def alternar(self):
+        """Mostra ou esconde o painel"""
+        self.ativo = not self.ativo
+        self._superficie = None
+
+    def _linha(self, superficie, area, ticks, valores, minimo, maximo, cor):
+        """Desenha uma série na área, com no máximo um ponto por pixel de largura"""
+        if len(ticks) < 2:
+            return
+        passo = max(1, len(ticks) // area.width)
+        ticks = ticks[::passo]
+        valores = valores[::passo]
+        t0, t1 = ticks[0], ticks[-1]
+        escala_x = (area.width - 1) / ((t1 - t0) or 1)
+        escala_y = (area.height - 1) / ((maximo - minimo) or 1)
+        pontos = [(area.left + (t - t0) * escala_x, area.bottom - 1 - (v - minimo) * escala_y)
+                  for t, v in zip(ticks, valores)]
+        pygame.draw.lines(superficie, cor, False, pontos)
+
+    def _grafico(self, superficie, y, titulo, cores, normalizar):
+        """Um gráfico com a legenda dos valores atuais; retorna a altura usada"""
+        serie = self.serie
+        altura_texto = fonte("monospace", 12).get_linesize()
+        superficie.blit(renderizar(titulo, "monospace", 12, (230, 230, 230)), (8, y))
+        y += altura_texto
+
+        area = pygame.Rect(8, y, self.largura - 16, self.altura_grafico)
+        pygame.draw.rect(superficie, (60, 60, 60), area, 1)
+
+        dados = {nome: serie.pontos(nome, maximo=4 * area.width) for nome in cores}
+        if not normalizar:
+            # Populações na mesma escala, a partir de zero
+            maximo = max((max(valores) for _, valores in dados.values() if valores), default=1)
+        for nome, (ticks, valores) in dados.items():
+            if normalizar and valores:
+                # Cada atributo na sua própria escala (o que importa é a tendência)
+                self._linha(superficie, area, ticks, valores, min(valores), max(valores), cores[nome])
+            else:
+                self._linha(superficie, area, ticks, valores, 0, maximo, cores[nome])
+        y = area.bottom + 2
+
+        # Legenda: nome e valor atual de cada métrica
+        x = 8
+        for nome, cor in cores.items():
+            valor = serie.ultimo(nome)
+            texto = f"{nome} {valor:.4g}" if valor is not None else nome
+            # Os valores mudam a cada redesenho: renderizados direto, sem passar pelo cache
+            imagem = fonte("monospace", 12).render(texto, True, cor)
+            if x + imagem.get_width() > self.largura - 8:
+                x = 8
+                y += altura_texto
+            superficie.blit(imagem, (x, y))
+            x += imagem.get_width() + 10
+        return y + altura_texto + 6
+
+    def _renderizar(self):
+        altura = 2 * (self.altura_grafico + 4 * fonte("monospace", 12).get_linesize() + 6)
+        superficie = pygame.Surface((self.largura, altura), pygame.SRCALPHA)
+        superficie.fill((0, 0, 0, 180))
+        y = 6
+        y = self._grafico(superficie, y, "população", CORES_POPULACAO, False)
+        y = self._grafico(superficie, y, "atributos médios das presas", CORES_ATRIBUTOS, True)
+        self._superficie = superficie.subsurface((0, 0, self.largura, min(altura, y)))
+        self._versao = self.serie.versao
+        self._quadros_desde_desenho = 0
+
+    def desenhar(self, superficie, posicao=(10, 10)):
+        """Desenha o painel (refazendo o cache se houver pontos novos)"""
+        self._quadros_desde_desenho += 1
+        if self._superficie is None or (self._versao != self.serie.versao and
+                                        self._quadros_desde_desenho >= self.intervalo):
+            self._renderizar()
+        superficie.blit(self._superficie, posicao)
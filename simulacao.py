@@ -1,19 +1,42 @@
+import os
+import sys
+import json
+import argparse
+
+if __name__ == "__main__":
+    # Execução pela linha de comando: não misturar a mensagem do pygame com a saída JSON
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
 import pygame
 import random
-import math
+import time
+from criatura_base import CriaturaBase
 from criatura import Criatura
 from predador import Predador
 from canibal import Canibal
 from alimento import Alimento
 from mapa import Mapa
 from efeito_visual import EfeitoVisual
-from editor_tools import EditorTools
-from touch_controls import TouchControls
+from grade_espacial import GradeEspacial
+from camada_visao import CamadaVisao
+from sprites import CacheSprites
+from textos import renderizar
+from intencoes import Intencoes
+from registro import RegistroEntidades
+from agregados import AgregadosPopulacao
+from series_temporais import SerieTemporal, PainelGraficos
+from perfilador import Perfilador
+
+# Snapshot salvo com F5 e carregado com F9
+ARQUIVO_SNAPSHOT_RAPIDO = "simulacao.snap"
 
 class Simulacao:
-    def __init__(self, WIDTH=800, HEIGHT=600):
+    def __init__(self, WIDTH=800, HEIGHT=600, headless=False):
         self.WIDTH = WIDTH
         self.HEIGHT = HEIGHT
+        
+        # Sem interface: nada é desenhado (não cria fontes, efeitos, editor nem controles)
+        self.headless = headless
         self.criaturas = []
         self.predadores = []
         self.alimentos = []
@@ -30,16 +53,64 @@ class Simulacao:
             'canibais_ativos': 0
         }
         self.tempo = 0
-        self.fonte = pygame.font.SysFont("Arial", 16)
-        self.fonte_titulo = pygame.font.SysFont("Arial", 24)
-        self.fonte_grande = pygame.font.SysFont("Arial", 32)
         self.pausa = False
         self.aceleracao = 1
+        self._fundo_estatisticas = None
+        
+        # Laço de passo fixo (avancar): ticks por segundo de tempo real na aceleração 1, tempo de
+        # processamento reservado à simulação em cada quadro e maior dt aceito de uma vez
+        self.ticks_por_segundo = 60
+        self.orcamento_quadro = 1.0 / 60.0
+        self.dt_maximo = 0.25
+        self.velocidade_maxima = False
+        self._acumulador = 0.0
         self.mapa = None
+        
+        # Gerador aleatório da simulação (recriado com a semente em inicializar); os efeitos
+        # visuais e a decoração das paredes usam o módulo random global, então desenhar mais ou
+        # menos quadros não altera o resultado
+        self.rng = random.Random()
+        self.seed = None
         self.taxa_alimento = 0.5  # Taxa padrão de geração de alimentos
         
         # Sistema de efeitos visuais
-        self.efeitos = EfeitoVisual()
+        self.efeitos = EfeitoVisual(ativo=not headless)
+        
+        # Campos de visão (desligados automaticamente em populações grandes)
+        self.camada_visao = CamadaVisao()
+        
+        # Corpos e barras de energia pré-renderizados
+        self.sprites = CacheSprites()
+        
+        # Índices espaciais para consultas de vizinhança (reconstruídos a cada tick)
+        self.indice_espacial = True
+        self.grade_presas = GradeEspacial(WIDTH, HEIGHT)
+        self.grade_predadores = GradeEspacial(WIDTH, HEIGHT)
+        
+        # Alimentos não se movem, então as consultas dispensam a margem
+        self.grade_alimentos = GradeEspacial(WIDTH, HEIGHT, margem=0)
+        
+        # Mortes, nascimentos e alimentos comidos durante o tick (aplicados no final dele)
+        self.intencoes = Intencoes()
+        
+        # Entidades vivas por id (validação de alvos em O(1))
+        self.registro = RegistroEntidades(self.intencoes)
+        
+        # Somas dos atributos por espécie, mantidas a cada nascimento e morte (estatísticas em O(1))
+        self.agregados = AgregadosPopulacao()
+        
+        # Histórico das populações e dos atributos médios (memória fixa) e o painel de gráficos (G)
+        self.series = SerieTemporal()
+        self.painel_graficos = PainelGraficos(self.series)
+        
+        # Motor vetorizado (NumPy) para as fases físicas do tick; desligado por padrão
+        self.motor = None
+        
+        # Tempos de cada fase do tick e do desenho (F3: painel, F4: gravar trace)
+        self.perfilador = Perfilador()
+        
+        # Diário de eventos para rever a execução depois (F6 ou iniciar_diario); desligado por padrão
+        self.diario = None
         
         # Sistema de fim de jogo e estatísticas
         self.jogo_finalizado = False
@@ -68,6 +139,7 @@ class Simulacao:
                 'n_alimentos': 40,
                 'taxa_alimento': 10, 
                 'modo_atributos': 'aleatorio',  # 'padrao' ou 'aleatorio'
+                'seed': None,  # Semente do gerador aleatório (None = não reprodutível)
                 
                 # Porcentagens de terrenos (total deve ser 100%)
                 'terrenos': {
@@ -85,8 +157,15 @@ class Simulacao:
         # Limpar efeitos visuais
         self.efeitos.limpar()
         
+        # O diário de eventos descreve uma única execução
+        self.parar_diario()
+        
+        # Mesma semente e configuração produzem a mesma simulação (sem semente: aleatória)
+        self.seed = configuracoes.get('seed')
+        self.rng = random.Random(self.seed)
+        
         # Criar e inicializar o mapa
-        self.mapa = Mapa(self.WIDTH, self.HEIGHT)
+        self.mapa = Mapa(self.WIDTH, self.HEIGHT, rng=self.rng)
         
         # Compartilhar referência para a simulação com o mapa
         # (permite que o mapa acesse o sistema de efeitos para feedback visual)
@@ -127,14 +206,15 @@ class Simulacao:
                     comunicacao=atributos_padrao['comunicacao'],
                     velocidade_nado=atributos_padrao['velocidade_nado'],
                     WIDTH=self.WIDTH,
-                    HEIGHT=self.HEIGHT
+                    HEIGHT=self.HEIGHT,
+                    rng=self.rng
                 )
                 # Tentar colocar em posição válida
                 for _ in range(10):  # Tentar algumas vezes
                     if not self.mapa.verificar_colisao_paredes(criatura):
                         break
-                    criatura.x = random.randint(50, self.WIDTH - 50)
-                    criatura.y = random.randint(50, self.HEIGHT - 50)
+                    criatura.x = self.rng.randint(50, self.WIDTH - 50)
+                    criatura.y = self.rng.randint(50, self.HEIGHT - 50)
             else:
                 # Modo aleatório: criar entidade em posição válida
                 criatura = self._criar_entidade_em_posicao_valida(Criatura)
@@ -151,14 +231,15 @@ class Simulacao:
                     tamanho=atributos_padrao['tamanho'] * 1.2,
                     velocidade_nado=atributos_padrao['velocidade_nado'],
                     WIDTH=self.WIDTH,
-                    HEIGHT=self.HEIGHT
+                    HEIGHT=self.HEIGHT,
+                    rng=self.rng
                 )
                 # Tentar colocar em posição válida
                 for _ in range(10):  # Tentar algumas vezes
                     if not self.mapa.verificar_colisao_paredes(predador):
                         break
-                    predador.x = random.randint(50, self.WIDTH - 50)
-                    predador.y = random.randint(50, self.HEIGHT - 50)
+                    predador.x = self.rng.randint(50, self.WIDTH - 50)
+                    predador.y = self.rng.randint(50, self.HEIGHT - 50)
             else:
                 predador = self._criar_entidade_em_posicao_valida(Predador)
                 
@@ -173,14 +254,15 @@ class Simulacao:
                     tamanho=atributos_padrao['tamanho'] * 1.3,
                     velocidade_nado=atributos_padrao['velocidade_nado'],
                     WIDTH=self.WIDTH,
-                    HEIGHT=self.HEIGHT
+                    HEIGHT=self.HEIGHT,
+                    rng=self.rng
                 )
                 # Tentar colocar em posição válida
                 for _ in range(10):  # Tentar algumas vezes
                     if not self.mapa.verificar_colisao_paredes(canibal):
                         break
-                    canibal.x = random.randint(50, self.WIDTH - 50)
-                    canibal.y = random.randint(50, self.HEIGHT - 50)
+                    canibal.x = self.rng.randint(50, self.WIDTH - 50)
+                    canibal.y = self.rng.randint(50, self.HEIGHT - 50)
             else:
                 canibal = self._criar_entidade_em_posicao_valida(Canibal)
                 
@@ -193,21 +275,29 @@ class Simulacao:
             if alimento:
                 self.alimentos.append(alimento)
         
+        # Resetar tempo e efeitos
+        self.tempo = 0
+        self._acumulador = 0.0
+        
         # Definir estatísticas iniciais
+        self.agregados.recalcular(self.tempo, self.criaturas, self.predadores)
+        self.series.limpar()
         self.estatisticas['populacao'] = len(self.criaturas)
         self.estatisticas['populacao_pico'] = len(self.criaturas)
         self.estatisticas['total_criaturas'] = len(self.criaturas)
-        self.estatisticas['predadores_ativos'] = sum(1 for p in self.predadores if not isinstance(p, Canibal))
-        self.estatisticas['canibais_ativos'] = sum(1 for p in self.predadores if isinstance(p, Canibal))
-        
-        # Resetar tempo e efeitos
-        self.tempo = 0
+        self.estatisticas['predadores_ativos'] = self.agregados.contagem(Predador)
+        self.estatisticas['canibais_ativos'] = self.agregados.contagem(Canibal)
         
         # Resetar sistema de fim de jogo
         self.jogo_finalizado = False
         self.vencedor = None
         
+        # Sem interface não há editor nem controles de toque
+        if self.headless:
+            return
+        
         # Inicializar ferramentas de edição se ainda não existirem
+        from editor_tools import EditorTools
         if self.editor is None:
             self.editor = EditorTools(self, self.WIDTH, self.HEIGHT)
             
@@ -223,7 +313,7 @@ class Simulacao:
         
         while tentativas < max_tentativas:
             # Cria a entidade com posição aleatória
-            entidade = classe_entidade(WIDTH=self.WIDTH, HEIGHT=self.HEIGHT)
+            entidade = classe_entidade(WIDTH=self.WIDTH, HEIGHT=self.HEIGHT, rng=self.rng)
             
             # Verifica se colide com alguma parede
             if not self.mapa.verificar_colisao_paredes(entidade):
@@ -233,7 +323,7 @@ class Simulacao:
         
         # Se não conseguir após muitas tentativas, cria em uma posição fixa segura
         # (centro da tela)
-        entidade = classe_entidade(x=self.WIDTH/2, y=self.HEIGHT/2, WIDTH=self.WIDTH, HEIGHT=self.HEIGHT)
+        entidade = classe_entidade(x=self.WIDTH/2, y=self.HEIGHT/2, WIDTH=self.WIDTH, HEIGHT=self.HEIGHT, rng=self.rng)
         return entidade
     
     def _criar_alimento_em_posicao_valida(self):
@@ -243,14 +333,10 @@ class Simulacao:
         
         while tentativas < max_tentativas:
             # Cria o alimento com posição aleatória
-            alimento = Alimento(WIDTH=self.WIDTH, HEIGHT=self.HEIGHT)
+            alimento = Alimento(WIDTH=self.WIDTH, HEIGHT=self.HEIGHT, rng=self.rng)
             
             # Verifica se colide com alguma parede (alimentos são menores que criaturas)
-            colide = False
-            for parede in self.mapa.paredes:
-                if parede.colidir(alimento.x, alimento.y, alimento.tamanho):
-                    colide = True
-                    break
+            colide = self.mapa.perto_de_parede(alimento.x, alimento.y, alimento.tamanho)
             
             if not colide:
                 return alimento
@@ -261,6 +347,27 @@ class Simulacao:
         return None
     
     def atualizar(self, dt=1.0/60.0, mouse_pos=None):
+        """Um quadro com passo variável: interface, efeitos e `aceleracao` ticks (execução sem interface e benchmarks)"""
+        self.atualizar_interface(dt, mouse_pos)
+        
+        if self.pausa or self.jogo_finalizado:
+            return
+        
+        self._atualizar_efeitos()
+        
+        # Executar múltiplas atualizações se a aceleração for maior que 1
+        for _ in range(self.aceleracao):
+            self.passo()
+            if self.jogo_finalizado:
+                break
+        
+        self._atualizar_estatisticas_perfiladas()
+    
+    def atualizar_interface(self, dt, mouse_pos=None):
+        """Atualiza editor e controles de toque (a cada quadro, mesmo com a simulação pausada)"""
+        perfilador = self.perfilador
+        t = perfilador.inicio()
+        
         # Atualizar as ferramentas de edição
         if self.editor:
             self.editor.atualizar(dt)
@@ -268,113 +375,324 @@ class Simulacao:
         # Atualizar controles sensíveis ao toque
         if self.touch_controls and mouse_pos:
             self.touch_controls.update(mouse_pos)
-            
+        perfilador.fim('atualizar.interface', t)
+    
+    def avancar(self, dt, orcamento=None):
+        """Avança a simulação em passo fixo pelo tempo real `dt` (s); retorna quantos ticks executou
+        
+        Os ticks param quando o orçamento de processamento do quadro (s) acaba, para que a
+        entrada e o desenho continuem responsivos; o atraso que não coube é descartado.
+        Em velocidade máxima executa quantos ticks couberem no orçamento."""
         if self.pausa or self.jogo_finalizado:
-            return
+            self._acumulador = 0.0
+            return 0
         
-        self.tempo += 1
+        self._atualizar_efeitos()
         
-        # Atualizar efeitos visuais
-        self.efeitos.atualizar()
+        if orcamento is None:
+            orcamento = self.orcamento_quadro
+        limite = time.perf_counter() + orcamento
         
-        # Executar múltiplas atualizações se a aceleração for maior que 1
-        for _ in range(self.aceleracao):
-            # Atualizar criaturas
-            i = 0
-            while i < len(self.criaturas):
-                criatura_antiga = self.criaturas[i].copy() if hasattr(self.criaturas[i], 'copy') else None
-                
-                if self.criaturas[i].atualizar(self.alimentos, self.criaturas, self.predadores, self.mapa):
-                    # Verificar se a criatura foi alertada por outra (para efeito visual)
-                    if criatura_antiga and not criatura_antiga.alertada and self.criaturas[i].alertada:
-                        self.efeitos.adicionar_onda(
-                            self.criaturas[i].x, 
-                            self.criaturas[i].y, 
-                            (255, 255, 0, 50),  # Amarelo translúcido
-                            raio_max=self.criaturas[i].campo_visao
-                        )
-                    
-                    i += 1
-                else:
-                    # Criatura morreu
-                    # Adicionar efeito de partículas na morte
-                    self.efeitos.adicionar_particulas(
-                        self.criaturas[i].x,
-                        self.criaturas[i].y,
-                        (150, 150, 150, 200),  # Cinza translúcido
-                        num_particulas=15
-                    )
-                    
-                    self.criaturas.pop(i)
-            
-            # Atualizar predadores
-            i = 0
-            while i < len(self.predadores):
-                predador_antigo = self.predadores[i].copy() if hasattr(self.predadores[i], 'copy') else None
-                
-                # Verificar se é um canibal
-                if isinstance(self.predadores[i], Canibal):
-                    if self.predadores[i].atualizar(self.criaturas, self.predadores, self.mapa):
-                        # Verificar se capturou presa (para efeito visual)
-                        if predador_antigo and self.predadores[i].alvo != predador_antigo.alvo:
-                            self.efeitos.adicionar_flash(
-                                self.predadores[i].x,
-                                self.predadores[i].y,
-                                (255, 0, 0, 100)  # Vermelho translúcido
-                            )
-                        
-                        i += 1
-                    else:
-                        # Predador morreu
-                        self.efeitos.adicionar_particulas(
-                            self.predadores[i].x,
-                            self.predadores[i].y,
-                            (200, 0, 0, 200),  # Vermelho translúcido
-                            num_particulas=20
-                        )
-                        
-                        self.predadores.pop(i)
-                else:
-                    # Predador normal
-                    if self.predadores[i].atualizar(self.criaturas, self.predadores, self.mapa):
-                        i += 1
-                    else:
-                        # Predador morreu
-                        self.efeitos.adicionar_particulas(
-                            self.predadores[i].x,
-                            self.predadores[i].y,
-                            (180, 0, 0, 180),  # Vermelho translúcido
-                            num_particulas=15
-                        )
-                        
-                        self.predadores.pop(i)
-            
-            # Adicionar alimento com base na taxa configurada
-            # (convertida de porcentagem por segundo para chance por frame)
-            # Aumentada em 5x para ter muito mais alimentos
-            chance_por_frame = self.taxa_alimento 
-            
-            # Aumentar também o limite máximo de alimentos
-            if random.random() < chance_por_frame and len(self.alimentos) < 300:
-                novo_alimento = self._criar_alimento_em_posicao_valida()
-                if novo_alimento:
-                    self.alimentos.append(novo_alimento)
-                    
-                    # Efeito visual para novo alimento
-                    self.efeitos.adicionar_particulas(
-                        novo_alimento.x,
-                        novo_alimento.y,
-                        (100, 255, 100, 150),  # Verde claro translúcido
-                        num_particulas=5,
-                        velocidade=0.8,
-                        tamanho=1.5
-                    )
-            
-            # Verificar condições de fim de jogo
-            self._verificar_fim_de_jogo()
-        
-        # Atualizar estatísticas
+        if self.velocidade_maxima:
+            self._acumulador = 0.0
+            ticks = 0
+            while True:
+                self.passo()
+                ticks += 1
+                if self.jogo_finalizado or time.perf_counter() >= limite:
+                    break
+        else:
+            # Um quadro muito longo (janela arrastada, depurador) não vira uma rajada de ticks
+            self._acumulador += min(dt, self.dt_maximo) * self.ticks_por_segundo * self.aceleracao
+            ticks = 0
+            while self._acumulador >= 1.0:
+                self.passo()
+                ticks += 1
+                self._acumulador -= 1.0
+                if self.jogo_finalizado:
+                    break
+                if time.perf_counter() >= limite:
+                    # Sem tempo para alcançar o relógio: a simulação fica mais lenta em vez de travar os quadros
+                    self._acumulador = 0.0
+                    break
+        
+        if ticks:
+            self._atualizar_estatisticas_perfiladas()
+        return ticks
+    
+    def _atualizar_efeitos(self):
+        """Atualiza os efeitos visuais (uma vez por quadro)"""
+        t = self.perfilador.inicio()
+        self.efeitos.atualizar()
+        self.perfilador.fim('atualizar.efeitos', t)
+    
+    def _atualizar_estatisticas_perfiladas(self):
+        """Atualiza as estatísticas exibidas (uma vez por quadro)"""
+        t = self.perfilador.inicio()
         self._atualizar_estatisticas()
+        self.perfilador.fim('atualizar.estatisticas', t)
+    
+    def passo(self):
+        """Executa um tick da simulação"""
+        perfilador = self.perfilador
+        self.tempo += 1
+        
+        # Entidades inseridas fora do tick (inicialização, editor) entram no registro
+        t = perfilador.inicio()
+        if not self.registro.sincronizado(self.criaturas, self.predadores):
+            self.registro.reconstruir(self.criaturas, self.predadores)
+            if self.diario is not None:
+                self.diario.sincronizar(self)
+        
+        # Linhas de visão memorizadas valem só dentro do tick
+        self.mapa.limpar_memo_visao()
+        perfilador.fim('atualizar.registro', t)
+        
+        if self.motor:
+            self._atualizar_entidades_vetorizado()
+        else:
+            self._atualizar_entidades()
+        
+        t = perfilador.inicio()
+        self._gerar_alimento()
+        perfilador.fim('atualizar.alimento', t)
+        
+        t = perfilador.inicio()
+        self._registrar_series()
+        perfilador.fim('atualizar.series', t)
+        
+        # Verificar condições de fim de jogo
+        self._verificar_fim_de_jogo()
+        
+        if self.diario is not None:
+            self.diario.fim_do_tick(self)
+    
+    def _atualizar_entidades(self):
+        """Um tick de todas as entidades, cada uma executando suas próprias fases"""
+        perfilador = self.perfilador
+        
+        # Reconstruir os índices espaciais uma vez por tick
+        t = perfilador.inicio()
+        if self.indice_espacial:
+            self.grade_presas.reconstruir(self.criaturas)
+            self.grade_predadores.reconstruir(self.predadores)
+            self.grade_alimentos.reconstruir(self.alimentos)
+            grade_presas = self.grade_presas
+            grade_predadores = self.grade_predadores
+            grade_alimentos = self.grade_alimentos
+        else:
+            grade_presas = None
+            grade_predadores = None
+            grade_alimentos = None
+        perfilador.fim('atualizar.indices', t)
+        
+        # Fase de ação: as entidades só registram mortes, nascimentos e alimentos comidos
+        intencoes = self.intencoes
+        t = perfilador.inicio()
+        for criatura in self.criaturas:
+            # Devorada por um predador neste tick
+            if intencoes.removido(criatura):
+                continue
+            
+            if not criatura.atualizar(self.alimentos, self.criaturas, self.predadores, self.registro, intencoes,
+                                      self.mapa, grade_presas, grade_predadores, grade_alimentos):
+                # Criatura morreu
+                self._registrar_morte(criatura)
+        perfilador.fim('atualizar.presas', t)
+        
+        t = perfilador.inicio()
+        for predador in self.predadores:
+            if intencoes.removido(predador):
+                continue
+            
+            if isinstance(predador, Canibal):
+                vivo = predador.atualizar(self.criaturas, self.predadores, self.registro, intencoes, self.mapa,
+                                          grade_presas, grade_predadores)
+            else:
+                vivo = predador.atualizar(self.criaturas, self.predadores, self.registro, intencoes, self.mapa,
+                                          grade_presas)
+            
+            if not vivo:
+                # Predador morreu
+                self._registrar_morte(predador)
+        perfilador.fim('atualizar.predadores', t)
+        
+        # Fase de aplicação: remoções e nascimentos de uma só vez
+        t = perfilador.inicio()
+        self._aplicar_intencoes(self.criaturas, self.predadores, self.alimentos)
+        perfilador.fim('atualizar.aplicar', t)
+    
+    def _registrar_series(self):
+        """Registra as populações e os atributos médios das presas do tick (dos agregados, em O(1))"""
+        agregados = self._agregados_sincronizados()
+        presas = (Criatura,)
+        self.series.registrar(self.tempo, (
+            agregados.contagem(Criatura),
+            agregados.contagem(Predador),
+            agregados.contagem(Canibal),
+            len(self.alimentos),
+            agregados.media(presas, 'velocidade'),
+            agregados.media(presas, 'stamina'),
+            agregados.media(presas, 'tamanho'),
+            agregados.media(presas, 'velocidade_nado'),
+            agregados.media(presas, 'idade', self.tempo),
+        ))
+    
+    def _aplicar_intencoes(self, *listas):
+        """Aplica as mortes e nascimentos do tick ao diário, aos agregados, ao registro e às listas"""
+        intencoes = self.intencoes
+        if self.diario is not None:
+            self.diario.registrar(self.tempo, intencoes)
+        self.agregados.aplicar(intencoes, self.tempo)
+        self.registro.aplicar(intencoes)
+        intencoes.aplicar(*listas)
+    
+    def _gerar_alimento(self):
+        """Gera um novo alimento com a chance configurada"""
+        # Adicionar alimento com base na taxa configurada
+        # (convertida de porcentagem por segundo para chance por frame)
+        # Aumentada em 5x para ter muito mais alimentos
+        chance_por_frame = self.taxa_alimento 
+        
+        # Aumentar também o limite máximo de alimentos
+        if self.rng.random() < chance_por_frame and len(self.alimentos) < 300:
+            novo_alimento = self._criar_alimento_em_posicao_valida()
+            if novo_alimento:
+                self.alimentos.append(novo_alimento)
+                if self.diario is not None:
+                    self.diario.alimento_novo(self.tempo, novo_alimento)
+            
+                # Efeito visual para novo alimento
+                self.efeitos.adicionar_particulas(
+                    novo_alimento.x,
+                    novo_alimento.y,
+                    (100, 255, 100, 150),  # Verde claro translúcido
+                    num_particulas=5,
+                    velocidade=0.8,
+                    tamanho=1.5
+                )
+    
+    def _registrar_morte(self, entidade):
+        """Registra a morte de uma entidade (velhice ou fome) para o final do tick"""
+        self._efeito_morte(entidade)
+        self.intencoes.remover(entidade)
+        self.grade_presas.remover(entidade)
+        self.grade_predadores.remover(entidade)
+    
+    def _efeito_morte(self, entidade):
+        """Partículas exibidas quando uma entidade morre"""
+        if isinstance(entidade, Canibal):
+            self.efeitos.adicionar_particulas(entidade.x, entidade.y, (200, 0, 0, 200), num_particulas=20)  # Vermelho translúcido
+        elif isinstance(entidade, Predador):
+            self.efeitos.adicionar_particulas(entidade.x, entidade.y, (180, 0, 0, 180), num_particulas=15)  # Vermelho translúcido
+        else:
+            self.efeitos.adicionar_particulas(entidade.x, entidade.y, (150, 150, 150, 200), num_particulas=15)  # Cinza translúcido
+    
+    def salvar_estado(self, caminho):
+        """Grava um snapshot binário do estado completo (ver estado_salvo.py)"""
+        from estado_salvo import salvar_estado
+        salvar_estado(self, caminho)
+    
+    def carregar_estado(self, caminho, vetorizado=None):
+        """Continua a simulação a partir de um snapshot salvo com salvar_estado (no modo em que foi
+        salvo; com `vetorizado`, exige que seja esse)"""
+        from estado_salvo import carregar_estado
+        self.parar_diario()
+        carregar_estado(self, caminho, vetorizado)
+        
+        # O histórico dos gráficos não faz parte do snapshot: recomeça no tick carregado
+        self.series.limpar()
+    
+    def iniciar_diario(self, caminho, intervalo_quadro_chave=30):
+        """Começa a gravar o diário de eventos da execução (ver diario_eventos.py)"""
+        from diario_eventos import DiarioEventos
+        self.parar_diario()
+        self.diario = DiarioEventos(caminho, intervalo_quadro_chave)
+        self.diario.iniciar(self)
+    
+    def parar_diario(self):
+        """Grava o estado final no diário de eventos e fecha o arquivo"""
+        if self.diario is not None:
+            self.diario.fechar(self)
+            self.diario = None
+    
+    def usar_motor_vetorizado(self, ativo=True):
+        """Liga ou desliga o motor vetorizado (NumPy) para as fases físicas do tick"""
+        if ativo and self.motor is None:
+            from motor_vetorizado import MotorVetorizado
+            self.motor = MotorVetorizado(self.WIDTH, self.HEIGHT)
+        elif not ativo and self.motor is not None:
+            self.motor.liberar_todos()
+            self.motor = None
+    
+    def _atualizar_entidades_vetorizado(self):
+        """Um tick de todas as entidades com as fases físicas executadas pelo motor vetorizado"""
+        motor = self.motor
+        mapa = self.mapa
+        perfilador = self.perfilador
+        
+        # Os índices espaciais são sempre usados neste modo
+        t = perfilador.inicio()
+        grade_presas = self.grade_presas
+        grade_predadores = self.grade_predadores
+        grade_presas.reconstruir(self.criaturas)
+        grade_predadores.reconstruir(self.predadores)
+        self.grade_alimentos.reconstruir(self.alimentos)
+        
+        # Entidades novas (nascimentos, editor) passam para os arrays; as removidas saem
+        motor.sincronizar(self.criaturas, self.predadores)
+        perfilador.fim('atualizar.indices', t)
+        
+        # Envelhecimento; os mortos saem das listas antes das demais fases
+        t = perfilador.inicio()
+        mortos = motor.envelhecer()
+        if mortos:
+            for entidade in mortos:
+                self._registrar_morte(entidade)
+            self._aplicar_intencoes(self.criaturas, self.predadores)
+            motor.sincronizar(self.criaturas, self.predadores)
+        perfilador.fim('atualizar.envelhecer', t)
+        
+        # Percepção do ambiente (paredes, água, natação e limites do mapa)
+        t = perfilador.inicio()
+        motor.perceber_ambiente(mapa)
+        perfilador.fim('atualizar.perceber', t)
+        
+        # Decisões (por objeto)
+        t = perfilador.inicio()
+        em_movimento = []
+        for criatura in self.criaturas:
+            if criatura._decidir(self.alimentos, self.criaturas, self.predadores, self.registro, mapa,
+                                 grade_presas, grade_predadores, self.grade_alimentos):
+                em_movimento.append(criatura)
+        for predador in self.predadores:
+            predador._decidir(None, self.criaturas, self.predadores, self.registro, mapa, grade_presas, grade_predadores,
+                              motor)
+            em_movimento.append(predador)
+        perfilador.fim('atualizar.decidir', t)
+        
+        # Movimento
+        t = perfilador.inicio()
+        motor.mover(em_movimento, mapa)
+        perfilador.fim('atualizar.mover', t)
+        
+        # Interações (por objeto), registradas nas intenções; quem foi devorado neste tick não age
+        t = perfilador.inicio()
+        intencoes = self.intencoes
+        for entidade in em_movimento:
+            if intencoes.removido(entidade):
+                continue
+            if isinstance(entidade, Criatura):
+                entidade._interagir(self.alimentos, self.criaturas, self.predadores, intencoes, grade_presas, grade_predadores,
+                                    self.grade_alimentos)
+            else:
+                entidade._interagir(None, self.criaturas, self.predadores, intencoes, grade_presas, grade_predadores)
+        perfilador.fim('atualizar.interagir', t)
+        
+        t = perfilador.inicio()
+        self._aplicar_intencoes(self.criaturas, self.predadores, self.alimentos)
+        motor.sincronizar(self.criaturas, self.predadores)
+        perfilador.fim('atualizar.aplicar', t)
     
     def _verificar_fim_de_jogo(self):
         """Verifica se a simulação terminou e coleta estatísticas finais"""
@@ -422,45 +740,59 @@ class Simulacao:
         self.estatisticas_finais['tempo_total'] = self.tempo
         self.estatisticas_finais['geracoes'] = self.estatisticas['geracao']
         
+        agregados = self._agregados_sincronizados()
+        presas = (Criatura,)
+        predadores = (Predador, Canibal)
+        
         # Estatísticas das criaturas sobreviventes
         if len(self.criaturas) > 0:
             # Encontrar a criatura mais forte (combinação de atributos)
-            criaturas_ordenadas = sorted(self.criaturas, 
-                                       key=lambda c: c.velocidade * 0.3 + c.stamina * 0.3 + c.tamanho * 0.2 + (c.velocidade_nado or 0) * 0.2,
-                                       reverse=True)
-            
-            self.estatisticas_finais['criatura_mais_forte'] = criaturas_ordenadas[0]
+            self.estatisticas_finais['criatura_mais_forte'] = max(
+                self.criaturas,
+                key=lambda c: c.velocidade * 0.3 + c.stamina * 0.3 + c.tamanho * 0.2 + (c.velocidade_nado or 0) * 0.2)
             
-            # Calcular médias
+            # Médias dos agregados (os filhos mudam sem nascimento e são somados aqui, uma vez)
             self.estatisticas_finais['criatura_media'] = {
-                'velocidade': sum(c.velocidade for c in self.criaturas) / len(self.criaturas),
-                'stamina': sum(c.stamina for c in self.criaturas) / len(self.criaturas),
-                'tamanho': sum(c.tamanho for c in self.criaturas) / len(self.criaturas),
-                'velocidade_nado': sum(getattr(c, 'velocidade_nado', 0) for c in self.criaturas) / len(self.criaturas),
-                'comunicacao': sum(getattr(c, 'comunicacao', 0) for c in self.criaturas) / len(self.criaturas),
-                'idade_media': sum(c.idade for c in self.criaturas) / len(self.criaturas),
+                'velocidade': agregados.media(presas, 'velocidade'),
+                'stamina': agregados.media(presas, 'stamina'),
+                'tamanho': agregados.media(presas, 'tamanho'),
+                'velocidade_nado': agregados.media(presas, 'velocidade_nado'),
+                'comunicacao': agregados.media(presas, 'comunicacao'),
+                'idade_media': agregados.media(presas, 'idade', self.tempo),
                 'filhos_media': sum(c.filhos for c in self.criaturas) / len(self.criaturas)
             }
+            self.estatisticas_finais['criatura_variancia'] = self._variancias(presas)
         
         # Estatísticas dos predadores sobreviventes
         if len(self.predadores) > 0:
             # Encontrar o predador mais forte (combinação de atributos)
-            predadores_ordenados = sorted(self.predadores, 
-                                       key=lambda p: p.velocidade * 0.3 + p.stamina * 0.3 + p.tamanho * 0.3 + (p.velocidade_nado or 0) * 0.1,
-                                       reverse=True)
+            self.estatisticas_finais['predador_mais_forte'] = max(
+                self.predadores,
+                key=lambda p: p.velocidade * 0.3 + p.stamina * 0.3 + p.tamanho * 0.3 + (p.velocidade_nado or 0) * 0.1)
             
-            self.estatisticas_finais['predador_mais_forte'] = predadores_ordenados[0]
-            
-            # Calcular médias
+            # Médias dos agregados
             self.estatisticas_finais['predador_medio'] = {
-                'velocidade': sum(p.velocidade for p in self.predadores) / len(self.predadores),
-                'stamina': sum(p.stamina for p in self.predadores) / len(self.predadores),
-                'tamanho': sum(p.tamanho for p in self.predadores) / len(self.predadores),
-                'velocidade_nado': sum(getattr(p, 'velocidade_nado', 0) for p in self.predadores) / len(self.predadores),
-                'idade_media': sum(p.idade for p in self.predadores) / len(self.predadores),
+                'velocidade': agregados.media(predadores, 'velocidade'),
+                'stamina': agregados.media(predadores, 'stamina'),
+                'tamanho': agregados.media(predadores, 'tamanho'),
+                'velocidade_nado': agregados.media(predadores, 'velocidade_nado'),
+                'idade_media': agregados.media(predadores, 'idade', self.tempo),
                 'filhos_media': sum(p.filhos for p in self.predadores) / len(self.predadores),
-                'canibais_percentual': (sum(1 for p in self.predadores if isinstance(p, Canibal)) / len(self.predadores)) * 100
+                'canibais_percentual': agregados.contagem(Canibal) / len(self.predadores) * 100
             }
+            self.estatisticas_finais['predador_variancia'] = self._variancias(predadores)
+    
+    def _variancias(self, classes):
+        """Variância de cada atributo das classes"""
+        agregados = self.agregados
+        return {nome: agregados.variancia(classes, nome, self.tempo)
+                for nome in ('velocidade', 'stamina', 'tamanho', 'velocidade_nado', 'idade')}
+    
+    def _agregados_sincronizados(self):
+        """Agregados da população, refeitos se o editor inseriu entidades direto nas listas"""
+        if not self.agregados.sincronizado(self.criaturas, self.predadores):
+            self.agregados.recalcular(self.tempo, self.criaturas, self.predadores)
+        return self.agregados
     
     def _atualizar_estatisticas(self):
         # Atualizar população atual
@@ -471,15 +803,17 @@ class Simulacao:
             self.estatisticas['populacao_pico'] = len(self.criaturas)
         
         # Atualizar número de predadores e canibais ativos
-        self.estatisticas['predadores_ativos'] = sum(1 for p in self.predadores if not isinstance(p, Canibal))
-        self.estatisticas['canibais_ativos'] = sum(1 for p in self.predadores if isinstance(p, Canibal))
+        agregados = self._agregados_sincronizados()
+        self.estatisticas['predadores_ativos'] = agregados.contagem(Predador)
+        self.estatisticas['canibais_ativos'] = agregados.contagem(Canibal)
         
-        # Calcular médias
+        # Calcular médias (dos agregados, sem percorrer as listas)
         if len(self.criaturas) > 0:
-            self.estatisticas['idade_media'] = sum(c.idade for c in self.criaturas) / len(self.criaturas)
-            self.estatisticas['velocidade_media'] = sum(c.velocidade for c in self.criaturas) / len(self.criaturas)
-            self.estatisticas['stamina_media'] = sum(c.stamina for c in self.criaturas) / len(self.criaturas)
-            self.estatisticas['tamanho_medio'] = sum(c.tamanho for c in self.criaturas) / len(self.criaturas)
+            presas = (Criatura,)
+            self.estatisticas['idade_media'] = agregados.media(presas, 'idade', self.tempo)
+            self.estatisticas['velocidade_media'] = agregados.media(presas, 'velocidade')
+            self.estatisticas['stamina_media'] = agregados.media(presas, 'stamina')
+            self.estatisticas['tamanho_medio'] = agregados.media(presas, 'tamanho')
         
         # Incrementar geração se a população diminuiu significativamente e depois se recuperou
         if (self.estatisticas['populacao'] > 20 and 
@@ -491,28 +825,39 @@ class Simulacao:
         self.estatisticas['total_criaturas'] = Criatura.contador_id
     
     def desenhar(self, superficie):
+        perfilador = self.perfilador
+        
         # Desenhar mapa (terrenos e paredes)
+        t = perfilador.inicio()
         if self.mapa:
             self.mapa.desenhar(superficie)
         else:
             # Fundo padrão se não houver mapa
             superficie.fill((50, 50, 50))  # Cinza escuro
+        perfilador.fim('desenhar.mapa', t)
         
         # Desenhar alimentos
+        t = perfilador.inicio()
         for alimento in self.alimentos:
             alimento.desenhar(superficie)
+        perfilador.fim('desenhar.alimentos', t)
         
-        # Desenhar criaturas
-        for criatura in self.criaturas:
-            criatura.desenhar(superficie)
+        # Campos de visão de todos, antes dos corpos
+        t = perfilador.inicio()
+        self.camada_visao.desenhar(superficie, self.criaturas, self.predadores)
+        perfilador.fim('desenhar.visao', t)
         
-        # Desenhar predadores
-        for predador in self.predadores:
-            predador.desenhar(superficie)
+        # Desenhar criaturas e predadores (um único blits com os sprites de todos)
+        t = perfilador.inicio()
+        self.sprites.desenhar(superficie, self.criaturas, self.predadores)
+        perfilador.fim('desenhar.entidades', t)
         
         # Desenhar efeitos visuais
+        t = perfilador.inicio()
         self.efeitos.desenhar(superficie)
+        perfilador.fim('desenhar.efeitos', t)
         
+        t = perfilador.inicio()
         if self.jogo_finalizado:
             # Se o jogo terminou, desenhar tela de estatísticas finais
             self._desenhar_estatisticas_finais(superficie)
@@ -524,17 +869,29 @@ class Simulacao:
         # Desenhar interface de editor por último (para sobrepor tudo)
         if self.editor and self.editor.ativo:
             self.editor.desenhar(superficie)
+        perfilador.fim('desenhar.interface', t)
+        
+        # Gráficos da população (G), refeitos só quando há pontos novos
+        if self.painel_graficos.ativo:
+            t = perfilador.inicio()
+            self.painel_graficos.desenhar(superficie)
+            perfilador.fim('desenhar.graficos', t)
+        
+        # Painel de tempos por cima de tudo
+        if perfilador.ativo:
+            perfilador.desenhar(superficie)
     
     def _desenhar_estatisticas_finais(self, superficie):
         """Desenha a tela de estatísticas finais quando o jogo termina"""
-        # Criar uma superfície semi-transparente para o fundo
-        s = pygame.Surface((self.WIDTH, self.HEIGHT))
-        s.set_alpha(220)
-        s.fill((20, 20, 40))  # Azul escuro para fundo
-        superficie.blit(s, (0, 0))
+        # Superfície semi-transparente para o fundo (criada uma vez; os textos vêm do cache)
+        if self._fundo_estatisticas is None:
+            self._fundo_estatisticas = pygame.Surface((self.WIDTH, self.HEIGHT))
+            self._fundo_estatisticas.set_alpha(220)
+            self._fundo_estatisticas.fill((20, 20, 40))  # Azul escuro para fundo
+        superficie.blit(self._fundo_estatisticas, (0, 0))
         
         # Título principal
-        texto_titulo = self.fonte_grande.render(f"Simulação finalizada - Vitória das {self.vencedor.capitalize()}!", True, (255, 255, 0))
+        texto_titulo = renderizar(f"Simulação finalizada - Vitória das {self.vencedor.capitalize()}!", "Arial", 32, (255, 255, 0))
         superficie.blit(texto_titulo, (self.WIDTH//2 - texto_titulo.get_width()//2, 40))
         
         # Informações gerais
@@ -542,17 +899,17 @@ class Simulacao:
             f"Tempo total: {self.estatisticas_finais['tempo_total']} frames",
             f"Gerações: {self.estatisticas_finais['geracoes']}",
             f"Presas sobreviventes: {len(self.criaturas)}",
-            f"Predadores sobreviventes: {len(self.predadores)} (Canibais: {sum(1 for p in self.predadores if isinstance(p, Canibal))})"
+            f"Predadores sobreviventes: {len(self.predadores)} (Canibais: {self.agregados.contagem(Canibal)})"
         ]
         
         for i, texto in enumerate(info_geral):
-            superficie.blit(self.fonte_titulo.render(texto, True, (220, 220, 220)), (self.WIDTH//2 - 200, 100 + i * 35))
+            superficie.blit(renderizar(texto, "Arial", 24, (220, 220, 220)), (self.WIDTH//2 - 200, 100 + i * 35))
         
         # Desenhar informações das criaturas se houver sobreviventes
         y_pos = 250
         if len(self.criaturas) > 0:
             # Título da seção
-            texto_secao = self.fonte_titulo.render("Estatísticas das Presas", True, (100, 200, 100))
+            texto_secao = renderizar("Estatísticas das Presas", "Arial", 24, (100, 200, 100))
             superficie.blit(texto_secao, (self.WIDTH//4 - texto_secao.get_width()//2, y_pos))
             
             # Estatísticas da criatura média
@@ -568,13 +925,13 @@ class Simulacao:
             ]
             
             for i, texto in enumerate(textos_media):
-                superficie.blit(self.fonte.render(texto, True, (180, 230, 180)), (100, y_pos + 40 + i * 25))
+                superficie.blit(renderizar(texto, "Arial", 16, (180, 230, 180)), (100, y_pos + 40 + i * 25))
             
             # Informações sobre a criatura mais forte
             mais_forte = self.estatisticas_finais['criatura_mais_forte']
             y_pos_forte = y_pos + 40
             
-            titulo_forte = self.fonte.render("CRIATURA MAIS FORTE:", True, (100, 255, 100))
+            titulo_forte = renderizar("CRIATURA MAIS FORTE:", "Arial", 16, (100, 255, 100))
             superficie.blit(titulo_forte, (self.WIDTH//2 + 50, y_pos_forte))
             
             textos_forte = [
@@ -588,13 +945,13 @@ class Simulacao:
             ]
             
             for i, texto in enumerate(textos_forte):
-                superficie.blit(self.fonte.render(texto, True, (150, 255, 150)), (self.WIDTH//2 + 50, y_pos_forte + 25 + i * 25))
+                superficie.blit(renderizar(texto, "Arial", 16, (150, 255, 150)), (self.WIDTH//2 + 50, y_pos_forte + 25 + i * 25))
         
         # Desenhar informações dos predadores se houver sobreviventes
         y_pos = 450
         if len(self.predadores) > 0:
             # Título da seção
-            texto_secao = self.fonte_titulo.render("Estatísticas dos Predadores", True, (200, 100, 100))
+            texto_secao = renderizar("Estatísticas dos Predadores", "Arial", 24, (200, 100, 100))
             superficie.blit(texto_secao, (self.WIDTH//4 - texto_secao.get_width()//2, y_pos))
             
             # Estatísticas do predador médio
@@ -610,7 +967,7 @@ class Simulacao:
             ]
             
             for i, texto in enumerate(textos_media):
-                superficie.blit(self.fonte.render(texto, True, (230, 180, 180)), (100, y_pos + 40 + i * 25))
+                superficie.blit(renderizar(texto, "Arial", 16, (230, 180, 180)), (100, y_pos + 40 + i * 25))
             
             # Informações sobre o predador mais forte
             mais_forte = self.estatisticas_finais['predador_mais_forte']
@@ -618,7 +975,7 @@ class Simulacao:
             
             # Determinar tipo de predador mais forte
             tipo_mais_forte = "CANIBAL" if isinstance(mais_forte, Canibal) else "PREDADOR"
-            titulo_forte = self.fonte.render(f"{tipo_mais_forte} MAIS FORTE:", True, (255, 100, 100))
+            titulo_forte = renderizar(f"{tipo_mais_forte} MAIS FORTE:", "Arial", 16, (255, 100, 100))
             superficie.blit(titulo_forte, (self.WIDTH//2 + 50, y_pos_forte))
             
             textos_forte = [
@@ -635,17 +992,69 @@ class Simulacao:
                 textos_forte.append(f"Forma: {mais_forte.forma.capitalize()}")
             
             for i, texto in enumerate(textos_forte):
-                superficie.blit(self.fonte.render(texto, True, (255, 150, 150)), (self.WIDTH//2 + 50, y_pos_forte + 25 + i * 25))
+                superficie.blit(renderizar(texto, "Arial", 16, (255, 150, 150)), (self.WIDTH//2 + 50, y_pos_forte + 25 + i * 25))
         
         # Botão grande para voltar ao menu
         botao_voltar = pygame.Rect(self.WIDTH//2 - 150, self.HEIGHT - 80, 300, 60)
         pygame.draw.rect(superficie, (50, 50, 80), botao_voltar, 0, 15)  # Botão arredondado
         pygame.draw.rect(superficie, (255, 255, 255), botao_voltar, 2, 15)  # Borda
         
-        texto_voltar = self.fonte_titulo.render("Voltar ao Menu", True, (255, 255, 255))
+        texto_voltar = renderizar("Voltar ao Menu", "Arial", 24, (255, 255, 255))
         superficie.blit(texto_voltar, (self.WIDTH//2 - texto_voltar.get_width()//2, self.HEIGHT - 65))
     
     def processar_eventos(self, evento):
+        # Velocidade máxima (M): quantos ticks couberem entre um quadro e outro
+        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_m and not (self.editor and self.editor.ativo):
+            self.velocidade_maxima = not self.velocidade_maxima
+            if self.touch_controls:
+                self.touch_controls.buttons['max_speed']['toggled'] = self.velocidade_maxima
+            return None
+        
+        # Painel de gráficos (G): populações e atributos médios ao longo da execução
+        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_g and not (self.editor and self.editor.ativo):
+            self.painel_graficos.alternar()
+            if self.touch_controls:
+                self.touch_controls.buttons['charts']['toggled'] = self.painel_graficos.ativo
+            return None
+        
+        # Salvar (F5) e carregar (F9) o snapshot rápido
+        if evento.type == pygame.KEYDOWN and evento.key in (pygame.K_F5, pygame.K_F9):
+            try:
+                if evento.key == pygame.K_F5:
+                    self.salvar_estado(ARQUIVO_SNAPSHOT_RAPIDO)
+                elif os.path.exists(ARQUIVO_SNAPSHOT_RAPIDO):
+                    self.carregar_estado(ARQUIVO_SNAPSHOT_RAPIDO)
+            except (OSError, ValueError) as erro:
+                print(f"Erro no snapshot: {erro}")
+            return None
+        
+        # Painel de tempos (F3) e gravação de trace (F4) funcionam em qualquer modo
+        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F3:
+            self.perfilador.alternar()
+            return None
+        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F4:
+            if self.perfilador.gravando_trace:
+                caminho = time.strftime("trace_%Y%m%d_%H%M%S.json")
+                self.perfilador.parar_trace(caminho)
+                self.perfilador.mensagem = f"trace salvo em {caminho}"
+            else:
+                self.perfilador.iniciar_trace()
+                self.perfilador.mensagem = None
+            return None
+        
+        # Gravação do diário de eventos (F6), para rever a execução com reprodutor.py
+        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F6:
+            if self.diario is not None:
+                caminho = self.diario.caminho
+                self.parar_diario()
+                print(f"Diário de eventos salvo em {caminho}")
+            else:
+                try:
+                    self.iniciar_diario(time.strftime("eventos_%Y%m%d_%H%M%S.simlog"))
+                except OSError as erro:
+                    print(f"Erro no diário de eventos: {erro}")
+            return None
+        
         # Primeiro processamos eventos do editor, se existir e estiver ativo
         if self.editor and self.editor.ativo:
             self.editor.processar_eventos(evento)
@@ -671,4 +1080,137 @@ class Simulacao:
             if botao_voltar.collidepoint(evento.pos):
                 return "voltar_menu"
                 
-        return None
\ No newline at end of file
+        return None
+
+
+def _resumo_entidade(entidade):
+    """Converte uma criatura/predador em um dicionário serializável com seus atributos"""
+    if entidade is None:
+        return None
+    return {
+        'id': entidade.id,
+        'tipo': type(entidade).__name__,
+        'velocidade': entidade.velocidade,
+        'stamina': entidade.stamina,
+        'longevidade': entidade.longevidade,
+        'tamanho': entidade.tamanho,
+        'velocidade_nado': getattr(entidade, 'velocidade_nado', 0),
+        'comunicacao': getattr(entidade, 'comunicacao', 0),
+        'idade': entidade.idade,
+        'filhos': entidade.filhos
+    }
+
+
+def executar_sem_interface(configuracoes, ticks, WIDTH=1024, HEIGHT=768, vetorizado=False, trace=None,
+                           carregar=None, salvar=None, salvar_a_cada=0, eventos=None, quadro_chave=30):
+    """Executa a simulação sem interface por até `ticks` ticks e retorna as estatísticas finais
+    (com `trace`, grava os tempos de cada fase nesse arquivo no formato de trace do Chrome;
+    com `carregar`, continua de um snapshot, no motor com que ele foi salvo se `vetorizado` é None;
+    com `salvar`, grava um snapshot no final e, se `salvar_a_cada` > 0, também a cada tantos ticks;
+    com `eventos`, grava o diário de eventos com um quadro-chave a cada `quadro_chave` ticks)"""
+    # Ids a partir de 1, como num processo novo: várias execuções no mesmo processo (varredura.py)
+    # dão o mesmo resultado que execuções isoladas
+    CriaturaBase.contador_id = 0
+    
+    simulacao = Simulacao(WIDTH, HEIGHT, headless=True)
+    simulacao.usar_motor_vetorizado(vetorizado)
+    if carregar:
+        simulacao.carregar_estado(carregar, vetorizado)
+    else:
+        simulacao.inicializar(configuracoes)
+    
+    perfilador = simulacao.perfilador
+    if trace:
+        perfilador.iniciar_trace()
+    if eventos:
+        simulacao.iniciar_diario(eventos, quadro_chave)
+    
+    for _ in range(ticks):
+        t = perfilador.inicio()
+        simulacao.atualizar()
+        perfilador.fim('atualizar', t)
+        perfilador.fechar_quadro()
+        if simulacao.jogo_finalizado:
+            break
+        if salvar and salvar_a_cada and simulacao.tempo % salvar_a_cada == 0:
+            simulacao.salvar_estado(salvar)
+    
+    if trace:
+        perfilador.parar_trace(trace)
+    simulacao.parar_diario()
+    if salvar:
+        simulacao.salvar_estado(salvar)
+    
+    # Se ninguém venceu dentro do limite, coletar as estatísticas do estado atual
+    if not simulacao.jogo_finalizado:
+        simulacao._coletar_estatisticas_finais()
+    
+    estatisticas = dict(simulacao.estatisticas_finais)
+    estatisticas['criatura_mais_forte'] = _resumo_entidade(estatisticas['criatura_mais_forte'])
+    estatisticas['predador_mais_forte'] = _resumo_entidade(estatisticas['predador_mais_forte'])
+    estatisticas['vencedor'] = simulacao.vencedor
+    estatisticas['presas'] = len(simulacao.criaturas)
+    estatisticas['predadores'] = simulacao.estatisticas['predadores_ativos']
+    estatisticas['canibais'] = simulacao.estatisticas['canibais_ativos']
+    estatisticas['populacao_pico'] = simulacao.estatisticas['populacao_pico']
+    # A semente da execução (continuada de um snapshot: a da execução que o gravou)
+    estatisticas['seed'] = simulacao.seed
+    return estatisticas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa a simulação sem interface e imprime as estatísticas finais em JSON")
+    parser.add_argument('--ticks', type=int, default=10000,
+                        help="número máximo de ticks (com --carregar, ticks a mais a partir do snapshot)")
+    parser.add_argument('--mapa', default='aleatorio',
+                        choices=['aleatorio', 'planicie', 'ilha', 'labirinto', 'montanhoso', 'diversificado'])
+    parser.add_argument('--seed', type=int, default=None, help="semente do gerador aleatório")
+    parser.add_argument('--presas', type=int, default=20)
+    parser.add_argument('--predadores', type=int, default=3)
+    parser.add_argument('--canibais', type=int, default=1)
+    parser.add_argument('--alimentos', type=int, default=40)
+    parser.add_argument('--taxa-alimento', type=float, default=0.05)
+    parser.add_argument('--modo-atributos', default='aleatorio', choices=['aleatorio', 'padrao'])
+    parser.add_argument('--largura', type=int, default=1024)
+    parser.add_argument('--altura', type=int, default=768)
+    parser.add_argument('--vetorizado', action='store_true',
+                        help="usa o motor vetorizado (NumPy) nas fases físicas; o gelo não trava a direção "
+                             "nesse modo, então o resultado difere do modo normal com a mesma semente")
+    parser.add_argument('--trace', help="grava os tempos de cada fase neste arquivo (formato de trace do Chrome)")
+    parser.add_argument('--carregar',
+                        help="continua a partir deste snapshot (ignora as opções do mapa e das populações; "
+                             "usa o motor da execução salva, e com --vetorizado ela precisa ter usado o vetorizado)")
+    parser.add_argument('--salvar', help="grava um snapshot neste arquivo no final")
+    parser.add_argument('--salvar-a-cada', type=int, default=0, help="também grava o snapshot a cada N ticks")
+    parser.add_argument('--eventos', help="grava o diário de eventos neste arquivo (reveja com reprodutor.py)")
+    parser.add_argument('--quadro-chave', type=int, default=30, help="ticks entre os quadros-chave do diário")
+    args = parser.parse_args(argv)
+    
+    configuracoes = {
+        'mapa': args.mapa,
+        'n_presas': args.presas,
+        'n_predadores': args.predadores,
+        'n_canibais': args.canibais,
+        'n_alimentos': args.alimentos,
+        'taxa_alimento': args.taxa_alimento,
+        'modo_atributos': args.modo_atributos,
+        'terrenos': {},
+        'seed': args.seed
+    }
+    
+    # Sem --vetorizado, um snapshot continua no motor com que foi salvo
+    try:
+        estatisticas = executar_sem_interface(configuracoes, args.ticks, args.largura, args.altura,
+                                              args.vetorizado or None, args.trace, args.carregar, args.salvar,
+                                              args.salvar_a_cada, args.eventos, args.quadro_chave)
+    except ValueError as erro:
+        if not args.carregar:
+            raise
+        parser.error(f"--carregar {args.carregar}: {erro}")
+    json.dump(estatisticas, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
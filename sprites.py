@@ -0,0 +1,95 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+# Direções distintas nos sprites (olhos e barbatanas seguem a direção do movimento)
+DIRECOES = 32
+PASSOS_POR_RADIANO = DIRECOES / (2 * math.pi)
+
+# Fundo dos sprites: os corpos são opacos, então uma cor-chave com RLE basta e é bem mais rápida
+# de copiar que alfa por pixel (nenhuma entidade é desenhada nessa cor)
+TRANSPARENTE = (1, 2, 3)
+
+
+class CacheSprites:
+    """Corpos das entidades pré-renderizados e as barras de energia; um quadro inteiro vira um
+    único `blits`. A forma é guardada por espécie, estado, faixa de tamanho (meio pixel) e cor
+    quantizada (que só muda com a idade), desenhada no tamanho da faixa; os detalhes que giram
+    com a entidade (olhos, barbatanas), por espécie, estado, faixa de tamanho e direção,
+    compartilhados entre entidades de cores diferentes."""
+    def __init__(self, max_sprites=4096):
+        # chave -> (Surface, raio), descartando o menos usado quando passa do limite
+        self.max_sprites = max_sprites
+        self._sprites = OrderedDict()
+
+        # (comprimento, largura, cor) -> Surface da barra de energia
+        self._barras = {}
+
+    def limpar(self):
+        self._sprites.clear()
+        self._barras.clear()
+
+    def _criar(self, chave, raio, desenhar, *args):
+        """Cria o sprite com desenhar(sprite, raio, raio, *args): o próprio método da entidade,
+        centrado no sprite"""
+        sprite = pygame.Surface((2 * raio + 1, 2 * raio + 1))
+        sprite.fill(TRANSPARENTE)
+        desenhar(sprite, raio, raio, *args)
+        sprite.set_colorkey(TRANSPARENTE, pygame.RLEACCEL)
+        item = self._sprites[chave] = (sprite, raio)
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return item
+
+    def _obter(self, chave):
+        """Sprite em cache (marcado como usado agora) ou None"""
+        item = self._sprites.get(chave)
+        if item is not None:
+            self._sprites.move_to_end(chave)
+        return item
+
+    def forma(self, entidade, cor):
+        """Sprite da forma da entidade e a distância do canto ao centro"""
+        # Cor arredondada para 16 níveis por canal: a idade clareia a cor aos poucos, e sem isso
+        # cada passo de clareamento de cada entidade viraria um sprite novo (com 32 níveis, alguns
+        # milhares de entidades já passam de max_sprites e o cache é refeito a cada quadro)
+        r, g, b = cor
+        cor = (r & ~15 | 8, g & ~15 | 8, b & ~15 | 8)
+        # Tamanho em faixas de meio pixel: cada entidade tem o seu, sorteado ou herdado com mutação
+        tamanho = round(entidade.tamanho * 2) / 2
+        chave = (type(entidade), tamanho, cor, entidade.estado_forma())
+        item = self._obter(chave)
+        if item is None:
+            item = self._criar(chave, int(tamanho * 2) + 2, entidade._desenhar_forma, cor, tamanho)
+        return item
+
+    def detalhes(self, entidade):
+        """Sprite dos detalhes da entidade (None se ela não tiver) e a distância do canto ao centro"""
+        estado = entidade.estado_detalhes()
+        if estado is None:
+            return None
+        direcao = int((entidade.direcao * PASSOS_POR_RADIANO + 0.5) // 1) % DIRECOES
+        chave = (type(entidade), int(entidade.tamanho * 2), direcao, estado)
+        item = self._obter(chave)
+        if item is None:
+            item = self._criar(chave, entidade.raio_sprite(), entidade._desenhar_detalhes)
+        return item
+
+    def barra(self, comprimento, largura, cor):
+        """Barra de energia: fundo branco com `comprimento` pixels preenchidos"""
+        chave = (comprimento, largura, cor)
+        barra = self._barras.get(chave)
+        if barra is None:
+            barra = self._barras[chave] = pygame.Surface((largura, 3))
+            barra.fill((255, 255, 255))
+            barra.fill(cor, (0, 0, comprimento, 3))
+        return barra
+
+    def desenhar(self, superficie, *listas):
+        """Desenha todas as entidades das listas num único blits"""
+        itens = []
+        for lista in listas:
+            for entidade in lista:
+                itens.extend(entidade.itens_desenho(superficie, self))
+        superficie.blits(itens, False)
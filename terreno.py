@@ -1,8 +1,19 @@
 import pygame
-import random
+
+# Identificadores compactos dos tipos de terreno (valores da grade uint8 do mapa)
+GRAMA = 0
+LAMA = 1
+GELO = 2
+AGUA = 3
+DESERTO = 4
+MONTANHA = 5
+FLORESTA = 6
+PANTANO = 7
 
 class Terreno:
     """Classe base para todos os tipos de terreno"""
+    id = None
+    
     def __init__(self, cor=(100, 100, 100), modificador_velocidade=1.0, nome="Terreno Base"):
         self.cor = cor
         self.modificador_velocidade = modificador_velocidade
@@ -23,12 +34,16 @@ class Terreno:
 
 class Grama(Terreno):
     """Terreno padrão - sem modificadores"""
+    id = GRAMA
+    
     def __init__(self):
         super().__init__(cor=(100, 180, 100), modificador_velocidade=1.0, nome="Grama")
 
 
 class Lama(Terreno):
     """Terreno que diminui a velocidade"""
+    id = LAMA
+    
     def __init__(self):
         super().__init__(cor=(139, 69, 19), modificador_velocidade=0.6, nome="Lama")
     
@@ -39,12 +54,14 @@ class Lama(Terreno):
 
 class Gelo(Terreno):
     """Terreno escorregadio que aumenta a velocidade mas reduz o controle"""
+    id = GELO
+    
     def __init__(self):
         super().__init__(cor=(200, 220, 255), modificador_velocidade=1.4, nome="Gelo")
     
     def efeito_movimento(self, criatura):
         # No gelo, as criaturas têm 30% de chance de manter a direção atual
-        if random.random() < 0.3:
+        if criatura.rng.random() < 0.3:
             # Mantém a direção atual (não permite mudar)
             criatura.direção_bloqueada = True
         else:
@@ -55,6 +72,8 @@ class Gelo(Terreno):
 
 class Agua(Terreno):
     """Terreno aquático que exige capacidade de natação"""
+    id = AGUA
+    
     def __init__(self):
         super().__init__(cor=(64, 164, 223), modificador_velocidade=0.0, nome="Água")
     
@@ -81,6 +100,8 @@ class Agua(Terreno):
 
 class Deserto(Terreno):
     """Terreno com pouca comida e alto gasto de energia"""
+    id = DESERTO
+    
     def __init__(self):
         super().__init__(cor=(237, 201, 175), modificador_velocidade=0.9, nome="Deserto")
     
@@ -91,6 +112,8 @@ class Deserto(Terreno):
 
 class Montanha(Terreno):
     """Terreno difícil de atravessar"""
+    id = MONTANHA
+    
     def __init__(self):
         super().__init__(cor=(120, 120, 120), modificador_velocidade=0.5, nome="Montanha")
     
@@ -101,6 +124,8 @@ class Montanha(Terreno):
 
 class Floresta(Terreno):
     """Terreno com muitos recursos mas movimento reduzido"""
+    id = FLORESTA
+    
     def __init__(self):
         super().__init__(cor=(34, 139, 34), modificador_velocidade=0.8, nome="Floresta")
     
@@ -111,9 +136,16 @@ class Floresta(Terreno):
 
 class Pantano(Terreno):
     """Terreno tóxico que drena energia"""
+    id = PANTANO
+    
     def __init__(self):
         super().__init__(cor=(75, 110, 68), modificador_velocidade=0.7, nome="Pântano")
     
     def efeito_energia(self, criatura):
         # Pântanos são tóxicos e drenam energia
-        return -0.3
\ No newline at end of file
+        return -0.3
+
+
+# Uma única instância compartilhada de cada terreno, indexada pelo identificador
+# (os terrenos não guardam estado por célula)
+TERRENOS = (Grama(), Lama(), Gelo(), Agua(), Deserto(), Montanha(), Floresta(), Pantano())
@@ -0,0 +1,59 @@
+"""
+Fontes e textos renderizados compartilhados pela interface. `fonte` cria cada fonte do sistema
+uma vez só; `renderizar` guarda as Surfaces dos textos num cache LRU, então um quadro que mostra
+os mesmos textos do anterior não rasteriza nada. As Surfaces do cache são compartilhadas: quem
+precisar alterá-las (transparência, por exemplo) deve trabalhar numa cópia.
+"""
+from collections import OrderedDict
+
+import pygame
+
+# (nome, tamanho) -> Font
+_fontes = {}
+
+
+def fonte(nome, tamanho):
+    """Fonte do sistema com esse nome e tamanho, criada na primeira vez que for pedida"""
+    chave = (nome, tamanho)
+    resultado = _fontes.get(chave)
+    if resultado is None:
+        resultado = _fontes[chave] = pygame.font.SysFont(nome, tamanho)
+    return resultado
+
+
+class CacheTextos:
+    """Surfaces de textos por (texto, fonte, tamanho, cor, fundo), descartando a menos usada"""
+    def __init__(self, capacidade=512):
+        self.capacidade = capacidade
+        self._textos = OrderedDict()
+
+        # Textos rasterizados desde a criação (para medir a taxa de acerto)
+        self.renderizados = 0
+
+    def renderizar(self, texto, nome, tamanho, cor, fundo=None):
+        chave = (texto, nome, tamanho, cor, fundo)
+        superficie = self._textos.get(chave)
+        if superficie is not None:
+            self._textos.move_to_end(chave)
+            return superficie
+
+        superficie = self._textos[chave] = fonte(nome, tamanho).render(texto, True, cor, fundo)
+        self.renderizados += 1
+        if len(self._textos) > self.capacidade:
+            self._textos.popitem(last=False)
+        return superficie
+
+    def limpar(self):
+        self._textos.clear()
+
+    def __len__(self):
+        return len(self._textos)
+
+
+# Cache compartilhado por toda a interface
+cache_textos = CacheTextos()
+
+
+def renderizar(texto, nome, tamanho, cor, fundo=None):
+    """Surface do texto (antialiased), do cache compartilhado; não deve ser alterada"""
+    return cache_textos.renderizar(texto, nome, tamanho, cor, fundo)
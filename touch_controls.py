@@ -1,5 +1,7 @@
 import pygame
 
+from textos import renderizar
+
 class TouchControls:
     """Sistema de controles para dispositivos sensíveis ao toque."""
     
@@ -57,12 +59,25 @@ class TouchControls:
                 'color': (80, 80, 50),
                 'hover_color': (100, 100, 70),
                 'action': 'add_food'
+            },
+            'max_speed': {
+                'rect': pygame.Rect(790, height - button_height - button_margin, 130, button_height),
+                'text': 'Vel. Máx',
+                'color': (50, 70, 90),
+                'hover_color': (70, 90, 110),
+                'action': 'max_speed',
+                'toggled': False
+            },
+            'charts': {
+                'rect': pygame.Rect(930, height - button_height - button_margin, 84, button_height),
+                'text': 'Gráf.',
+                'color': (60, 60, 90),
+                'hover_color': (80, 80, 110),
+                'action': 'charts',
+                'toggled': False
             }
         }
         
-        # Fonte para os botões
-        self.font = pygame.font.SysFont("Arial", 24)
-        
         # Estado de hover e clique
         self.hovered_button = None
         
@@ -96,6 +111,13 @@ class TouchControls:
                     simulation.aceleracao = max(1, simulation.aceleracao - 1)
                 elif action == 'speed_up':
                     simulation.aceleracao = min(10, simulation.aceleracao + 1)
+                elif action == 'max_speed':
+                    # Quantos ticks couberem entre um quadro e outro, em vez do multiplicador
+                    simulation.velocidade_maxima = not simulation.velocidade_maxima
+                    button['toggled'] = simulation.velocidade_maxima
+                elif action == 'charts':
+                    simulation.painel_graficos.alternar()
+                    button['toggled'] = simulation.painel_graficos.ativo
                 elif action == 'add_food':
                     alimento = simulation._criar_alimento_em_posicao_valida()
                     if alimento:
@@ -126,6 +148,6 @@ class TouchControls:
             if 'toggled' in button and button['toggled'] and 'alt_text' in button:
                 text = button['alt_text']
                 
-            text_surf = self.font.render(text, True, (255, 255, 255))
+            text_surf = renderizar(text, "Arial", 24, (255, 255, 255))
             text_rect = text_surf.get_rect(center=button['rect'].center)
             surface.blit(text_surf, text_rect)
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Varredura de parâmetros: executa a simulação sem interface para cada combinação de
+mapa, presas, predadores, taxa de alimento e semente, distribuindo as execuções entre
+processos (ProcessPoolExecutor). Cada resultado é gravado numa linha JSON assim que
+termina; rodar de novo com o mesmo arquivo de saída retoma a varredura, pulando as
+execuções já gravadas (as que falharam ficam numa linha com 'erro' e são tentadas de novo).
+
+Uso:
+    python varredura.py --saida resultados.jsonl --mapas planicie ilha --presas 20 50 \\
+        --predadores 3 6 --taxas-alimento 0.05 0.1 --sementes 100
+    python varredura.py --resumo resultados.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Cada processo roda uma simulação por vez: sem janela e sem threads extras do NumPy
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+MAPAS = ['aleatorio', 'planicie', 'ilha', 'labirinto', 'montanhoso', 'diversificado']
+
+
+def gerar_execucoes(args):
+    """Todas as combinações de parâmetros da varredura, cada uma com sua chave única"""
+    sementes = range(args.semente_inicial, args.semente_inicial + args.sementes)
+    for mapa, n_presas, n_predadores, taxa, seed in itertools.product(
+            args.mapas, args.presas, args.predadores, args.taxas_alimento, sementes):
+        configuracoes = {
+            'mapa': mapa,
+            'n_presas': n_presas,
+            'n_predadores': n_predadores,
+            'n_canibais': args.canibais,
+            'n_alimentos': args.alimentos,
+            'taxa_alimento': taxa,
+            'modo_atributos': args.modo_atributos,
+            'terrenos': {},
+            'seed': seed
+        }
+        yield chave_execucao(configuracoes, args.ticks, args.vetorizado), configuracoes
+
+
+def chave_execucao(configuracoes, ticks, vetorizado=False):
+    """Identifica uma execução pelos parâmetros que definem o resultado (os dois motores
+    divergem com a mesma semente, então o modo também faz parte da chave)"""
+    return (f"{configuracoes['mapa']}|{configuracoes['n_presas']}|{configuracoes['n_predadores']}|"
+            f"{configuracoes['n_canibais']}|{configuracoes['n_alimentos']}|{configuracoes['taxa_alimento']}|"
+            f"{configuracoes['modo_atributos']}|{ticks}|{configuracoes['seed']}"
+            f"{'|vetorizado' if vetorizado else ''}")
+
+
+def executar_uma(chave, configuracoes, ticks, vetorizado):
+    """Executa uma simulação (no processo do pool) e retorna a linha de resultado"""
+    from simulacao import executar_sem_interface
+
+    inicio = time.perf_counter()
+    estatisticas = executar_sem_interface(configuracoes, ticks, vetorizado=vetorizado)
+    return {
+        'chave': chave,
+        'configuracoes': configuracoes,
+        'ticks': ticks,
+        'vetorizado': vetorizado,
+        'segundos': time.perf_counter() - inicio,
+        'estatisticas': estatisticas,
+    }
+
+
+def chaves_concluidas(caminho):
+    """Chaves das execuções já gravadas no arquivo de saída (uma linha incompleta no final é ignorada,
+    e as execuções que falharam ficam de fora para serem tentadas de novo)"""
+    concluidas = set()
+    if not os.path.exists(caminho):
+        return concluidas
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            try:
+                resultado = json.loads(linha)
+                if 'erro' not in resultado:
+                    concluidas.add(resultado['chave'])
+            except (ValueError, KeyError):
+                continue
+    return concluidas
+
+
+def _truncar_linha_incompleta(caminho):
+    """Remove uma linha interrompida no meio da escrita, para que a próxima comece numa linha nova"""
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, 'rb+') as arquivo:
+        conteudo = arquivo.read()
+        if conteudo and not conteudo.endswith(b"\n"):
+            arquivo.truncate(conteudo.rfind(b"\n") + 1)
+
+
+def varrer(args):
+    """Executa as combinações que ainda não estão no arquivo de saída"""
+    concluidas = chaves_concluidas(args.saida)
+    pendentes = [(chave, configuracoes) for chave, configuracoes in gerar_execucoes(args)
+                 if chave not in concluidas]
+    total = len(pendentes) + len(concluidas)
+    print(f"{len(concluidas)} execuções já concluídas, {len(pendentes)} pendentes", file=sys.stderr)
+    if not pendentes:
+        return 0
+
+    _truncar_linha_incompleta(args.saida)
+    processos = args.processos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    feitas = 0
+    falhas = 0
+
+    with open(args.saida, 'a', encoding='utf-8') as saida, \
+            ProcessPoolExecutor(max_workers=processos) as executor:
+        # Poucas tarefas em voo por processo: a memória não cresce com o tamanho da varredura
+        fila = iter(pendentes)
+        em_voo = {}
+        while True:
+            for chave, configuracoes in itertools.islice(fila, 2 * processos - len(em_voo)):
+                futuro = executor.submit(executar_uma, chave, configuracoes, args.ticks, args.vetorizado)
+                em_voo[futuro] = (chave, configuracoes)
+            if not em_voo:
+                break
+
+            prontas, _ = wait(em_voo, return_when=FIRST_COMPLETED)
+            for futuro in prontas:
+                chave, configuracoes = em_voo.pop(futuro)
+                try:
+                    resultado = futuro.result()
+                except Exception as erro:
+                    # Uma execução que falha não derruba a varredura: a linha de erro fica no
+                    # arquivo e a retomada tenta essa execução de novo
+                    resultado = {'chave': chave, 'configuracoes': configuracoes, 'ticks': args.ticks,
+                                 'erro': f"{type(erro).__name__}: {erro}"}
+                    falhas += 1
+                saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                feitas += 1
+            saida.flush()
+
+            decorrido = time.perf_counter() - inicio
+            print(f"\r{len(concluidas) + feitas}/{total} execuções ({feitas / decorrido:.2f}/s)",
+                  end='', file=sys.stderr)
+
+    print(file=sys.stderr)
+    if falhas:
+        print(f"{falhas} execuções falharam (linhas com 'erro'); rode de novo para tentá-las outra vez",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+def resumir(caminho):
+    """Agrupa os resultados por combinação de parâmetros e motor (sem a semente) e imprime a distribuição"""
+    grupos = {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            try:
+                resultado = json.loads(linha)
+            except ValueError:
+                continue
+            if 'erro' in resultado:
+                continue
+            configuracoes = resultado['configuracoes']
+            grupo = (configuracoes['mapa'], configuracoes['n_presas'], configuracoes['n_predadores'],
+                     configuracoes['taxa_alimento'], resultado.get('vetorizado', False))
+            grupos.setdefault(grupo, []).append(resultado['estatisticas'])
+
+    print(f"{'mapa':<14} {'presas':>6} {'pred.':>5} {'taxa':>6} {'motor':>5} {'n':>5} "
+          f"{'presas %':>8} {'pred. %':>8} {'empate %':>8} {'tempo médio':>11} {'vel. presa':>10}")
+    for (mapa, n_presas, n_predadores, taxa, vetorizado), lista in sorted(grupos.items()):
+        n = len(lista)
+        vitorias = {'presas': 0, 'predadores': 0, None: 0}
+        for estatisticas in lista:
+            vitorias[estatisticas.get('vencedor')] += 1
+        tempo_medio = sum(e['tempo_total'] for e in lista) / n
+        velocidades = [e['criatura_media']['velocidade'] for e in lista if e.get('criatura_media')]
+        velocidade = f"{sum(velocidades) / len(velocidades):.3f}" if velocidades else '-'
+        motor = 'vet.' if vetorizado else 'obj.'
+        print(f"{mapa:<14} {n_presas:>6} {n_predadores:>5} {taxa:>6} {motor:>5} {n:>5} "
+              f"{100.0 * vitorias['presas'] / n:>8.1f} {100.0 * vitorias['predadores'] / n:>8.1f} "
+              f"{100.0 * vitorias[None] / n:>8.1f} {tempo_medio:>11.1f} {velocidade:>10}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros com execuções paralelas e retomáveis")
+    parser.add_argument('--saida', default='varredura.jsonl', help="arquivo JSON Lines com um resultado por linha")
+    parser.add_argument('--resumo', metavar='ARQUIVO', help="só resume um arquivo de resultados e sai")
+    parser.add_argument('--mapas', nargs='+', default=['planicie'], choices=MAPAS)
+    parser.add_argument('--presas', type=int, nargs='+', default=[20])
+    parser.add_argument('--predadores', type=int, nargs='+', default=[3])
+    parser.add_argument('--taxas-alimento', type=float, nargs='+', default=[0.05])
+    parser.add_argument('--canibais', type=int, default=1)
+    parser.add_argument('--alimentos', type=int, default=40)
+    parser.add_argument('--modo-atributos', default='aleatorio', choices=['aleatorio', 'padrao'])
+    parser.add_argument('--sementes', type=int, default=10, help="número de sementes por combinação")
+    parser.add_argument('--semente-inicial', type=int, default=0)
+    parser.add_argument('--ticks', type=int, default=10000, help="número máximo de ticks por execução")
+    parser.add_argument('--processos', type=int, default=None, help="processos do pool (padrão: número de núcleos)")
+    parser.add_argument('--vetorizado', action='store_true',
+                        help="usa o motor vetorizado (NumPy) nas fases físicas; o gelo não trava a direção "
+                             "nesse modo, então o resultado difere do modo normal com a mesma semente")
+    args = parser.parse_args(argv)
+
+    if args.resumo:
+        return resumir(args.resumo)
+    return varrer(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())